@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+active/standby 전환 벤치마크
+- fixture 서버 제품 페이지 + mock Discord 서버, 같은 SQLite 조정 저장소를 쓰는 인스턴스를 스레드로 실행 (시간은 실제 시각)
+- 모드:
+    restart  standby 없이 인스턴스 1개를 재시작 (새 인스턴스는 브라우저 시작 시간 가정치 --browser-start 후 확인 시작)
+    graceful leader가 lease를 반납하고 종료 (배포) → 미리 떠 있던 standby가 넘겨받음
+    crash    leader가 반납 없이 중단 → lease 만료 후 standby가 넘겨받음
+    stall    leader가 lease 시간보다 길게 멈췄다가 깨어나 알림 시도 → fencing token으로 차단되는지
+- 확인 공백(이전 인스턴스의 마지막 확인 → 새 인스턴스의 첫 확인), 측정된 time-to-recover, 중복 알림 수 측정
+
+사용 예:
+    python benchmarks/bench_failover.py --lease 3 --interval 0.5
+    python benchmarks/bench_failover.py --modes graceful,crash --output bench_failover.json
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from threading import Thread, Event, Lock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor
+from src.discord_notifier import DiscordNotifier
+from src.coordination import SQLiteLeaseStore
+from src.leader_election import LeaderElection
+from benchmarks.fixture_server import FixtureServer, FIXTURE_SELECTOR
+from benchmarks.mock_discord_server import MockDiscordServer
+from benchmarks.bench_utils import write_report, compare_reports
+
+MODES = ('restart', 'graceful', 'crash', 'stall')
+
+class Instance:
+    """서비스 인스턴스 1개 (leader lease + 주기 확인 + fencing 알림)"""
+
+    def __init__(self, name, db_path, server, discord, log, args, standby=True, browser_start=0.0):
+        self.name = name
+        self.args = args
+        self.log = log  # 공유 기록 {'checks': [(시각, 이름)], 'alerts': [...], 'lock': Lock}
+        self.election = LeaderElection(SQLiteLeaseStore(db_path), name, lease_seconds=args.lease,
+                                       standby_poll_seconds=args.standby_poll) if standby else None
+        self.server = server
+        self.discord = discord
+        self.browser_start = browser_start
+        self.stop_event = Event()
+        self.crashed = False
+        self.stall_seconds = 0.0  # 다음 알림 직전에 멈출 시간
+        self.thread = Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _is_active(self):
+        return self.election is None or self.election.is_leader()
+
+    def _run(self):
+        # 브라우저 시작 (standby는 미리 띄워 두므로 넘겨받을 때는 이 시간이 들지 않음)
+        time.sleep(self.browser_start)
+        monitor = StockMonitor(self.server.url_for('in_stock'), FIXTURE_SELECTOR, timing_sinks=[],
+                               fetch_backend='http', variants={}, price_selector='', proxy_pool=False,
+                               capture_store=False)
+        notifier = DiscordNotifier(self.discord.webhook_url, product=self.name, allow_local_webhook=True,
+                                   proxy_pool=False, fence=self.election.fence if self.election else None)
+        monitor.warm_up()
+        notifier.warm_up()
+        next_check = 0.0
+        try:
+            while not self.stop_event.is_set():
+                if self.crashed:
+                    # 반납 없이 중단 (lease는 만료될 때까지 남음)
+                    return
+                if self.election:
+                    if self.election.maybe_poll() == 'promoted':
+                        next_check = 0.0
+                if self._is_active() and time.monotonic() >= next_check:
+                    next_check = time.monotonic() + self.args.interval
+                    result = monitor.check_stock(max_retries=1)
+                    with self.log['lock']:
+                        self.log['checks'].append((time.time(), self.name))
+                    if self.election and self.election.previous_seen_at and 'recovery' not in self.log:
+                        self.log['recovery'] = time.time() - self.election.previous_seen_at
+                    if self.stall_seconds:
+                        # 확인과 알림 사이에 멈춤 → 깨어났을 때는 이미 다른 노드가 leader
+                        time.sleep(self.stall_seconds)
+                        self.stall_seconds = 0.0
+                    if notifier.send_message(f"{self.name}: {result.status}", max_retries=1):
+                        with self.log['lock']:
+                            self.log['alerts'].append((time.time(), self.name))
+                time.sleep(0.02)
+            if self.election:
+                self.election.resign()
+        finally:
+            monitor.close()
+
+    def stall(self, seconds):
+        """다음 확인 후 알림 직전에 seconds초 멈춤 (GC/스왑/디스크 지연 흉내)"""
+        self.stall_seconds = seconds
+
+    def stop(self, graceful=True):
+        if graceful:
+            self.stop_event.set()
+        else:
+            self.crashed = True
+        self.thread.join(timeout=10)
+
+def run_mode(mode, server, discord, args, workdir):
+    db_path = os.path.join(workdir, f"leader-{mode}.db")
+    log = {'checks': [], 'alerts': [], 'lock': Lock()}
+    if mode == 'restart':
+        old = Instance('node-a', db_path, server, discord, log, args, standby=False).start()
+    else:
+        old = Instance('node-a', db_path, server, discord, log, args).start()
+        time.sleep(0.3)  # node-a가 먼저 leader
+        standby = Instance('node-b', db_path, server, discord, log, args).start()
+    time.sleep(args.warm)
+
+    fenced_before = 0
+    event_at = time.time()
+    if mode == 'restart':
+        old.stop()
+        standby = Instance('node-b', db_path, server, discord, log, args, standby=False,
+                           browser_start=args.browser_start).start()
+    elif mode == 'graceful':
+        old.stop(graceful=True)
+    elif mode == 'crash':
+        old.stop(graceful=False)
+    else:
+        fenced_before = old.election.stats['fenced']
+        old.stall(args.lease * 2)
+
+    deadline = time.time() + args.lease * 3 + args.browser_start + 5
+    while time.time() < deadline and not any(name == 'node-b' and at > event_at for at, name in log['checks']):
+        time.sleep(0.05)
+    if mode == 'stall':
+        # 멈췄던 이전 leader가 깨어나 알림을 시도할 때까지
+        time.sleep(args.lease * 2)
+        old.stop()
+    time.sleep(args.interval * 2)
+    standby.stop()
+
+    last_old = max((at for at, name in log['checks'] if name == 'node-a' and at <= event_at), default=event_at)
+    first_new = min((at for at, name in log['checks'] if name == 'node-b' and at > event_at), default=None)
+    takeover_at = first_new if first_new is not None else float('inf')
+    return {
+        'mode': mode,
+        'detection_gap_seconds': round(first_new - last_old, 2) if first_new is not None else None,
+        'recovery_seconds': round(log['recovery'], 2) if 'recovery' in log else None,
+        # 넘겨받은 뒤 이전 인스턴스가 보낸 알림 (중복)
+        'duplicate_alerts': sum(1 for at, name in log['alerts'] if name == 'node-a' and at >= takeover_at),
+        'fenced_alerts': old.election.stats['fenced'] - fenced_before if old.election else 0,
+        'checks': len(log['checks']),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="active/standby 전환 벤치마크")
+    parser.add_argument('--modes', type=str, default=','.join(MODES), help='쉼표 구분 모드')
+    parser.add_argument('--lease', type=float, default=3.0, help='leader lease 시간 (초)')
+    parser.add_argument('--standby-poll', type=float, default=0.25, help='standby lease 확인 간격 (초)')
+    parser.add_argument('--interval', type=float, default=0.5, help='재고 확인 주기 (초)')
+    parser.add_argument('--warm', type=float, default=1.5, help='전환 전 정상 동작 시간 (초)')
+    parser.add_argument('--browser-start', type=float, default=8.0, help='restart 모드 브라우저 시작 시간 가정치 (초)')
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    server = FixtureServer(padding_kb=20).start()
+    discord = MockDiscordServer().start()
+    workdir = tempfile.mkdtemp(prefix='bench_failover_')
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            print(f"⏱️ {mode} ...", flush=True)
+            result = run_mode(mode, server, discord, args, workdir)
+            results.append(result)
+            print(f"   확인 공백 {result['detection_gap_seconds']}초, time-to-recover {result['recovery_seconds']}초, "
+                  f"중복 알림 {result['duplicate_alerts']}, fencing으로 막은 알림 {result['fenced_alerts']}")
+    finally:
+        server.stop()
+        discord.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['mode'], [
+            ('detection gap s', lambda r: r['detection_gap_seconds']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+fetch 백엔드 오프라인 벤치마크
+- 로컬 fixture 서버의 페이지로 StockMonitor.check_stock 반복 실행
+- 백엔드(+브라우저 모드) × 페이지 종류 × 동시성별 checks/sec, p50/p95/p99 지연, CPU, 최대 RSS, 정확도 측정
+- 결과를 JSON으로 저장하고 이전 결과와 비교
+
+사용 예:
+    python benchmarks/bench_fetch.py --backends http --concurrency 1,4 --output bench_http.json
+    python benchmarks/bench_fetch.py --backends http,selenium --compare bench_http.json
+    python benchmarks/bench_fetch.py --backends selenium --browser-modes default,low_footprint --concurrency 1
+    python benchmarks/bench_fetch.py --backends http --options --concurrency 1
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from threading import Thread, Event, Lock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor, FETCH_BACKENDS, BROWSER_MODES, process_tree_usage
+from benchmarks.fixture_server import (FixtureServer, FIXTURE_SELECTOR, FIXTURE_OPTION_SELECTORS, FIXTURE_PRICE_SELECTOR,
+                                       OPTION_EXPECTED, VARIANTS)
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+class ResourceSampler:
+    """벤치마크 중 프로세스(+브라우저) RSS 최대값 샘플링"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self.stop_event = Event()
+        self.thread = Thread(target=self._run, daemon=True)
+
+    def usage(self):
+        # 브라우저는 이 프로세스의 하위 프로세스이므로 함께 집계됨
+        return process_tree_usage(os.getpid())
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.peak_rss = max(self.peak_rss, self.usage()[0])
+            self.stop_event.wait(self.interval)
+
+    def __enter__(self):
+        self.cpu_started = self.usage()[1]
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+        self.cpu_seconds = self.usage()[1] - self.cpu_started
+
+def run_case(backend, url, expected, concurrency, checks, browser_mode='default', options=False):
+    """한 조합 실행 후 결과(dict) 반환 (options: 색상 옵션 3개 + 가격을 같은 페이지에서 함께 확인)"""
+    monitors = [StockMonitor(url, FIXTURE_SELECTOR, timing_sinks=[], fetch_backend=backend, browser_mode=browser_mode,
+                             variants=FIXTURE_OPTION_SELECTORS if options else {},
+                             price_selector=FIXTURE_PRICE_SELECTOR if options else '')
+                for _ in range(concurrency)]
+    option_expected = dict(OPTION_EXPECTED, black=expected)
+    latencies = []
+    errors = 0
+    correct = 0
+    option_checked = 0
+    option_correct = 0
+    lock = Lock()
+
+    try:
+        # 워밍업 (연결/브라우저 캐시) - 측정 제외
+        for monitor in monitors:
+            try:
+                monitor.check_stock(max_retries=1)
+            except Exception:
+                pass
+
+        def worker(monitor):
+            nonlocal errors, correct, option_checked, option_correct
+            for _ in range(checks):
+                started = time.perf_counter()
+                try:
+                    result = monitor.check_stock(max_retries=1)
+                except Exception:
+                    with lock:
+                        errors += 1
+                    continue
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if expected is not None and result.in_stock == expected:
+                        correct += 1
+                    for variant in result.variants:
+                        if option_expected[variant['name']] is not None:
+                            option_checked += 1
+                            option_correct += variant['in_stock'] == option_expected[variant['name']]
+
+        with ResourceSampler() as sampler:
+            started = time.perf_counter()
+            threads = [Thread(target=worker, args=(m,)) for m in monitors]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+    finally:
+        for monitor in monitors:
+            monitor.close()
+
+    completed = len(latencies)
+    return {
+        'checks': completed,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 3),
+        'checks_per_sec': round(completed / elapsed, 3) if elapsed else None,
+        'latency_ms': latency_summary_ms(latencies),
+        'cpu_seconds': round(sampler.cpu_seconds, 3),
+        'peak_rss_bytes': sampler.peak_rss,
+        'accuracy': round(correct / completed, 3) if expected is not None and completed else None,
+        'option_accuracy': round(option_correct / option_checked, 3) if option_checked else None,
+    }
+
+def print_mode_comparison(results):
+    """같은 조건의 default 대비 low_footprint 모드 RSS / 지연 변화 출력"""
+    defaults = {(r['variant'], r['concurrency']): r for r in results
+                if r['backend'] == 'selenium' and r['browser_mode'] == 'default'}
+    lines = []
+    for r in results:
+        base = defaults.get((r['variant'], r['concurrency']))
+        if r['backend'] != 'selenium' or r['browser_mode'] == 'default' or not base:
+            continue
+        rss_change = (r['peak_rss_bytes'] - base['peak_rss_bytes']) / base['peak_rss_bytes'] * 100 if base['peak_rss_bytes'] else 0
+        lines.append(f"   {r['browser_mode']} / {r['variant']} / 동시성 {r['concurrency']}: "
+                     f"RSS {base['peak_rss_bytes'] / 1024 / 1024:.1f}MB → {r['peak_rss_bytes'] / 1024 / 1024:.1f}MB ({rss_change:+.1f}%), "
+                     f"p95 {base['latency_ms']['p95']}ms → {r['latency_ms']['p95']}ms")
+    if lines:
+        print("\n🧮 브라우저 모드 비교 (default 대비)")
+        print('\n'.join(lines))
+
+def main():
+    parser = argparse.ArgumentParser(description="fetch 백엔드 오프라인 벤치마크")
+    parser.add_argument('--backends', type=str, default='http', help=f"쉼표 구분 ({', '.join(FETCH_BACKENDS)})")
+    parser.add_argument('--browser-modes', type=str, default='default',
+                        help=f"selenium 백엔드의 쉼표 구분 브라우저 모드 ({', '.join(BROWSER_MODES)})")
+    parser.add_argument('--variants', type=str, default=','.join(VARIANTS), help='쉼표 구분 페이지 종류')
+    parser.add_argument('--concurrency', type=str, default='1,4', help='쉼표 구분 동시성 수준')
+    parser.add_argument('--checks', type=int, default=20, help='워커당 확인 횟수')
+    parser.add_argument('--slow-delay', type=float, default=1.0, help='slow 페이지 지연 (초)')
+    parser.add_argument('--padding-kb', type=int, default=200, help='페이지 본문 크기 (KB)')
+    parser.add_argument('--options', action='store_true', help='색상 옵션 3개 + 가격을 한 번의 페이지 조회로 함께 확인')
+    parser.add_argument('--output', type=str, default='bench_fetch.json', help='결과 JSON 경로')
+    parser.add_argument('--compare', type=str, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    backends = [b.strip() for b in args.backends.split(',') if b.strip()]
+    browser_modes = [m.strip() for m in args.browser_modes.split(',') if m.strip()]
+    variants = [v.strip() for v in args.variants.split(',') if v.strip()]
+    levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+
+    server = FixtureServer(slow_delay=args.slow_delay, padding_kb=args.padding_kb).start()
+    results = []
+    try:
+        for backend in backends:
+            # 브라우저 모드는 selenium 백엔드에만 의미 있음
+            for browser_mode in (browser_modes if backend == 'selenium' else ['default']):
+                for variant in variants:
+                    for concurrency in levels:
+                        label = f"{backend}/{browser_mode}" if backend == 'selenium' else backend
+                        print(f"⏱️ {label} / {variant} / 동시성 {concurrency} ...", flush=True)
+                        result = run_case(backend, server.url_for(variant), VARIANTS[variant], concurrency, args.checks,
+                                          browser_mode=browser_mode, options=args.options)
+                        result.update(backend=backend, browser_mode=browser_mode, variant=variant, concurrency=concurrency,
+                                      options=len(FIXTURE_OPTION_SELECTORS) if args.options else 0)
+                        results.append(result)
+                        print(f"   {result['checks_per_sec']} checks/s, p95 {result['latency_ms']['p95']}ms, "
+                              f"RSS {result['peak_rss_bytes'] / 1024 / 1024:.1f}MB, 정확도 {result['accuracy']}"
+                              + (f", 옵션 정확도 {result['option_accuracy']}" if args.options else ""))
+    finally:
+        server.stop()
+
+    print_mode_comparison(results)
+    write_report(args.output, args, results)
+
+    if args.compare:
+        compare_reports(results, args.compare, ['backend', 'browser_mode', 'variant', 'concurrency', 'options'], [
+            ('checks/s', lambda r: r['checks_per_sec']),
+            ('p95 ms', lambda r: r['latency_ms']['p95']),
+            ('peak RSS', lambda r: r['peak_rss_bytes']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+hedged request 벤치마크
+- 일부 요청만 느린 fixture 페이지(tail)를 반복 확인해 time-to-detect 꼬리 지연 비교
+- 단일 StockMonitor vs HedgedStockMonitor(HTTP 보조 확인): p50/p95/p99, hedge 비율(추가 요청 수)
+
+사용 예:
+    python benchmarks/bench_hedging.py --checks 300 --tail-rate 0.03 --slow-delay 0.5 --interval 0.5
+    python benchmarks/bench_hedging.py --budgets 0.05,0.1,0.2 --output bench_hedging.json
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor
+from src.hedging import HedgedStockMonitor
+from benchmarks.fixture_server import FixtureServer, FIXTURE_SELECTOR
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+def run_case(url, checks, budget_ratio, percentile, min_delay, interval):
+    """budget_ratio가 None이면 hedge 없이 단일 모니터로 실행"""
+    def create_monitor(backend='http'):
+        return StockMonitor(url, FIXTURE_SELECTOR, timing_sinks=[], fetch_backend=backend, variants={}, price_selector='')
+
+    monitor = create_monitor()
+    if budget_ratio is not None:
+        monitor = HedgedStockMonitor(monitor, create_monitor(), percentile=percentile, min_delay=min_delay,
+                                     budget_ratio=budget_ratio)
+    latencies = []
+    errors = 0
+    try:
+        for _ in range(checks):
+            started = time.perf_counter()
+            try:
+                monitor.check_stock(max_retries=1)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            # 실제 서비스처럼 확인 사이에 간격을 둬야 늦게 끝난 요청이 다음 확인과 겹치지 않음
+            time.sleep(interval)
+    finally:
+        monitor.close()
+
+    hedged = monitor.stats['hedged'] if budget_ratio is not None else 0
+    return {
+        'mode': 'single' if budget_ratio is None else 'hedged',
+        'budget_ratio': budget_ratio,
+        'checks': len(latencies),
+        'errors': errors,
+        'latency_ms': latency_summary_ms(latencies),
+        'hedged': hedged,
+        'hedge_won': monitor.stats['hedge_won'] if budget_ratio is not None else 0,
+        'budget_exhausted': monitor.stats['budget_exhausted'] if budget_ratio is not None else 0,
+        'extra_load': round(hedged / checks, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="hedged request 벤치마크")
+    parser.add_argument('--checks', type=int, default=200, help='모드별 확인 횟수')
+    parser.add_argument('--tail-rate', type=float, default=0.03, help='지연되는 요청 비율')
+    parser.add_argument('--slow-delay', type=float, default=0.5, help='지연되는 요청의 지연 (초)')
+    parser.add_argument('--interval', type=float, default=0.5, help='확인 사이 간격 (초)')
+    parser.add_argument('--padding-kb', type=int, default=200, help='페이지 본문 크기 (KB)')
+    parser.add_argument('--budgets', type=str, default='0.1', help='쉼표 구분 hedge 예산 비율')
+    parser.add_argument('--percentile', type=float, default=95, help='hedge 시작 기준 백분위수')
+    parser.add_argument('--min-delay', type=float, default=0.05, help='hedge 시작 최소 지연 (초)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    budgets = [None] + [float(b) for b in args.budgets.split(',') if b.strip()]
+    server = FixtureServer(slow_delay=args.slow_delay, padding_kb=args.padding_kb, tail_rate=args.tail_rate,
+                           seed=args.seed).start()
+    results = []
+    try:
+        for budget_ratio in budgets:
+            label = '단일 확인' if budget_ratio is None else f"hedged (예산 {budget_ratio})"
+            print(f"⏱️ {label} ...", flush=True)
+            result = run_case(server.url_for('tail'), args.checks, budget_ratio, args.percentile, args.min_delay,
+                              args.interval)
+            results.append(result)
+            print(f"   p50 {result['latency_ms']['p50']}ms, p95 {result['latency_ms']['p95']}ms, "
+                  f"p99 {result['latency_ms']['p99']}ms, hedge {result['hedged']}회 "
+                  f"(보조 승리 {result['hedge_won']}회, 예산 부족 {result['budget_exhausted']}회, "
+                  f"추가 요청 +{result['extra_load'] * 100:.1f}%)")
+    finally:
+        server.stop()
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['mode', 'budget_ratio'], [
+            ('p99 ms', lambda r: r['latency_ms']['p99']),
+            ('p95 ms', lambda r: r['latency_ms']['p95']),
+            ('extra load', lambda r: r['extra_load']),
+        ])
+
+if __name__ == "__main__":
+    main()
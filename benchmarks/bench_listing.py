@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+목록 페이지 모니터링 벤치마크
+- fixture 서버의 목록 페이지(/category)에 상품 N개를 두고 주기마다 일부 상품의 재고를 바꿔가며 비교
+- 모드: per_product(제품 페이지 N개를 매 주기 확인), listing(목록 1회 + 바뀐 상품만 제품 페이지 재확인)
+- 주기당 요청 수, 소요 시간, 재입고 감지 누락 수 측정
+
+사용 예:
+    python benchmarks/bench_listing.py --products 40 --cycles 20 --flips 2
+    python benchmarks/bench_listing.py --output bench_listing.json
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor
+from src.stock_classifier import IN_STOCK
+from src.listing_monitor import ListingMonitor
+from benchmarks.fixture_server import (FixtureServer, FIXTURE_SELECTOR, FIXTURE_LISTING_TILE_SELECTOR,
+                                       FIXTURE_LISTING_BADGE_SELECTOR, FIXTURE_LISTING_NAME_SELECTOR)
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+MODES = ('per_product', 'listing')
+
+def _reset_listing(server, args):
+    server.listing.clear()
+    rng = random.Random(args.seed)
+    for i in range(args.products):
+        server.listing[f"SKU-{i:03d}"] = 'in_stock' if rng.random() < 0.3 else 'sold_out'
+    return rng
+
+def _flip(server, rng, count):
+    """상품 count개의 재고 상태를 바꿈 → 이번 주기에 재입고된 SKU 집합"""
+    restocked = set()
+    for sku in rng.sample(sorted(server.listing), count):
+        if server.listing[sku] == 'sold_out':
+            server.listing[sku] = 'in_stock'
+            restocked.add(sku)
+        else:
+            server.listing[sku] = 'sold_out'
+    return restocked
+
+def run_mode(mode, server, args):
+    rng = _reset_listing(server, args)
+    base = f"{server.base_url}/product/"
+    if mode == 'per_product':
+        monitors = {sku: StockMonitor(base + sku, FIXTURE_SELECTOR, timing_sinks=[], fetch_backend='http', variants={},
+                                      price_selector='', proxy_pool=False, capture_store=False)
+                    for sku in server.listing}
+        previous = {}
+    else:
+        listing = ListingMonitor(server.listing_url(), FIXTURE_LISTING_TILE_SELECTOR, FIXTURE_LISTING_BADGE_SELECTOR,
+                                 name_selector=FIXTURE_LISTING_NAME_SELECTOR, product_selector=FIXTURE_SELECTOR,
+                                 proxy_pool=False,
+                                 create_monitor=lambda url: StockMonitor(url, FIXTURE_SELECTOR, timing_sinks=[],
+                                                                         fetch_backend='http', variants={},
+                                                                         price_selector='', proxy_pool=False,
+                                                                         capture_store=False))
+
+    def cycle():
+        """확인 1주기 → 재입고로 감지한 SKU 집합"""
+        if mode == 'per_product':
+            found = set()
+            for sku, monitor in monitors.items():
+                status = monitor.check_stock(max_retries=1).status
+                if status == IN_STOCK and previous.get(sku) not in (None, IN_STOCK):
+                    found.add(sku)
+                previous[sku] = status
+            return found
+        result = listing.check_listing()
+        return {tile['product_id'] for tile in result.restocked}
+
+    cycle()  # 기준 상태
+    server.requests.clear()
+    durations = []
+    missed = 0
+    false_alerts = 0
+    try:
+        for _ in range(args.cycles):
+            restocked = _flip(server, rng, args.flips)
+            started = time.perf_counter()
+            found = cycle()
+            durations.append(time.perf_counter() - started)
+            missed += len(restocked - found)
+            false_alerts += len(found - restocked)
+    finally:
+        if mode == 'per_product':
+            for monitor in monitors.values():
+                monitor.close()
+        else:
+            listing.close()
+
+    requests = dict(server.requests)
+    return {
+        'mode': mode,
+        'products': args.products,
+        'requests_per_cycle': round(sum(requests.values()) / args.cycles, 2),
+        'requests': requests,
+        'cycle_ms': latency_summary_ms(durations),
+        'missed_restocks': missed,
+        'false_alerts': false_alerts,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 페이지 모니터링 벤치마크")
+    parser.add_argument('--modes', type=str, default=','.join(MODES), help='쉼표 구분 모드')
+    parser.add_argument('--products', type=int, default=40, help='목록의 상품 수')
+    parser.add_argument('--cycles', type=int, default=20, help='확인 주기 수')
+    parser.add_argument('--flips', type=int, default=2, help='주기마다 재고 상태가 바뀌는 상품 수')
+    parser.add_argument('--padding-kb', type=int, default=50, help='제품/목록 페이지 본문 크기 (KB)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    server = FixtureServer(padding_kb=args.padding_kb).start()
+    server.server.listing_padding_kb = args.padding_kb
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            print(f"⏱️ {mode} ...", flush=True)
+            result = run_mode(mode, server, args)
+            results.append(result)
+            print(f"   주기당 요청 {result['requests_per_cycle']}회 {result['requests']}, "
+                  f"주기 p50 {result['cycle_ms']['p50']}ms / p95 {result['cycle_ms']['p95']}ms, "
+                  f"재입고 누락 {result['missed_restocks']}, 오탐 {result['false_alerts']}")
+    finally:
+        server.stop()
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['mode'], [
+            ('requests/cycle', lambda r: r['requests_per_cycle']),
+            ('cycle p50 ms', lambda r: r['cycle_ms']['p50']),
+        ])
+
+if __name__ == "__main__":
+    main()
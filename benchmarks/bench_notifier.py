@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+DiscordNotifier 처리량 벤치마크
+- 로컬 mock Discord 서버로 알림 폭주(alert storm) 발송
+- 시나리오별 delivered/sec, 종단 간 전달 지연(p50/p95/p99), 재시도 오버헤드 측정
+
+사용 예:
+    python benchmarks/bench_notifier.py --messages 50 --senders 4 --output bench_notifier.json
+    python benchmarks/bench_notifier.py --scenarios rate_limited --compare bench_notifier.json
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from threading import Thread
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.discord_notifier import DiscordNotifier
+from benchmarks.mock_discord_server import MockDiscordServer
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+# 시나리오별 mock 서버 설정
+SCENARIOS = {
+    'ok': {},
+    'rate_limited': {'rate_limit': 5, 'window': 1.0},
+    'server_errors': {'error_rate': 0.2, 'seed': 42},
+    'slow': {'delay': 0.3},
+    'mixed': {'rate_limit': 10, 'window': 1.0, 'error_rate': 0.05, 'delay': 0.05, 'seed': 42},
+}
+
+def run_scenario(name, messages, senders):
+    """한 시나리오 실행 후 결과(dict) 반환"""
+    mock = MockDiscordServer(**SCENARIOS[name]).start()
+    notifier = DiscordNotifier(mock.webhook_url, product='bench', allow_local_webhook=True)
+    sent_at = {}
+    failed = 0
+
+    def sender(worker_id):
+        nonlocal failed
+        for i in range(worker_id, messages, senders):
+            message_id = f"bench-{i}"
+            sent_at[message_id] = time.time()
+            if not notifier.send_message(f"🟢 **재고 있음!** 🟢\n{message_id}"):
+                failed += 1
+
+    try:
+        started = time.perf_counter()
+        threads = [Thread(target=sender, args=(w,)) for w in range(senders)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        mock.stop()
+
+    # 메시지 본문의 ID로 발송 시각과 mock 서버 수신 시각을 짝지음
+    latencies = []
+    for received in mock.messages:
+        message_id = received['payload']['content'].rsplit('\n', 1)[-1]
+        if message_id in sent_at:
+            latencies.append(received['received_at'] - sent_at[message_id])
+
+    status_counts = mock.status_counts
+    delivered = len(latencies)
+    attempts = sum(status_counts.values())
+    return {
+        'scenario': name,
+        'senders': senders,
+        'messages': messages,
+        'delivered': delivered,
+        'failed': failed,
+        'elapsed_seconds': round(elapsed, 3),
+        'delivered_per_sec': round(delivered / elapsed, 3) if elapsed else None,
+        'delivery_latency_ms': latency_summary_ms(latencies),
+        'http_attempts': attempts,
+        'retry_overhead': round(attempts / delivered, 3) if delivered else None,
+        'status_counts': {str(code): count for code, count in sorted(status_counts.items())},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="DiscordNotifier 처리량 벤치마크")
+    parser.add_argument('--scenarios', type=str, default=','.join(SCENARIOS), help='쉼표 구분 시나리오')
+    parser.add_argument('--messages', type=int, default=50, help='시나리오당 발송 메시지 수')
+    parser.add_argument('--senders', type=int, default=4, help='동시 발송 스레드 수')
+    parser.add_argument('--output', type=str, default='bench_notifier.json', help='결과 JSON 경로')
+    parser.add_argument('--compare', type=str, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = []
+    for name in [s.strip() for s in args.scenarios.split(',') if s.strip()]:
+        print(f"⏱️ {name} ...", flush=True)
+        result = run_scenario(name, args.messages, args.senders)
+        results.append(result)
+        print(f"   {result['delivered']}/{result['messages']} 전달, {result['delivered_per_sec']} msg/s, "
+              f"p95 {result['delivery_latency_ms']['p95']}ms, 재시도 오버헤드 {result['retry_overhead']}, "
+              f"응답 {result['status_counts']}")
+
+    write_report(args.output, args, results)
+
+    if args.compare:
+        compare_reports(results, args.compare, ['scenario', 'senders'], [
+            ('msg/s', lambda r: r['delivered_per_sec']),
+            ('p95 ms', lambda r: r['delivery_latency_ms']['p95']),
+            ('retry overhead', lambda r: r['retry_overhead']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+프록시 풀 벤치마크
+- 로컬 프록시(benchmarks/proxy_server.py) 여러 개 + fixture 페이지로 같은 확인 속도를 내면서 차단 응답 비교
+- 프록시마다 사이트 rate limit(구간당 요청 수, 초과 시 429)을 흉내내고, 느린/불안정한 프록시를 섞음
+- 모드: direct(프록시 1개를 풀 없이 고정 = 단일 IP), pool(상한 없음), pool_capped(프록시별 상한)
+
+사용 예:
+    python benchmarks/bench_proxy_pool.py --duration 20 --rate 20 --site-limit 20 --site-window 5
+    python benchmarks/bench_proxy_pool.py --modes direct,pool_capped --output bench_proxy_pool.json
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor, BlockedPageError
+from src.proxy_pool import ProxyPool, ProxyUnavailableError
+from benchmarks.fixture_server import FixtureServer, FIXTURE_SELECTOR
+from benchmarks.proxy_server import ProxyServer
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+# 프록시 구성 (이름, 지연, 오류 비율)
+PROXY_PROFILES = [
+    ('fast1', 0.0, 0.0),
+    ('fast2', 0.0, 0.0),
+    ('fast3', 0.0, 0.0),
+    ('slow', 0.2, 0.0),
+    ('flaky', 0.0, 0.4),
+]
+
+MODES = ('direct', 'pool', 'pool_capped')
+
+def run_mode(mode, url, args):
+    profiles = PROXY_PROFILES[:1] if mode == 'direct' else PROXY_PROFILES
+    proxies = [ProxyServer(delay=delay, error_rate=error_rate, site_limit=args.site_limit, site_window=args.site_window,
+                           seed=args.seed + i).start()
+               for i, (_, delay, error_rate) in enumerate(profiles)]
+    # 상한은 사이트 제한보다 약간 낮게
+    cap = max(1, int(args.site_limit * 0.9)) if mode == 'pool_capped' else 0
+    pool = None
+    if mode != 'direct':
+        pool = ProxyPool([p.url for p in proxies], max_per_minute=cap, rate_window=args.site_window,
+                         eject_seconds=args.site_window, rng=random.Random(args.seed))
+    monitor = StockMonitor(url, FIXTURE_SELECTOR, timing_sinks=[], fetch_backend='http', variants={}, price_selector='',
+                           proxy_pool=pool or False)
+    if not pool:
+        # 호스트 직접 접속과 같은 단일 IP (차단돼도 다른 경로 없음)
+        monitor.session.proxies = {'http': proxies[0].url}
+
+    counts = {'ok': 0, 'blocked': 0, 'error': 0, 'no_proxy': 0}
+    latencies = []
+    interval = 1.0 / args.rate
+    started = time.perf_counter()
+    next_at = started
+    try:
+        while time.perf_counter() - started < args.duration:
+            check_started = time.perf_counter()
+            try:
+                monitor.check_stock(max_retries=1)
+                counts['ok'] += 1
+                latencies.append(time.perf_counter() - check_started)
+            except BlockedPageError:
+                counts['blocked'] += 1
+            except ProxyUnavailableError:
+                counts['no_proxy'] += 1
+            except Exception:
+                counts['error'] += 1
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+        elapsed = time.perf_counter() - started
+        snapshot = pool.snapshot() if pool else [{'state': 'direct'}]
+    finally:
+        monitor.close()
+        for proxy in proxies:
+            proxy.stop()
+
+    total = sum(counts.values())
+    return {
+        'mode': mode,
+        'proxies': len(proxies),
+        'cap_per_window': cap,
+        'attempted': total,
+        'ok_per_sec': round(counts['ok'] / elapsed, 2),
+        'counts': counts,
+        'blocked_rate': round(counts['blocked'] / total, 3) if total else None,
+        'latency_ms': latency_summary_ms(latencies),
+        'requests_per_proxy': {name: proxy.requests for (name, _, _), proxy in zip(profiles, proxies)},
+        'proxy_states': {name: s['state'] for (name, _, _), s in zip(profiles, snapshot)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="프록시 풀 벤치마크")
+    parser.add_argument('--modes', type=str, default=','.join(MODES), help='쉼표 구분 모드')
+    parser.add_argument('--duration', type=float, default=20, help='모드별 실행 시간 (초)')
+    parser.add_argument('--rate', type=float, default=20, help='목표 확인 횟수 (초당)')
+    parser.add_argument('--site-limit', type=int, default=20, help='프록시 IP별 구간당 사이트 허용 요청 수')
+    parser.add_argument('--site-window', type=float, default=5, help='사이트 rate limit 구간 (초)')
+    parser.add_argument('--padding-kb', type=int, default=50, help='페이지 본문 크기 (KB)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    server = FixtureServer(padding_kb=args.padding_kb).start()
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            print(f"⏱️ {mode} ...", flush=True)
+            result = run_mode(mode, server.url_for('in_stock'), args)
+            results.append(result)
+            print(f"   성공 {result['ok_per_sec']}/s, 결과 {result['counts']}, 차단 비율 {result['blocked_rate']}, "
+                  f"p95 {result['latency_ms']['p95']}ms")
+            print(f"   프록시별 요청 {result['requests_per_proxy']}, 상태 {result['proxy_states']}")
+    finally:
+        server.stop()
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['mode'], [
+            ('ok/s', lambda r: r['ok_per_sec']),
+            ('blocked rate', lambda r: r['blocked_rate']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+확인 일정(CHECK_SCHEDULE/CHECK_BLACKOUT) 벤치마크
+- 가상 1주일(월요일 00:00부터)을 분 단위로 진행하며 모드별 확인 시각 계산 (실제 요청 없음)
+- 모드:
+    fixed          CHECK_INTERVAL_MINUTES 고정 주기 (밤낮/요일 구분 없음)
+    cron           CHECK_SCHEDULE 규칙 (--schedule)
+    cron_blackout  CHECK_SCHEDULE 규칙 + CHECK_BLACKOUT (--blackout)
+- 재입고 시각은 가정치: --peak-share 비율은 평일 10:00-12:00, 나머지는 평일 09:00-19:00에 균등 분포
+- 주당 확인 수, 페이지 전송량(--page-kb), 브라우저 CPU 시간(--cpu-per-check), 재입고 감지 지연 p50/p95,
+  재입고가 --restock-minutes 안에 끝나 놓친 건수, 매분 일정 판단(is_due + in_blackout) 소요 시간 측정
+
+사용 예:
+    python benchmarks/bench_schedule.py --interval 3
+    python benchmarks/bench_schedule.py --schedule '*/1 10-11 * * mon-fri; */20 * * * *' --output bench_schedule.json
+"""
+
+import os
+import sys
+import time
+import random
+import bisect
+import logging
+import argparse
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.check_schedule import CheckSchedule
+from benchmarks.bench_utils import percentile, latency_summary_ms, write_report, compare_reports
+
+MODES = ('fixed', 'cron', 'cron_blackout')
+
+# 2026-10-19는 월요일
+WEEK_START = datetime(2026, 10, 19)
+WEEK_MINUTES = 7 * 24 * 60
+PRODUCT_ID = 'bench'
+
+def restock_events(count, peak_share, rng):
+    """재입고 시각 목록 (주 시작부터 초)"""
+    events = []
+    for _ in range(count):
+        day = rng.randrange(5)
+        if rng.random() < peak_share:
+            start, end = 10 * 3600, 12 * 3600
+        else:
+            start, end = 9 * 3600, 19 * 3600
+        events.append(day * 86400 + rng.uniform(start, end))
+    return sorted(events)
+
+def check_times(mode, args, rng):
+    """모드별 확인 시각 목록 (주 시작부터 초, 다음 주 첫날까지) → (시각 목록, 매분 일정 판단 소요 시간 목록)"""
+    horizon = WEEK_MINUTES + 24 * 60
+    if mode == 'fixed':
+        # 서비스 시작 시각에 따라 주기 위상이 달라짐
+        offset = rng.uniform(0, args.interval * 60)
+        return [offset + i * args.interval * 60 for i in range(int(horizon / args.interval))], []
+
+    schedule = CheckSchedule(args.schedule, args.blackout if mode == 'cron_blackout' else '')
+    times, evaluations = [], []
+    for minute in range(horizon):
+        when = WEEK_START + timedelta(minutes=minute)
+        started = time.perf_counter()
+        due = schedule.is_due(PRODUCT_ID, when) and not schedule.in_blackout(PRODUCT_ID, when)
+        evaluations.append(time.perf_counter() - started)
+        if due:
+            times.append(minute * 60.0)
+    return times, evaluations
+
+def run_mode(mode, events, args):
+    rng = random.Random(args.seed)
+    times, evaluations = check_times(mode, args, rng)
+    week_checks = sum(1 for t in times if t < WEEK_MINUTES * 60)
+    delays, missed = [], 0
+    for event in events:
+        index = bisect.bisect_left(times, event)
+        if index == len(times) or times[index] - event > args.restock_minutes * 60:
+            missed += 1
+            continue
+        delays.append(times[index] - event)
+    delay_ms = latency_summary_ms(delays)
+    return {
+        'mode': mode,
+        'checks_per_week': week_checks,
+        'mb_per_week': round(week_checks * args.page_kb / 1024, 1),
+        'browser_cpu_hours_per_week': round(week_checks * args.cpu_per_check / 3600, 2),
+        'detection_delay_seconds': {
+            'p50': round(delay_ms['p50'] / 1000, 1) if delay_ms['p50'] is not None else None,
+            'p95': round(delay_ms['p95'] / 1000, 1) if delay_ms['p95'] is not None else None,
+        },
+        'missed_restocks': missed,
+        # 매분 cron/시간대 판단 비용 (fixed는 스케줄러 주기 작업만 있어 해당 없음)
+        'evaluation_us': {f'p{pct}': round(percentile(evaluations, pct) * 1e6, 1) if evaluations else None
+                          for pct in (50, 95)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="확인 일정 벤치마크")
+    parser.add_argument('--modes', type=str, default=','.join(MODES), help='쉼표 구분 모드')
+    parser.add_argument('--interval', type=float, default=3.0, help='fixed 모드 확인 주기 (분)')
+    parser.add_argument('--schedule', type=str, default='*/2 10-12 * * mon-fri; */15 * * * *',
+                        help='cron 모드 CHECK_SCHEDULE')
+    parser.add_argument('--blackout', type=str, default='01:00-07:00,sat-sun 00:00-09:00',
+                        help='cron_blackout 모드 CHECK_BLACKOUT')
+    parser.add_argument('--events', type=int, default=500, help='재입고 횟수 (가정치)')
+    parser.add_argument('--peak-share', type=float, default=0.8, help='평일 10:00-12:00 재입고 비율')
+    parser.add_argument('--restock-minutes', type=float, default=30.0, help='재입고 후 품절까지 시간 (분)')
+    parser.add_argument('--page-kb', type=float, default=900.0, help='확인 1회 전송량 가정치 (KB)')
+    parser.add_argument('--cpu-per-check', type=float, default=2.5, help='확인 1회 브라우저 CPU 시간 가정치 (초)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    events = restock_events(args.events, args.peak_share, random.Random(args.seed))
+    results = []
+    for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+        print(f"⏱️ {mode} ...", flush=True)
+        result = run_mode(mode, events, args)
+        results.append(result)
+        print(f"   주당 확인 {result['checks_per_week']}회, 전송량 {result['mb_per_week']}MB, "
+              f"브라우저 CPU {result['browser_cpu_hours_per_week']}시간, "
+              f"감지 지연 p50 {result['detection_delay_seconds']['p50']}초 / p95 {result['detection_delay_seconds']['p95']}초, "
+              f"놓친 재입고 {result['missed_restocks']}, 매분 판단 p50 {result['evaluation_us']['p50']}µs")
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['mode'], [
+            ('checks/week', lambda r: r['checks_per_week']),
+            ('delay p95 s', lambda r: r['detection_delay_seconds']['p95']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+shard 분산 벤치마크
+- 노드 N개가 같은 조정 저장소(SQLite 파일 또는 메모리)로 제품 P개를 나눠 확인, 시각은 가상 시계로 진행
+- 노드는 동시에 시작 (첫 노드가 전부 가져간 뒤 나머지가 합류하며 재배정), 중간에 노드 1개를 반납 없이 중단
+- 노드 수별 노드당 제품 수, 주기 소요 시간(노드 병렬 = 가장 느린 노드), 중복 소유(두 노드가 같은 shard를 동시에 유효하게 가짐),
+  죽은 노드의 shard를 넘겨받기까지 걸린 시간, 제품별 최대 확인 간격 측정
+
+사용 예:
+    python benchmarks/bench_sharding.py --nodes 1,2,4 --products 40
+    python benchmarks/bench_sharding.py --store memory --output bench_sharding.json
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor
+from src.coordination import MemoryLeaseStore, SQLiteLeaseStore
+from src.sharding import ShardCoordinator
+from benchmarks.fixture_server import FixtureServer, FIXTURE_SELECTOR
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class Node:
+    """노드 1개 (shard 조정 + 맡은 제품 확인)"""
+
+    def __init__(self, name, store, clock, args):
+        self.name = name
+        self.coordinator = ShardCoordinator(store, name, shard_count=args.shards, lease_seconds=args.lease,
+                                            clock=clock)
+        self.monitors = {}
+        self.alive = True
+
+    def owned_products(self, urls):
+        return [url for url in urls if self.coordinator.owns(url)]
+
+    def check(self, url, clock, checks):
+        monitor = self.monitors.get(url)
+        if monitor is None:
+            monitor = self.monitors[url] = StockMonitor(url, FIXTURE_SELECTOR, timing_sinks=[], fetch_backend='http',
+                                                        variants={}, price_selector='', proxy_pool=False,
+                                                        capture_store=False)
+        monitor.check_stock(max_retries=1)
+        checks.setdefault(url, []).append(clock.now)
+
+    def close(self):
+        for monitor in self.monitors.values():
+            monitor.close()
+
+def run_mode(node_count, server, args, workdir):
+    clock = FakeClock()
+    urls = [f"{server.base_url}/product/{sku}" for sku in sorted(server.listing)]
+    if args.store == 'memory':
+        shared = MemoryLeaseStore()
+        stores = [shared] * node_count
+    else:
+        # 호스트마다 같은 파일을 따로 연 것처럼 노드별 연결
+        path = os.path.join(workdir, f"shards-{node_count}.db")
+        stores = [SQLiteLeaseStore(path) for _ in range(node_count)]
+    nodes = [Node(f"node-{i}", stores[i], clock, args) for i in range(node_count)]
+
+    tick = args.lease / 3
+    ticks_per_interval = max(1, round(args.interval / tick))
+    kill_tick = None
+    if node_count > 1:
+        kill_tick = args.kill_at * ticks_per_interval + ticks_per_interval // 2
+    checks = {}  # URL → 확인 시각 목록
+    durations = []
+    overlaps = 0
+    takeover_seconds = None
+    killed_at = None
+    per_node = None
+    server.requests.clear()
+    try:
+        for tick_index in range(args.intervals * ticks_per_interval):
+            clock.now += tick
+            if tick_index == kill_tick:
+                nodes[-1].alive = False
+                killed_at = clock.now
+            alive = [node for node in nodes if node.alive]
+            for node in alive:
+                gained, _ = node.coordinator.sync()
+                # 새로 맡은 shard는 바로 확인 (서비스의 _sync_shards와 같음)
+                for url in urls:
+                    if node.coordinator.shard_of(url) in gained and tick_index > 0:
+                        node.check(url, clock, checks)
+
+            # 같은 shard를 유효하게 가진 노드가 둘 이상인지 (죽은 노드도 lease 만료 전까지는 자기 것으로 봄)
+            for shard in range(args.shards):
+                owners = [node for node in nodes if shard in node.coordinator.owned
+                          and node.coordinator.owned[shard][1] > clock.now]
+                overlaps += len(owners) > 1
+            if killed_at is not None and takeover_seconds is None:
+                covered = {shard for node in alive for shard in node.coordinator.owned}
+                if len(covered) == args.shards:
+                    takeover_seconds = clock.now - killed_at
+
+            if tick_index % ticks_per_interval == 0:
+                slowest = 0.0
+                for node in alive:
+                    started = time.perf_counter()
+                    for url in node.owned_products(urls):
+                        node.check(url, clock, checks)
+                    slowest = max(slowest, time.perf_counter() - started)
+                if tick_index >= ticks_per_interval:  # 첫 주기는 재배정 중
+                    durations.append(slowest)
+                if killed_at is None and tick_index >= ticks_per_interval:
+                    per_node = max(len(node.owned_products(urls)) for node in alive)
+    finally:
+        for node in nodes:
+            node.close()
+        for store in set(stores):
+            store.close()
+
+    gaps = [b - a for times in checks.values() for a, b in zip(times, times[1:])]
+    return {
+        'nodes': node_count,
+        'products': len(urls),
+        'max_products_per_node': per_node,
+        'site_requests_per_interval': round(server.requests['product'] / args.intervals, 2),
+        'cycle_ms': latency_summary_ms(durations),
+        'overlapping_leases': overlaps,
+        'takeover_seconds': round(takeover_seconds, 1) if takeover_seconds is not None else None,
+        'max_check_gap_seconds': round(max(gaps), 1) if gaps else None,
+        'unchecked_products': len(urls) - len(checks),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="shard 분산 벤치마크")
+    parser.add_argument('--nodes', type=str, default='1,2,4', help='쉼표 구분 노드 수')
+    parser.add_argument('--products', type=int, default=40, help='제품 수')
+    parser.add_argument('--shards', type=int, default=32, help='shard 수')
+    parser.add_argument('--lease', type=float, default=30.0, help='lease 시간 (가상 초)')
+    parser.add_argument('--interval', type=float, default=180.0, help='확인 주기 (가상 초)')
+    parser.add_argument('--intervals', type=int, default=6, help='확인 주기 수')
+    parser.add_argument('--kill-at', type=int, default=3, help='이 주기 중간에 노드 1개 중단 (노드 2개 이상)')
+    parser.add_argument('--store', type=str, default='sqlite', choices=('sqlite', 'memory'))
+    parser.add_argument('--padding-kb', type=int, default=50, help='페이지 본문 크기 (KB)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    server = FixtureServer(padding_kb=args.padding_kb).start()
+    for i in range(args.products):
+        server.listing[f"SKU-{i:03d}"] = 'in_stock' if i % 3 == 0 else 'sold_out'
+    workdir = tempfile.mkdtemp(prefix='bench_sharding_')
+    results = []
+    try:
+        for node_count in [int(n) for n in args.nodes.split(',') if n.strip()]:
+            print(f"⏱️ 노드 {node_count}개 ...", flush=True)
+            result = run_mode(node_count, server, args, workdir)
+            results.append(result)
+            print(f"   노드당 제품 최대 {result['max_products_per_node']}개, 주기 p50 {result['cycle_ms']['p50']}ms, "
+                  f"주기당 사이트 요청 {result['site_requests_per_interval']}회, 중복 소유 {result['overlapping_leases']}, "
+                  f"넘겨받기 {result['takeover_seconds']}초, 최대 확인 간격 {result['max_check_gap_seconds']}초")
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['nodes'], [
+            ('cycle p50 ms', lambda r: r['cycle_ms']['p50']),
+            ('takeover s', lambda r: r['takeover_seconds']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+제품 상태 테이블 벤치마크
+- ProductStateTable(열 방향 array) vs 제품별 dict(기존 last_results 방식) 비교
+- 제품당 메모리(tracemalloc), changed 조회 시간, 결과 기록 처리량 측정
+
+사용 예:
+    python benchmarks/bench_state_table.py --products 10000 --output bench_state_table.json
+    python benchmarks/bench_state_table.py --compare bench_state_table.json
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.state_table import ProductStateTable, content_hash
+from src.stock_classifier import STOCK_STATUSES
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+class DictStateTable:
+    """비교 기준: 제품마다 상태 dict 1개"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, product_id):
+        self.rows.setdefault(product_id, {
+            'status': None, 'last_change': 0.0, 'last_checked': 0.0, 'streak': 0,
+            'content_hash': 0, 'error_streak': 0, 'changed': False,
+        })
+
+    def record(self, product_id, status, text_hash=0, now=None):
+        row = self.rows[product_id]
+        changed = row['status'] is not None and row['status'] != status
+        if row['status'] != status:
+            row.update(status=status, last_change=now, streak=1)
+        else:
+            row['streak'] += 1
+        row['changed'] = row['changed'] or changed or (row['content_hash'] and row['content_hash'] != text_hash)
+        row.update(content_hash=text_hash, last_checked=now, error_streak=0)
+        return changed
+
+    def changed(self):
+        return [product_id for product_id, row in self.rows.items() if row['changed']]
+
+IMPLEMENTATIONS = {
+    'array': ProductStateTable,
+    'dict': DictStateTable,
+}
+
+def build(name, products, seed):
+    """제품 products개를 추가하고 결과 1회씩 기록한 테이블 (생성 중 할당 바이트 포함)"""
+    rng = random.Random(seed)
+    product_ids = [f"product-{i:06d}" for i in range(products)]
+    texts = [f"블랙 {'품절' if i % 3 else '구매하기'} {i}" for i in range(64)]
+    hashes = [content_hash(t) for t in texts]
+    now = time.time()
+
+    statuses = [rng.choice(STOCK_STATUSES) for _ in product_ids]
+    text_hashes = [rng.choice(hashes) for _ in product_ids]
+
+    # 제품 ID 문자열/입력 목록은 측정 전에 만들어 두 방식 모두 테이블 자체 크기만 측정
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = IMPLEMENTATIONS[name]()
+    for product_id in product_ids:
+        table.add(product_id)
+    for product_id, status, text_hash in zip(product_ids, statuses, text_hashes):
+        table.record(product_id, status, text_hash, now=now)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return table, product_ids, statuses, text_hashes, used
+
+def time_calls(func, repeat):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def run_impl(name, products, repeat, seed):
+    table, product_ids, previous, text_hashes, used = build(name, products, seed)
+    rng = random.Random(seed + 1)
+    now = time.time()
+
+    # 한 주기 기록: 모든 제품의 결과를 다시 기록 (5%만 상태 변경, 나머지는 같은 내용)
+    statuses = [rng.choice(STOCK_STATUSES) if rng.random() < 0.05 else status for status in previous]
+    started = time.perf_counter()
+    for product_id, status, text_hash in zip(product_ids, statuses, text_hashes):
+        table.record(product_id, status, text_hash, now=now)
+    record_elapsed = time.perf_counter() - started
+
+    changed_latencies = time_calls(table.changed, repeat)
+    return {
+        'impl': name,
+        'products': products,
+        'bytes_per_product': round(used / products, 1),
+        'total_kib': round(used / 1024, 1),
+        'records_per_sec': round(products / record_elapsed),
+        'changed_count': len(table.changed()),
+        'changed_scan_ms': latency_summary_ms(changed_latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="제품 상태 테이블 벤치마크")
+    parser.add_argument('--products', type=int, default=10000, help='제품 수')
+    parser.add_argument('--repeat', type=int, default=50, help='조회 반복 횟수')
+    parser.add_argument('--impls', type=str, default=','.join(IMPLEMENTATIONS), help='비교할 구현 (쉼표 구분)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    results = []
+    for name in args.impls.split(','):
+        result = run_impl(name.strip(), args.products, args.repeat, args.seed)
+        results.append(result)
+        print(f"📦 {result['impl']:>5} | 제품 {result['products']} | 제품당 {result['bytes_per_product']}B "
+              f"(총 {result['total_kib']}KiB) | 기록 {result['records_per_sec']}/s | "
+              f"changed p50 {result['changed_scan_ms']['p50']}ms ({result['changed_count']}개)")
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['impl', 'products'], [
+            ('bytes/product', lambda r: r['bytes_per_product']),
+            ('changed p50', lambda r: r['changed_scan_ms']['p50']),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+다중 구독자 벤치마크
+- 구독자 S명이 제품 P개 중 일부를 겹치게 구독하는 상황을 fixture 서버 + mock Discord 서버로 재현
+- 모드: per_subscriber(구독자마다 서비스를 따로 실행 = 구독 1건당 확인 1회), indexed(제품→구독자 색인, 제품당 1회 + 결과 전달)
+- 주기당 사이트 요청 수, 모니터(브라우저/세션) 수, 주기 소요 시간, 발송된 알림 수 측정
+
+사용 예:
+    python benchmarks/bench_subscriptions.py --subscribers 20 --products 10 --per-subscriber 4
+    python benchmarks/bench_subscriptions.py --output bench_subscriptions.json
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stock_monitor import StockMonitor
+from src.discord_notifier import DiscordNotifier
+from src.subscriptions import Subscriber, SubscriptionIndex, fan_out
+from benchmarks.fixture_server import FixtureServer, FIXTURE_SELECTOR
+from benchmarks.mock_discord_server import MockDiscordServer
+from benchmarks.bench_utils import latency_summary_ms, write_report, compare_reports
+
+MODES = ('per_subscriber', 'indexed')
+
+def _build_index(server, discord, args):
+    rng = random.Random(args.seed)
+    for i in range(args.products):
+        server.listing[f"SKU-{i:03d}"] = 'in_stock' if i % 2 == 0 else 'sold_out'
+    urls = [f"{server.base_url}/product/{sku}" for sku in sorted(server.listing)]
+    index = SubscriptionIndex()
+    for i in range(args.subscribers):
+        subscriber = Subscriber(f"team-{i:02d}", f"{discord.webhook_url}?team={i}")
+        for url in rng.sample(urls, min(args.per_subscriber, len(urls))):
+            index.subscribe(subscriber, url, FIXTURE_SELECTOR)
+    return index
+
+def _monitor(url):
+    return StockMonitor(url, FIXTURE_SELECTOR, timing_sinks=[], fetch_backend='http', variants={}, price_selector='',
+                        proxy_pool=False, capture_store=False)
+
+def run_mode(mode, server, discord, index, args):
+    notifiers = {}
+
+    def notifier_for(subscriber):
+        if subscriber.webhook not in notifiers:
+            notifiers[subscriber.webhook] = DiscordNotifier(subscriber.webhook, product=subscriber.name,
+                                                            allow_local_webhook=True, proxy_pool=False)
+        return notifiers[subscriber.webhook]
+
+    if mode == 'per_subscriber':
+        # 구독 1건 = 별도 서비스의 모니터 1개 (같은 제품도 따로 확인)
+        jobs = [(_monitor(product.url), product, [subscriber])
+                for product in index.products.values() for subscriber in product.subscribers]
+    else:
+        jobs = [(_monitor(product.url), product, product.subscribers) for product in index.products.values()]
+
+    server.requests.clear()
+    sent_before = len(discord.messages)
+    durations = []
+    try:
+        for _ in range(args.cycles):
+            started = time.perf_counter()
+            for monitor, product, subscribers in jobs:
+                result = monitor.check_stock(max_retries=1)
+                fan_out(product, result, notifier_for, subscribers)
+            durations.append(time.perf_counter() - started)
+    finally:
+        for monitor, _, _ in jobs:
+            monitor.close()
+
+    return {
+        'mode': mode,
+        'subscribers': args.subscribers,
+        'subscriptions': index.subscription_count(),
+        'unique_products': len(index.products),
+        'monitors': len(jobs),
+        'site_requests_per_cycle': round(server.requests['product'] / args.cycles, 2),
+        'notifications': len(discord.messages) - sent_before,
+        'cycle_ms': latency_summary_ms(durations),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 구독자 벤치마크")
+    parser.add_argument('--modes', type=str, default=','.join(MODES), help='쉼표 구분 모드')
+    parser.add_argument('--subscribers', type=int, default=20, help='구독자 수')
+    parser.add_argument('--products', type=int, default=10, help='제품 수')
+    parser.add_argument('--per-subscriber', type=int, default=4, help='구독자당 구독 제품 수')
+    parser.add_argument('--cycles', type=int, default=5, help='확인 주기 수')
+    parser.add_argument('--padding-kb', type=int, default=50, help='페이지 본문 크기 (KB)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    server = FixtureServer(padding_kb=args.padding_kb).start()
+    discord = MockDiscordServer().start()
+    index = _build_index(server, discord, args)
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            print(f"⏱️ {mode} ...", flush=True)
+            result = run_mode(mode, server, discord, index, args)
+            results.append(result)
+            print(f"   모니터 {result['monitors']}개, 주기당 사이트 요청 {result['site_requests_per_cycle']}회, "
+                  f"알림 {result['notifications']}건, 주기 p50 {result['cycle_ms']['p50']}ms")
+    finally:
+        server.stop()
+        discord.stop()
+
+    if args.output:
+        write_report(args.output, args, results)
+    if args.compare:
+        compare_reports(results, args.compare, ['mode'], [
+            ('site requests/cycle', lambda r: r['site_requests_per_cycle']),
+            ('cycle p50 ms', lambda r: r['cycle_ms']['p50']),
+        ])
+
+if __name__ == "__main__":
+    main()
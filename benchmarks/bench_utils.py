@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+벤치마크 공통 유틸리티
+- 백분위수 계산, 결과 메타데이터, 이전 결과 비교
+"""
+
+import os
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+def percentile(values, pct):
+    """최근접 순위 방식 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def latency_summary_ms(latencies):
+    """초 단위 지연 목록 → p50/p95/p99/mean (ms)"""
+    if not latencies:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None}
+    return {
+        'p50': round(percentile(latencies, 50) * 1000, 2),
+        'p95': round(percentile(latencies, 95) * 1000, 2),
+        'p99': round(percentile(latencies, 99) * 1000, 2),
+        'mean': round(sum(latencies) / len(latencies) * 1000, 2),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except Exception:
+        return None
+
+def write_report(path, args, results):
+    """결과 JSON 저장 (커밋 해시/환경 정보 포함)"""
+    report = {
+        'meta': {
+            'git_commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✅ 결과 저장: {path}")
+
+def compare_reports(results, baseline_path, key_fields, metrics):
+    """이전 결과와 지표별 변화율 출력
+
+    key_fields: 결과를 짝짓는 필드 목록, metrics: [(이름, 값 꺼내는 함수), ...]
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    def key(r):
+        # 이전 버전 결과에 없는 필드는 None으로 취급 (짝이 맞지 않으면 비교 생략)
+        return tuple(r.get(field) for field in key_fields)
+
+    def delta(new, before):
+        if new is None or not before:
+            return '-'
+        return f"{(new - before) / before * 100:+.1f}%"
+
+    previous = {key(r): r for r in baseline['results']}
+    print(f"\n📊 비교 기준: {baseline_path} (commit {baseline['meta'].get('git_commit')})")
+    for r in results:
+        old = previous.get(key(r))
+        if not old:
+            continue
+        parts = [f"{name} {getter(r)} ({delta(getter(r), getter(old))})" for name, getter in metrics]
+        print(f"   {' / '.join(str(v) for v in key(r))}: " + ', '.join(parts))
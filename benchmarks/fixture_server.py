@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+오프라인 벤치마크용 Sony 제품 페이지 서버
+- fixtures/product_page.html 템플릿으로 재고 상태별 페이지 제공
+- 네트워크 없이 fetch 백엔드 성능/정확도 측정
+- missing_selector를 제외한 페이지에는 schema.org Product/Offer JSON-LD 포함
+- 모든 페이지에 색상 옵션(실버: 구매 가능, 미드나잇 블루: 비활성 버튼)과 가격 포함
+
+경로: /product/<variant>
+    in_stock          재고 있음 라벨
+    sold_out          "일시품절" 라벨
+    js_label          라벨을 JavaScript로 나중에 채움 (렌더링 필요)
+    slow              재고 있음 페이지를 지연 후 응답
+    tail              재고 있음 페이지를 일부 요청(tail_rate)만 지연 후 응답 (CDN/원본 서버 지연 흉내)
+    missing_selector  재고 라벨 요소 없음
+
+경로: /category, /product/<SKU>
+    listing 상품 목록 페이지 (타일마다 재고 배지와 /product/<SKU> 링크), SKU 제품 페이지는 목록 상태와 같은 재고
+"""
+
+import os
+import time
+import random
+import argparse
+from collections import Counter
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# fixtures/product_page.html의 재고 라벨 위치 (.env.example의 STOCK_SELECTOR와 같은 구조)
+FIXTURE_SELECTOR = ('#root > div > div > div.contents.product > div > div.product_view_main > form > div > '
+                    'div.cont.prd_select_wrap.false > div.prd_select_inner > div.prd_select_box > '
+                    'div > div > div > div > ul > li > a > div > span')
+
+_STOCK_LABEL = '<span class="stock_label">{}</span>'
+
+# 블랙 외 색상 옵션 (페이지 종류와 무관하게 고정, FIXTURE_SELECTOR와 겹치지 않도록 em 사용)
+_OPTIONS = """                                <li class="opt_silver">
+                                  <a href="#none" data-color="silver">
+                                    <div class="opt_name">실버 <em class="stock_label">구매 가능</em></div>
+                                  </a>
+                                </li>
+                                <li class="opt_blue">
+                                  <a href="#none" data-color="blue" class="disabled" aria-disabled="true">
+                                    <div class="opt_name">미드나잇 블루 <em class="stock_label">재입고 알림 신청</em></div>
+                                  </a>
+                                </li>"""
+
+# 옵션별 재고 요소 / 가격 요소 (STOCK_VARIANTS / PRICE_SELECTOR 예시)
+FIXTURE_OPTION_SELECTORS = {
+    'black': 'li.opt_black .stock_label',
+    'silver': 'li.opt_silver .stock_label',
+    'blue': 'li.opt_blue .stock_label',
+}
+FIXTURE_PRICE_SELECTOR = 'p.prd_price'
+
+# 옵션 → 기대하는 재고 여부 (black은 페이지 종류의 기대값을 따름)
+OPTION_EXPECTED = {'silver': True, 'blue': False}
+
+# JavaScript로 라벨을 채우는 페이지 (원본 HTML에는 "일시품절" 문자열이 없음)
+_JS_LABEL_SCRIPT = """<script>
+window.__PRODUCT_STATE__ = {"stockStatus": "SOLDOUT", "label": "\\uc77c\\uc2dc\\ud488\\uc808"};
+setTimeout(function () {
+  document.getElementById('stock-label').textContent = window.__PRODUCT_STATE__.label;
+}, 500);
+</script>"""
+
+_JSON_LD = """<script type="application/ld+json">
+{{"@context": "https://schema.org", "@type": "Product", "name": "WH-1000XM5", "sku": "WH-1000XM5",
+ "offers": {{"@type": "Offer", "priceCurrency": "KRW", "price": "459000", "availability": "https://schema.org/{}"}}}}
+</script>"""
+
+# 목록 페이지 타일 구조 (.env.example의 LISTING_* 예시와 같은 구조)
+FIXTURE_LISTING_TILE_SELECTOR = 'ul.prd_list > li.prd_item'
+FIXTURE_LISTING_BADGE_SELECTOR = '.prd_badge'
+FIXTURE_LISTING_NAME_SELECTOR = '.prd_name'
+
+_LISTING_TILE = ('<li class="prd_item"><a class="prd_link" href="/product/{sku}"><img src="/img/{sku}.png" alt="">'
+                 '<p class="prd_name">{sku}</p></a><p class="prd_price">459,000원</p>'
+                 '<span class="prd_badge{extra}">{badge}</span></li>\n')
+
+# variant → 기대하는 재고 여부 (None: 정답 없음, 정확도 계산 제외)
+VARIANTS = {
+    'in_stock': True,
+    'sold_out': False,
+    'js_label': False,
+    'slow': True,
+    'tail': True,
+    'missing_selector': None,
+}
+
+def _load_template():
+    with open(os.path.join(FIXTURES_DIR, 'product_page.html'), encoding='utf-8') as f:
+        return f.read()
+
+def render_listing(listing, padding_kb=50):
+    """{SKU: 'in_stock' / 'sold_out'} → 목록 페이지 HTML"""
+    tiles = ''.join(_LISTING_TILE.format(sku=sku, badge='구매 가능' if variant == 'in_stock' else '일시품절',
+                                         extra='' if variant == 'in_stock' else ' soldout')
+                    for sku, variant in listing.items())
+    return (f"<!DOCTYPE html><html lang=\"ko\"><head><meta charset=\"utf-8\"><title>헤드폰 | Sony</title></head>"
+            f"<body><div id=\"root\"><div class=\"contents category\"><ul class=\"prd_list\">\n{tiles}</ul>"
+            f"{_padding(padding_kb)}</div></div></body></html>")
+
+def _padding(size_kb):
+    """실제 페이지 크기를 흉내내는 상품 상세/리뷰 마크업"""
+    block = ('<div class="review_item"><p class="review_title">착용감이 좋고 노이즈 캔슬링이 뛰어납니다</p>'
+             '<p class="review_text">출퇴근용으로 구매했는데 만족스럽습니다. 배터리도 오래가고 통화 품질도 괜찮습니다.</p></div>\n')
+    count = max(1, (size_kb * 1024) // len(block.encode('utf-8')))
+    return block * count
+
+def render_page(variant, padding_kb=200):
+    """variant에 맞는 HTML 생성"""
+    if variant not in VARIANTS:
+        raise KeyError(variant)
+
+    scripts = ''
+    json_ld = ''
+    if variant in ('in_stock', 'slow', 'tail'):
+        stock_block = _STOCK_LABEL.format('구매 가능')
+        json_ld = _JSON_LD.format('InStock')
+    elif variant == 'sold_out':
+        stock_block = _STOCK_LABEL.format('일시품절')
+        json_ld = _JSON_LD.format('OutOfStock')
+    elif variant == 'js_label':
+        stock_block = '<span class="stock_label" id="stock-label"></span>'
+        scripts = _JS_LABEL_SCRIPT
+        json_ld = _JSON_LD.format('OutOfStock')
+    else:
+        stock_block = ''
+
+    return (_load_template()
+            .replace('{{JSON_LD}}', json_ld)
+            .replace('{{STOCK_BLOCK}}', stock_block)
+            .replace('{{OPTIONS}}', _OPTIONS)
+            .replace('{{PADDING}}', _padding(padding_kb))
+            .replace('{{SCRIPTS}}', scripts))
+
+class _FixtureRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = [p for p in self.path.split('?', 1)[0].split('/') if p]
+        self.server.requests[parts[0] if parts else ''] += 1
+        if parts == ['category']:
+            self._send(render_listing(self.server.listing, self.server.listing_padding_kb).encode('utf-8'))
+            return
+        if len(parts) != 2 or parts[0] != 'product' or (parts[1] not in VARIANTS and parts[1] not in self.server.listing):
+            self.send_error(404)
+            return
+
+        variant = parts[1] if parts[1] in VARIANTS else self.server.listing[parts[1]]
+        body = self.server.pages[variant]
+        if variant == 'slow' or (variant == 'tail' and self.server.rng.random() < self.server.tail_rate):
+            time.sleep(self.server.slow_delay)
+        self._send(body)
+
+    def _send(self, body):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer:
+    """백그라운드 스레드에서 동작하는 로컬 fixture 서버"""
+
+    def __init__(self, host='127.0.0.1', port=0, slow_delay=2.0, padding_kb=200, tail_rate=0.05, seed=None):
+        self.server = ThreadingHTTPServer((host, port), _FixtureRequestHandler)
+        self.server.daemon_threads = True
+        self.server.slow_delay = slow_delay
+        self.server.tail_rate = tail_rate
+        self.server.rng = random.Random(seed)
+        self.server.pages = {name: render_page(name, padding_kb).encode('utf-8') for name in VARIANTS}
+        self.server.listing = {}  # 목록 페이지 상품 {SKU: 'in_stock' / 'sold_out'}, 실행 중에 바꿔 재입고 흉내
+        self.server.listing_padding_kb = 50
+        self.server.requests = Counter()  # 경로 첫 조각별 요청 수 (category / product)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def listing(self):
+        return self.server.listing
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def url_for(self, variant):
+        return f"{self.base_url}/product/{variant}"
+
+    def listing_url(self):
+        return f"{self.base_url}/category"
+
+    def start(self):
+        self.thread = Thread(target=self.server.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sony 제품 페이지 fixture 서버")
+    parser.add_argument('--port', type=int, default=8765, help='포트 (기본값: 8765)')
+    parser.add_argument('--slow-delay', type=float, default=2.0, help='slow 페이지 지연 (초)')
+    parser.add_argument('--padding-kb', type=int, default=200, help='페이지 본문 크기 (KB)')
+    parser.add_argument('--tail-rate', type=float, default=0.05, help='tail 페이지에서 지연되는 요청 비율')
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, slow_delay=args.slow_delay, padding_kb=args.padding_kb,
+                           tail_rate=args.tail_rate).start()
+    print(f"🧪 fixture 서버 시작: {server.base_url}")
+    for name in VARIANTS:
+        print(f"   {server.url_for(name)}")
+    print(f"   Selector: {FIXTURE_SELECTOR}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print("👋 종료합니다.")
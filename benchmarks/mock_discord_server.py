@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+로컬 mock Discord Webhook 서버
+- 204 성공, 429 rate limit(retry_after + X-RateLimit-* 헤더), 5xx 오류, 지연 응답 재현
+- 수신 메시지와 응답 코드 통계 기록
+
+사용 예:
+    python benchmarks/mock_discord_server.py --rate-limit 5 --window 2 --error-rate 0.05
+    DISCORD_WEBHOOK_ALLOW_LOCAL=1 DISCORD_WEBHOOK_URL=http://127.0.0.1:8766/api/webhooks/1/mock python src/test_sender.py --custom "hi"
+"""
+
+import json
+import time
+import random
+import argparse
+from threading import Lock, Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _MockWebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if not self.path.startswith('/api/webhooks/'):
+            self._reply(server, 404, {'message': 'Unknown Webhook', 'code': 10015})
+            return
+
+        if server.delay:
+            time.sleep(server.delay)
+
+        if server.error_rate and server.random.random() < server.error_rate:
+            self._reply(server, 502, {'message': '502 Bad Gateway'})
+            return
+
+        allowed, remaining, reset_after = server.take_token()
+        limit_headers = {
+            'X-RateLimit-Limit': str(server.rate_limit or 0),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': f"{time.time() + reset_after:.3f}",
+            'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+            'X-RateLimit-Bucket': 'mock-bucket',
+        }
+        if not allowed:
+            limit_headers['Retry-After'] = str(max(1, int(reset_after + 0.999)))
+            limit_headers['X-RateLimit-Scope'] = 'user'
+            self._reply(server, 429, {'message': 'You are being rate limited.', 'retry_after': round(reset_after, 3),
+                                      'global': False}, limit_headers)
+            return
+
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except ValueError:
+            self._reply(server, 400, {'message': 'Cannot send an empty message', 'code': 50006})
+            return
+
+        # 지연 이후 수락 시점을 전달 시각으로 기록
+        with server.lock:
+            server.messages.append({'received_at': time.time(), 'payload': payload})
+        self._reply(server, 204, None, limit_headers)
+
+    def _reply(self, server, status, body, headers=None):
+        with server.lock:
+            server.status_counts[status] = server.status_counts.get(status, 0) + 1
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class _MockWebhookHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def take_token(self):
+        """고정 윈도우 rate limit → (허용 여부, 남은 요청 수, 리셋까지 남은 초)"""
+        if not self.rate_limit:
+            return True, 0, 0.0
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.window_started + self.window:
+                self.window_started = now
+                self.window_count = 0
+            reset_after = self.window_started + self.window - now
+            if self.window_count >= self.rate_limit:
+                return False, 0, reset_after
+            self.window_count += 1
+            return True, self.rate_limit - self.window_count, reset_after
+
+class MockDiscordServer:
+    """백그라운드 스레드에서 동작하는 mock Webhook 서버"""
+
+    def __init__(self, host='127.0.0.1', port=0, rate_limit=0, window=2.0, error_rate=0.0, delay=0.0, seed=None):
+        self.server = _MockWebhookHTTPServer((host, port), _MockWebhookHandler)
+        self.server.rate_limit = rate_limit  # 윈도우당 허용 요청 수 (0: 제한 없음)
+        self.server.window = window
+        self.server.window_started = time.monotonic()
+        self.server.window_count = 0
+        self.server.error_rate = error_rate
+        self.server.delay = delay
+        self.server.random = random.Random(seed)
+        self.server.lock = Lock()
+        self.server.messages = []
+        self.server.status_counts = {}
+        self.thread = None
+
+    @property
+    def webhook_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/webhooks/000000000000000000/mock-token"
+
+    @property
+    def messages(self):
+        with self.server.lock:
+            return list(self.server.messages)
+
+    @property
+    def status_counts(self):
+        with self.server.lock:
+            return dict(self.server.status_counts)
+
+    def start(self):
+        self.thread = Thread(target=self.server.serve_forever, name='mock-discord', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 mock Discord Webhook 서버")
+    parser.add_argument('--port', type=int, default=8766, help='포트 (기본값: 8766)')
+    parser.add_argument('--rate-limit', type=int, default=5, help='윈도우당 허용 요청 수 (0: 제한 없음)')
+    parser.add_argument('--window', type=float, default=2.0, help='rate limit 윈도우 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='5xx 응답 비율 (0~1)')
+    parser.add_argument('--delay', type=float, default=0.0, help='응답 지연 (초)')
+    args = parser.parse_args()
+
+    mock = MockDiscordServer(port=args.port, rate_limit=args.rate_limit, window=args.window,
+                             error_rate=args.error_rate, delay=args.delay).start()
+    print(f"🧪 mock Discord 서버 시작: {mock.webhook_url}")
+    print("   DISCORD_WEBHOOK_ALLOW_LOCAL=1 과 함께 사용하세요")
+
+    try:
+        while True:
+            time.sleep(5)
+            print(f"   응답 코드 통계: {mock.status_counts}, 수신 메시지: {len(mock.messages)}")
+    except KeyboardInterrupt:
+        mock.stop()
+        print("👋 종료합니다.")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+오프라인 테스트용 HTTP 포워드 프록시
+- 프록시 풀 테스트용 로컬 프록시 (절대 URL GET/POST 요청을 원본 서버로 전달, CONNECT 미지원)
+- 프록시마다 지연, 오류 비율, 차단(403) 비율과 사이트 rate limit(프록시 IP별 구간당 요청 수 초과 시 429) 흉내
+
+사용 예:
+    python benchmarks/proxy_server.py --port 8800 --delay 0.2 --error-rate 0.1
+    PROXY_URLS=http://127.0.0.1:8800 FETCH_BACKEND=http python setup.py
+"""
+
+import time
+import random
+import argparse
+import http.client
+from collections import deque
+from threading import Thread, Lock
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _ProxyRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._forward('GET')
+
+    def do_POST(self):
+        self._forward('POST', self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+
+    def _forward(self, method, body=None):
+        server = self.server
+        if not self.path.startswith('http://'):
+            self.send_error(400, 'absolute URL required')
+            return
+
+        with server.lock:
+            server.requests += 1
+            now = time.monotonic()
+            while server.recent and now - server.recent[0] >= server.site_window:
+                server.recent.popleft()
+            server.recent.append(now)
+            over_limit = server.site_limit and len(server.recent) > server.site_limit
+            roll = server.rng.random()
+
+        if server.delay:
+            time.sleep(server.delay)
+        if roll < server.error_rate:
+            # 프록시 자체 장애 (응답 없이 연결 종료)
+            self.close_connection = True
+            return
+        if over_limit or roll < server.error_rate + server.block_rate:
+            self._respond(429 if over_limit else 403, b'blocked')
+            return
+
+        url = urlsplit(self.path)
+        upstream = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=10)
+        try:
+            upstream.request(method, url.path + (f'?{url.query}' if url.query else ''), body=body,
+                             headers={k: v for k, v in self.headers.items() if k.lower() not in ('proxy-connection', 'connection')})
+            response = upstream.getresponse()
+            self._respond(response.status, response.read(), response.getheader('Content-Type', 'text/html'))
+        except OSError:
+            self.send_error(502)
+        finally:
+            upstream.close()
+
+    def _respond(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class ProxyServer:
+    """백그라운드 스레드에서 동작하는 로컬 프록시"""
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0, error_rate=0.0, block_rate=0.0, site_limit=0, site_window=60.0,
+                 seed=None):
+        self.server = ThreadingHTTPServer((host, port), _ProxyRequestHandler)
+        self.server.daemon_threads = True
+        self.server.delay = delay
+        self.server.error_rate = error_rate
+        self.server.block_rate = block_rate
+        self.server.site_limit = site_limit  # 이 프록시 IP에서 site_window초 동안 허용하는 요청 수 (0이면 무제한)
+        self.server.site_window = site_window
+        self.server.rng = random.Random(seed)
+        self.server.lock = Lock()
+        self.server.recent = deque()
+        self.server.requests = 0
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def start(self):
+        self.thread = Thread(target=self.server.serve_forever, name='proxy-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 HTTP 포워드 프록시")
+    parser.add_argument('--port', type=int, default=8800, help='포트 (기본값: 8800)')
+    parser.add_argument('--delay', type=float, default=0.0, help='요청마다 추가 지연 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='응답 없이 연결을 끊는 비율')
+    parser.add_argument('--block-rate', type=float, default=0.0, help='403으로 차단하는 비율')
+    parser.add_argument('--site-limit', type=int, default=0, help='구간당 허용 요청 수 (초과 시 429)')
+    parser.add_argument('--site-window', type=float, default=60.0, help='site-limit 구간 (초)')
+    args = parser.parse_args()
+
+    proxy = ProxyServer(port=args.port, delay=args.delay, error_rate=args.error_rate, block_rate=args.block_rate,
+                        site_limit=args.site_limit, site_window=args.site_window).start()
+    print(f"🧪 프록시 시작: {proxy.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        proxy.stop()
+        print("👋 종료합니다.")
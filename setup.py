@@ -128,10 +128,15 @@ def test_stock_monitor():
     
     try:
         monitor = StockMonitor(website_url, stock_selector)
-        stock_status = monitor.check_stock()
+        result = monitor.check_stock()
         
-        status_text = "재고 있음" if stock_status else "품절"
+        status_names = {'in_stock': "재고 있음", 'out_of_stock': "품절"}
+        status_text = status_names.get(result.status, "판단 불가")
         print(f"✅ 재고 모니터링 테스트 성공! 현재 상태: {status_text}")
+        for variant in result.variants:
+            print(f"   - {variant['name']}: {status_names.get(variant['status'], '판단 불가')} ({variant['text'] or '요소 없음'})")
+        if result.price is not None:
+            print(f"   💰 가격: {result.price:,}원")
         return True
         
     except Exception as e:
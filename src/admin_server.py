@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+로컬 관리 소켓 (Unix domain socket)
+- 실행 중인 서비스의 상태 조회 및 제어
+- 요청/응답은 한 줄짜리 JSON
+- runtime_config_tool.py, test_sender.py에서 클라이언트로 사용
+"""
+
+import os
+import json
+import socket
+import logging
+import socketserver
+from threading import Thread
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = '/tmp/sony_stock_monitor.sock'
+
+# 지원하는 명령
+ADMIN_COMMANDS = ('status', 'results', 'check', 'reload', 'pause', 'resume', 'stats')
+
+def get_socket_path():
+    """관리 소켓 경로 반환 (ADMIN_SOCKET_PATH)"""
+    return os.getenv('ADMIN_SOCKET_PATH', DEFAULT_SOCKET_PATH)
+
+class _AdminRequestHandler(socketserver.StreamRequestHandler):
+    """요청 한 줄을 읽어 서비스에 전달하고 응답 한 줄을 돌려줌"""
+
+    def handle(self):
+        line = self.rfile.readline(65536)
+        if not line:
+            return
+
+        try:
+            request = json.loads(line.decode('utf-8'))
+            command = request.pop('command', None)
+            if command not in ADMIN_COMMANDS:
+                response = {'ok': False, 'error': f"알 수 없는 명령: {command}"}
+            else:
+                response = self.server.service.handle_admin_command(command, **request)
+        except Exception as e:
+            logger.error(f"관리 명령 처리 오류: {str(e)}")
+            response = {'ok': False, 'error': str(e)}
+
+        self.wfile.write((json.dumps(response, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+
+class _AdminUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class AdminServer:
+    """서비스에 붙는 로컬 관리 API 서버"""
+
+    def __init__(self, service, socket_path=None):
+        self.service = service
+        self.socket_path = socket_path or get_socket_path()
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """소켓 생성 후 백그라운드 스레드에서 요청 처리"""
+        # 이전 실행에서 남은 소켓 파일 정리
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        self.server = _AdminUnixServer(self.socket_path, _AdminRequestHandler)
+        self.server.service = self.service
+        os.chmod(self.socket_path, 0o600)
+
+        self.thread = Thread(target=self.server.serve_forever, name='admin-server', daemon=True)
+        self.thread.start()
+        logger.info(f"관리 소켓 시작: {self.socket_path}")
+
+    def stop(self):
+        """서버 종료 및 소켓 파일 삭제"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+        logger.info("관리 소켓 종료")
+
+def send_admin_command(command, socket_path=None, timeout=5, **params):
+    """실행 중인 서비스에 관리 명령 전송 후 응답(dict) 반환
+
+    서비스가 실행 중이 아니면 FileNotFoundError / ConnectionRefusedError 발생
+    """
+    request = dict(params, command=command)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path or get_socket_path())
+        sock.sendall((json.dumps(request, ensure_ascii=False) + '\n').encode('utf-8'))
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b'\n'):
+                break
+
+    return json.loads(b''.join(chunks).decode('utf-8'))
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sony 재고 모니터링 서비스 관리 소켓 클라이언트")
+    parser.add_argument('command', choices=ADMIN_COMMANDS, help='관리 명령')
+    parser.add_argument('--product', type=str, help='대상 제품 ID (pause/resume/check)')
+    parser.add_argument('--wait', action='store_true', help='check 명령 결과를 기다림')
+    args = parser.parse_args()
+
+    params = {}
+    if args.product:
+        params['product'] = args.product
+    if args.wait:
+        params['wait'] = True
+
+    try:
+        result = send_admin_command(args.command, timeout=120 if args.wait else 5, **params)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("⚠️ 실행 중인 서비스를 찾을 수 없습니다")
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    sys.exit(0 if result.get('ok') else 1)
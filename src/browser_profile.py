@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Chrome 프로필(user-data-dir) / 디스크 캐시 관리
+- CHROME_PROFILE_DIR 아래 제품별 프로필을 재사용해 재시작 후에도 캐시/쿠키/HSTS 유지
+- 크기 상한 초과 시 캐시 비우기 → 그래도 크면 프로필 초기화
+- 손상된 프로필(깨진 Local State / Preferences) 감지 시 자동 초기화
+- 다른 프로세스가 사용 중인 프로필이면 임시 프로필로 대체
+"""
+
+import os
+import json
+import time
+import fcntl
+import shutil
+import socket
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Chrome이 프로필 사용 중 남기는 잠금 파일
+CHROME_SINGLETON_FILES = ('SingletonLock', 'SingletonCookie', 'SingletonSocket')
+
+# 손상 여부를 확인할 JSON 파일 (프로필 기준 상대 경로)
+PROFILE_JSON_FILES = ('Local State', os.path.join('Default', 'Preferences'))
+
+def _dir_size(path):
+    """디렉토리 전체 크기 (바이트, 심볼릭 링크 제외)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            if not os.path.islink(os.path.join(root, name)):
+                total += st.st_size
+    return total
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class ChromeProfile:
+    """제품 1개가 사용하는 Chrome 프로필 디렉토리"""
+
+    def __init__(self, root_dir, name, max_cache_mb=200, max_profile_mb=500):
+        self.path = os.path.join(root_dir, name)
+        self.max_cache_bytes = max_cache_mb * 1024 * 1024
+        self.max_profile_bytes = max_profile_mb * 1024 * 1024
+        self.persistent = True
+        self.lock_file = None
+        self.temp_dir = None
+
+    @classmethod
+    def from_env(cls, name):
+        """CHROME_PROFILE_DIR 설정 시 프로필 생성 (미설정 시 None → Chrome 임시 프로필)"""
+        root_dir = os.getenv('CHROME_PROFILE_DIR', '')
+        if not root_dir:
+            return None
+        return cls(root_dir, name,
+                   max_cache_mb=int(os.getenv('CHROME_CACHE_MAX_MB', 200)),
+                   max_profile_mb=int(os.getenv('CHROME_PROFILE_MAX_MB', 500)))
+
+    @property
+    def user_data_dir(self):
+        return self.temp_dir or self.path
+
+    @property
+    def cache_dir(self):
+        return os.path.join(self.user_data_dir, 'DiskCache')
+
+    def chrome_arguments(self):
+        """Chrome 실행 인자 (prepare() 이후 호출)"""
+        return [
+            f'--user-data-dir={self.user_data_dir}',
+            f'--disk-cache-dir={self.cache_dir}',
+            f'--disk-cache-size={self.max_cache_bytes}',
+        ]
+
+    def prepare(self):
+        """브라우저 실행 전 잠금/손상/크기 확인 (Chrome 시작 때마다 호출)"""
+        if self.temp_dir:
+            return
+        os.makedirs(self.path, exist_ok=True)
+
+        if not self._acquire_lock() or self._locked_by_other_chrome():
+            self._use_temp_profile()
+            return
+
+        self._clear_stale_singletons()
+
+        if self._is_corrupt():
+            self.reset("프로필 파일 손상")
+        else:
+            self._enforce_size_caps()
+
+    def reset(self, reason):
+        """프로필 내용 삭제 (잠금 파일은 유지)"""
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = tempfile.mkdtemp(prefix='chrome-profile-')
+            return
+        logger.warning(f"Chrome 프로필 초기화 ({reason}): {self.path}")
+        for name in os.listdir(self.path):
+            if name == '.monitor.lock':
+                continue
+            target = os.path.join(self.path, name)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target, ignore_errors=True)
+            else:
+                try:
+                    os.remove(target)
+                except OSError:
+                    pass
+
+    def release(self):
+        """잠금 해제 및 임시 프로필 정리"""
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+        if self.lock_file:
+            try:
+                fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+                self.lock_file.close()
+            except OSError:
+                pass
+            self.lock_file = None
+
+    def _acquire_lock(self):
+        """같은 볼륨을 쓰는 다른 모니터 프로세스와 프로필 공유 방지"""
+        if self.lock_file:
+            return True
+        lock_file = open(os.path.join(self.path, '.monitor.lock'), 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self.lock_file = lock_file
+        return True
+
+    def _singleton_owner(self):
+        """SingletonLock 심볼릭 링크("호스트명-PID") → (호스트명, PID) 또는 None"""
+        try:
+            target = os.readlink(os.path.join(self.path, 'SingletonLock'))
+        except OSError:
+            return None
+        host, _, pid = target.rpartition('-')
+        return (host, int(pid)) if pid.isdigit() else None
+
+    def _locked_by_other_chrome(self):
+        owner = self._singleton_owner()
+        return bool(owner and owner[0] == socket.gethostname() and _pid_alive(owner[1]))
+
+    def _clear_stale_singletons(self):
+        """비정상 종료로 남은 Chrome 잠금 파일 제거 (살아 있는 Chrome이 없음을 확인한 뒤 호출)"""
+        for name in CHROME_SINGLETON_FILES:
+            target = os.path.join(self.path, name)
+            if os.path.lexists(target):
+                try:
+                    os.remove(target)
+                except OSError:
+                    pass
+
+    def _use_temp_profile(self):
+        self.persistent = False
+        self.temp_dir = tempfile.mkdtemp(prefix='chrome-profile-')
+        logger.warning(f"Chrome 프로필 사용 중 - 임시 프로필로 실행: {self.path}")
+
+    def _is_corrupt(self):
+        for relative in PROFILE_JSON_FILES:
+            target = os.path.join(self.path, relative)
+            if not os.path.exists(target):
+                continue
+            try:
+                with open(target, encoding='utf-8') as f:
+                    json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f"Chrome 프로필 파일 손상 감지: {relative}")
+                return True
+        return False
+
+    def _enforce_size_caps(self):
+        started = time.monotonic()
+        if os.path.isdir(self.cache_dir) and _dir_size(self.cache_dir) > self.max_cache_bytes:
+            logger.info(f"Chrome 디스크 캐시 상한 초과 - 캐시 비움: {self.cache_dir}")
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+        profile_size = _dir_size(self.path)
+        if profile_size > self.max_profile_bytes:
+            self.reset(f"크기 상한 초과 {profile_size / 1024 / 1024:.0f}MB")
+        logger.debug(f"Chrome 프로필 크기 확인 ({time.monotonic() - started:.2f}s): {profile_size} bytes")
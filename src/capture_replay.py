@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+캡처 재생 도구
+- CAPTURE_DIR에 저장된 페이지/조각을 네트워크 없이 StockMonitor 판단 로직으로 다시 분류
+- 기록된 결과와 다른 캡처를 출력 (Selector/재고 문구 변경 전 검증, 오분류 분석)
+- 압축 해제는 시작할 때 한 번만 하므로 측정 속도는 순수 파싱/판단 속도
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.capture_store import CaptureStore
+from src.stock_monitor import StockMonitor, BlockedPageError, BLOCKED_STATUS_CODES
+from src.html_extract import parse_selector, UnsupportedSelectorError
+
+def _http_supported(name, selector):
+    """HTTP 백엔드로 해석할 수 있는 Selector인지 (아니면 경고 후 False)"""
+    try:
+        parse_selector(selector)
+        return True
+    except UnsupportedSelectorError as e:
+        print(f"⚠️ HTTP 백엔드에서 해석할 수 없는 Selector ({name}) - 재생에서 제외: {str(e)}")
+        return False
+
+def _build_monitor(entry, selector=None):
+    """캡처 당시 설정(Selector 덮어쓰기 가능)의 HTTP 백엔드 모니터 (요청은 보내지 않음)
+
+    selenium 백엔드에서 캡처한 옵션/가격 Selector 중 HTTP 백엔드가 해석하지 못하는 것은 빼고 재생
+    (재고 판단에는 쓰이지 않음, 재고 요소 Selector는 미지원이어도 페이지 전체 검색으로 판단)
+    """
+    selectors = entry.get('selectors') or {}
+    variants = {name: variant for name, variant in (selectors.get('variants') or {}).items()
+                if _http_supported(f"옵션 {name}", variant)}
+    price_selector = selectors.get('price') or ''
+    if price_selector and not _http_supported('가격', price_selector):
+        price_selector = ''
+    return StockMonitor(entry['url'], selector or selectors.get('stock', ''), timing_sinks=[], fetch_backend='http',
+                        variants=variants, price_selector=price_selector, proxy_pool=False, capture_store=False)
+
+def _classify(monitor, entry, content):
+    """캡처 1개 재판단 → 상태 (차단 페이지면 blocked)"""
+    # 차단 응답 코드는 본문과 관계없이 차단 (본문은 분석용으로만 저장됨)
+    if entry.get('http_status') in BLOCKED_STATUS_CODES:
+        return 'blocked'
+    try:
+        if entry.get('kind') == 'fragment':
+            return monitor.classify_fragment(content).status
+        return monitor.classify_html(content).status
+    except BlockedPageError:
+        return 'blocked'
+
+def replay(store, product_id=None, selector=None, repeat=1, show=20):
+    """저장된 캡처 재생 → 기록과 다른 캡처 수"""
+    entries = store.entries(product_id)
+    if not entries:
+        print("📭 재생할 캡처가 없습니다")
+        return 0
+
+    # 같은 내용은 한 번만 압축 해제 (기록은 내용 파일을 공유)
+    contents = {}
+    for entry in entries:
+        if entry['blob'] not in contents:
+            try:
+                contents[entry['blob']] = store.load(entry)
+            except OSError as e:
+                print(f"⚠️ 캡처 파일 읽기 실패 ({entry['blob'][:12]}): {str(e)}")
+    entries = [e for e in entries if e['blob'] in contents]
+
+    monitors = {}
+    mismatches = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        mismatches = []
+        for entry in entries:
+            key = (entry['url'], repr(entry.get('selectors')))
+            if key not in monitors:
+                monitors[key] = _build_monitor(entry, selector)
+            status = _classify(monitors[key], entry, contents[entry['blob']])
+            if status != entry['status']:
+                mismatches.append((entry, status))
+    elapsed = time.perf_counter() - started
+    for monitor in monitors.values():
+        monitor.close()
+
+    total = len(entries) * repeat
+    print(f"▶️ 캡처 {len(entries)}개 (내용 {len(contents)}개) × {repeat}회 재생: "
+          f"{elapsed:.2f}초, {total / elapsed if elapsed else 0:.0f}페이지/초")
+    if not mismatches:
+        print("✅ 모든 캡처가 기록된 결과와 같습니다")
+        return 0
+
+    print(f"❌ 기록과 다른 결과 {len(mismatches)}개:")
+    for entry, status in mismatches[:show]:
+        print(f"  {entry['captured_at']} {entry['product_id']} [{entry['kind']}] "
+              f"{entry['status']} → {status} ({entry['blob'][:12]})")
+    if len(mismatches) > show:
+        print(f"  ... 외 {len(mismatches) - show}개")
+    return len(mismatches)
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 페이지 캡처로 재고 판단 재생")
+    parser.add_argument('--dir', type=str, default=os.getenv('CAPTURE_DIR', ''), help='캡처 저장소 경로 (기본값: CAPTURE_DIR)')
+    parser.add_argument('--product', type=str, help='재생할 제품 ID (기본값: 전체)')
+    parser.add_argument('--selector', type=str, help='캡처 당시 대신 사용할 재고 요소 CSS Selector')
+    parser.add_argument('--repeat', type=int, default=1, help='처리 속도 측정용 반복 횟수')
+    parser.add_argument('--prune', action='store_true', help='보관 기간/크기 상한 적용 후 종료')
+
+    args = parser.parse_args()
+    if not args.dir:
+        print("❌ 캡처 저장소 경로가 없습니다 (--dir 또는 CAPTURE_DIR)")
+        sys.exit(2)
+    if not os.path.isdir(args.dir):
+        print(f"❌ 캡처 저장소가 없습니다: {args.dir}")
+        sys.exit(2)
+
+    # 캡처마다 남는 판단 로그는 숨김
+    logging.basicConfig(level=logging.WARNING)
+    store = CaptureStore(args.dir,
+                         max_bytes=int(float(os.getenv('CAPTURE_MAX_MB', 200)) * 1024 * 1024),
+                         max_age_days=float(os.getenv('CAPTURE_MAX_AGE_DAYS', 14)))
+    if args.prune:
+        removed = store.prune()
+        print(f"🧹 파일 {removed}개 삭제 ({store.total_bytes / 1024 / 1024:.1f}MB 유지)")
+        return
+
+    mismatches = replay(store, args.product, args.selector, max(1, args.repeat))
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+페이지 캡처 저장소 (record & replay)
+- 확인마다 가져온 페이지 HTML(또는 추출한 요소 조각)을 내용 해시(SHA-256) 이름의 gzip 파일로 저장
+- 같은 내용은 한 번만 저장 (대부분의 확인은 페이지가 바뀌지 않음), 확인 기록은 captures.jsonl 색인에 추가
+- 보관 기간 / 전체 크기 상한을 넘으면 오래된 기록부터 삭제
+- 저장된 캡처는 capture_replay.py로 네트워크 없이 다시 판단 (Selector/문구 변경 검증, 오분류 분석)
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime
+from threading import Lock
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ('page', 'fragment')
+INDEX_FILE = 'captures.jsonl'
+BLOB_DIR = 'blobs'
+
+class CaptureStore:
+    """내용 주소 기반 압축 캡처 저장소 (여러 모니터가 함께 사용, 스레드 안전)"""
+
+    def __init__(self, root, max_bytes=200 * 1024 * 1024, max_age_days=14, mode='page', prune_every=100):
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"지원하지 않는 CAPTURE_MODE: {mode} (가능: {', '.join(CAPTURE_MODES)})")
+        self.root = root
+        self.max_bytes = max_bytes  # 0이면 크기 제한 없음
+        self.max_age_days = max_age_days  # 0이면 기간 제한 없음
+        self.mode = mode  # page: 페이지 HTML 전체 / fragment: 재고/옵션/가격 요소 상태만 (요소로 판단 못 하면 페이지)
+        self.prune_every = prune_every  # 새 파일을 이만큼 저장할 때마다 정리
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.lock = Lock()
+        self._stored_since_prune = 0
+        os.makedirs(os.path.join(root, BLOB_DIR), exist_ok=True)
+        self.total_bytes = self._blob_bytes()
+        metrics.CAPTURE_STORE_BYTES.set(self.total_bytes)
+
+    @classmethod
+    def from_env(cls):
+        """CAPTURE_* 환경변수로 생성 (CAPTURE_DIR가 비어 있으면 None)"""
+        root = os.getenv('CAPTURE_DIR', '')
+        if not root:
+            return None
+        return cls(root,
+                   max_bytes=int(float(os.getenv('CAPTURE_MAX_MB', 200)) * 1024 * 1024),
+                   max_age_days=float(os.getenv('CAPTURE_MAX_AGE_DAYS', 14)),
+                   mode=os.getenv('CAPTURE_MODE', 'page').lower())
+
+    def add(self, monitor, status, result=None):
+        """모니터의 마지막 확인을 저장 (status: 재고 상태 또는 blocked, 저장할 내용이 없으면 None 반환)"""
+        kind, content = self._content(monitor, result)
+        if content is None:
+            return None
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        entry = {
+            'captured_at': datetime.now().isoformat(timespec='seconds'),
+            'product_id': monitor.product_id,
+            'url': monitor.website_url,
+            'backend': monitor.fetch_backend,
+            'kind': kind,
+            'blob': digest,
+            'status': status,
+            'http_status': monitor.last_http_status,
+            'source': result.source if result is not None else None,
+            'matched': result.matched if result is not None else None,
+            'text': result.text if result is not None else None,
+            'selectors': {'stock': monitor.stock_selector, 'variants': monitor.variants, 'price': monitor.price_selector},
+        }
+        with self.lock:
+            stored = self._write_blob(digest, data)
+            entry['size'] = stored
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            if stored:
+                self._stored_since_prune += 1
+                if self._stored_since_prune >= self.prune_every or (self.max_bytes and self.total_bytes > self.max_bytes):
+                    self._prune()
+        metrics.CAPTURES_TOTAL.inc(product=monitor.product_id, result='stored' if stored else 'deduplicated')
+        return entry
+
+    def entries(self, product_id=None):
+        """색인의 캡처 기록 (오래된 순, product_id를 주면 해당 제품만)"""
+        if not os.path.exists(self.index_path):
+            return []
+        entries = []
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 쓰는 도중 종료된 마지막 줄
+                if product_id is None or entry.get('product_id') == product_id:
+                    entries.append(entry)
+        return entries
+
+    def load(self, entry):
+        """캡처 내용 (page: HTML 문자열 / fragment: dict)"""
+        with gzip.open(self._blob_path(entry['blob']), 'rb') as f:
+            content = f.read().decode('utf-8')
+        return json.loads(content) if entry.get('kind') == 'fragment' else content
+
+    def prune(self):
+        """보관 기간/크기 상한 적용 → 삭제한 파일 수"""
+        with self.lock:
+            return self._prune()
+
+    def _content(self, monitor, result):
+        """(종류, 저장할 문자열)
+
+        fragment 모드라도 요소 텍스트로 판단하지 못한 확인(페이지 전체 검색/JSON-LD, 차단 페이지)은
+        조각만으로 다시 판단할 수 없으므로 페이지 전체 저장
+        """
+        if (self.mode == 'fragment' and result is not None and result.source == 'selector'
+                and monitor.last_stock_state is not None):
+            fragment = {'stock': list(monitor.last_stock_state),
+                        'extras': {name: list(state) if state else None for name, state in monitor.last_extras.items()}}
+            return 'fragment', json.dumps(fragment, ensure_ascii=False, sort_keys=True)
+        return 'page', monitor.last_page
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, BLOB_DIR, digest[:2], f"{digest}.html.gz")
+
+    def _write_blob(self, digest, data):
+        """새로 저장했으면 압축 크기, 이미 있으면 0"""
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        self.total_bytes += size
+        metrics.CAPTURE_STORE_BYTES.set(self.total_bytes)
+        return size
+
+    def _blob_bytes(self):
+        total = 0
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, BLOB_DIR)):
+            total += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+        return total
+
+    def _prune(self):
+        self._stored_since_prune = 0
+        entries = all_entries = self.entries()
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            entries = [e for e in entries if datetime.fromisoformat(e['captured_at']).timestamp() >= cutoff]
+
+        # 새 기록부터 크기 상한까지 유지 (파일은 여러 기록이 공유하므로 처음 나올 때만 계산)
+        kept, kept_blobs, size = [], set(), 0
+        for entry in reversed(entries):
+            if entry['blob'] not in kept_blobs:
+                path = self._blob_path(entry['blob'])
+                blob_size = os.path.getsize(path) if os.path.exists(path) else 0
+                if self.max_bytes and size + blob_size > self.max_bytes:
+                    break
+                kept_blobs.add(entry['blob'])
+                size += blob_size
+            kept.append(entry)
+        kept.reverse()
+
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in kept:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.index_path)
+
+        removed = 0
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, BLOB_DIR)):
+            for name in filenames:
+                if name.split('.', 1)[0] not in kept_blobs:
+                    os.remove(os.path.join(dirpath, name))
+                    removed += 1
+        self.total_bytes = self._blob_bytes()
+        metrics.CAPTURE_STORE_BYTES.set(self.total_bytes)
+        if removed:
+            logger.info(f"캡처 저장소 정리: 파일 {removed}개 삭제, 기록 {len(all_entries) - len(kept)}개 삭제 "
+                        f"({self.total_bytes / 1024 / 1024:.1f}MB 유지)")
+        return removed
+
+_default_store = None
+_default_store_loaded = False
+
+def get_capture_store():
+    """환경변수 기준 기본 캡처 저장소 (프로세스 내 공유, 설정이 없으면 None)"""
+    global _default_store, _default_store_loaded
+    if not _default_store_loaded:
+        _default_store = CaptureStore.from_env()
+        _default_store_loaded = True
+    return _default_store
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+제품별 확인 일정과 시간대
+- CHECK_SCHEDULE: cron 형식(분 시 일 월 요일) 규칙 목록, 일치하는 분에만 확인 (시간대/요일별로 다른 주기)
+- CHECK_BLACKOUT: 확인하지 않는 시간대 ('02:00-06:00', 'sun 00:00-09:00', 'mon-fri 01:00-07:00')
+- QUIET_HOURS: 알림을 보류하는 시간대, 보류한 알림은 시간대가 끝나면 묶어 발송 (digest, Discord 길이 상한을 넘으면 나눠 발송)
+- 규칙은 ';'로 구분, '[제품 ID] ' 접두어를 붙이면 그 제품 전용 (제품 전용 규칙이 있으면 공통 규칙 대신 사용)
+"""
+
+import re
+import logging
+from datetime import datetime, timedelta
+
+DAY_NAMES = {'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6}
+MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])}
+
+_PRODUCT_PREFIX_RE = re.compile(r'^\[(?P<product>[^\]]+)\]\s*(?P<rule>.*)$')
+
+# Discord 메시지(content) 길이 상한
+MESSAGE_LIMIT = 2000
+
+logger = logging.getLogger(__name__)
+
+def parse_hhmm(value):
+    """'HH:MM' → 자정부터 분"""
+    try:
+        hours, minutes = value.strip().split(':')
+        hours, minutes = int(hours), int(minutes)
+    except ValueError:
+        raise ValueError(f"시간 형식이 올바르지 않습니다 (HH:MM): {value}")
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        raise ValueError(f"시간 범위가 올바르지 않습니다: {value}")
+    return hours * 60 + minutes
+
+def cron_weekday(when):
+    """datetime → cron 요일 (0: 일요일)"""
+    return (when.weekday() + 1) % 7
+
+def _parse_value(value, names):
+    value = value.strip().lower()
+    if names and value in names:
+        return names[value]
+    if not value.isdigit():
+        raise ValueError(f"값이 올바르지 않습니다: {value}")
+    return int(value)
+
+def _parse_field(field, low, high, names=None):
+    """cron 필드 하나 ('*', '*/5', '1-5', '10-22/2', 'mon,wed') → 값 집합"""
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            if not step_text.isdigit() or int(step_text) < 1:
+                raise ValueError(f"간격이 올바르지 않습니다: {field}")
+            step = int(step_text)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (_parse_value(v, names) for v in part.split('-', 1))
+        else:
+            start = _parse_value(part, names)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"범위를 벗어났습니다 ({low}-{high}): {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+class CronExpression:
+    """cron 형식 '분 시 일 월 요일' (요일 0/7: 일요일, 이름 사용 가능, 일/요일을 모두 지정하면 둘 중 하나만 맞아도 일치)"""
+
+    def __init__(self, spec):
+        self.spec = spec.strip()
+        fields = self.spec.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 규칙은 '분 시 일 월 요일' 5개 필드여야 합니다: {spec}")
+        try:
+            self.minutes = _parse_field(fields[0], 0, 59)
+            self.hours = _parse_field(fields[1], 0, 23)
+            self.days = _parse_field(fields[2], 1, 31)
+            self.months = _parse_field(fields[3], 1, 12, MONTH_NAMES)
+            self.weekdays = frozenset(day % 7 for day in _parse_field(fields[4], 0, 7, DAY_NAMES))
+        except ValueError as e:
+            raise ValueError(f"cron 규칙 '{self.spec}': {str(e)}")
+        self.any_day = fields[2].startswith('*')
+        self.any_weekday = fields[4].startswith('*')
+
+    def matches(self, when):
+        if when.minute not in self.minutes or when.hour not in self.hours or when.month not in self.months:
+            return False
+        day_ok = when.day in self.days
+        weekday_ok = cron_weekday(when) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+class TimeWindows:
+    """시간대 목록 ('23:00-07:00,sat-sun 10:00-12:00', 자정을 넘는 구간은 시작 요일 기준)"""
+
+    def __init__(self, spec=''):
+        self.spec = spec or ''
+        self.windows = []  # (요일 집합 또는 None, 시작 분, 끝 분)
+        for part in self.spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            days = None
+            if ' ' in part:
+                day_spec, part = part.split(None, 1)
+                days = _parse_days(day_spec)
+            if '-' not in part:
+                raise ValueError(f"시간대 형식이 올바르지 않습니다 ([요일] HH:MM-HH:MM): {part}")
+            start, end = part.split('-', 1)
+            self.windows.append((days, parse_hhmm(start), parse_hhmm(end)))
+
+    def __bool__(self):
+        return bool(self.windows)
+
+    def contains(self, when=None):
+        when = when or datetime.now()
+        minute = when.hour * 60 + when.minute
+        today = cron_weekday(when)
+        yesterday = (today - 1) % 7
+        for days, start, end in self.windows:
+            if start <= end:
+                if start <= minute < end and (days is None or today in days):
+                    return True
+            elif minute >= start and (days is None or today in days):
+                return True
+            elif minute < end and (days is None or yesterday in days):
+                return True
+        return False
+
+def _parse_days(spec):
+    """'mon', 'mon-fri', 'fri-mon'(주말을 넘는 범위) → 요일 집합"""
+    try:
+        if '-' in spec:
+            start, end = (_parse_value(v, DAY_NAMES) % 7 for v in spec.split('-', 1))
+            return frozenset((start + i) % 7 for i in range((end - start) % 7 + 1))
+        return frozenset([_parse_value(spec, DAY_NAMES) % 7])
+    except ValueError:
+        raise ValueError(f"요일 형식이 올바르지 않습니다 (예: mon, mon-fri): {spec}")
+
+def split_rules(value):
+    """';' 구분 규칙 → {제품 ID 또는 None(공통): [규칙, ...]}"""
+    rules = {}
+    for rule in (value or '').split(';'):
+        rule = rule.strip()
+        if not rule:
+            continue
+        product = None
+        match = _PRODUCT_PREFIX_RE.match(rule)
+        if match:
+            product, rule = match.group('product').strip(), match.group('rule').strip()
+            if not rule:
+                raise ValueError(f"제품 '{product}'의 규칙이 비어 있습니다")
+        rules.setdefault(product, []).append(rule)
+    return rules
+
+class CheckSchedule:
+    """제품별 확인 일정(cron), 확인 중단 시간대, 알림 금지 시간대 (설정 문자열이 올바르지 않으면 ValueError)"""
+
+    def __init__(self, schedule='', blackout='', quiet_hours=''):
+        self.spec = {'schedule': schedule or '', 'blackout': blackout or '', 'quiet_hours': quiet_hours or ''}
+        self.crons = {product: [CronExpression(rule) for rule in rules]
+                      for product, rules in split_rules(schedule).items()}
+        self.blackouts = {product: TimeWindows(','.join(rules)) for product, rules in split_rules(blackout).items()}
+        self.quiet_hours = {product: TimeWindows(','.join(rules)) for product, rules in split_rules(quiet_hours).items()}
+
+    @staticmethod
+    def _lookup(table, product_id):
+        return table.get(product_id, table.get(None))
+
+    def has_cron(self, product_id):
+        """CHECK_SCHEDULE 규칙이 있는 제품인지 (없으면 CHECK_INTERVAL_MINUTES 고정 주기)"""
+        return bool(self._lookup(self.crons, product_id))
+
+    def is_due(self, product_id, when=None):
+        """이 분에 확인할 차례인지 (cron 규칙 중 하나라도 일치)"""
+        when = when or datetime.now()
+        return any(cron.matches(when) for cron in self._lookup(self.crons, product_id) or [])
+
+    def in_blackout(self, product_id, when=None):
+        windows = self._lookup(self.blackouts, product_id)
+        return bool(windows) and windows.contains(when)
+
+    def in_quiet_hours(self, product_id, when=None):
+        windows = self._lookup(self.quiet_hours, product_id)
+        return bool(windows) and windows.contains(when)
+
+    def next_run(self, product_id, after=None, limit_days=8):
+        """다음 확인 예정 시각 (분 단위, 확인 중단 시간대 제외, limit_days 안에 없으면 None)"""
+        when = (after or datetime.now()).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(limit_days * 24 * 60):
+            if self.is_due(product_id, when) and not self.in_blackout(product_id, when):
+                return when
+            when += timedelta(minutes=1)
+        return None
+
+    def longest_gap_seconds(self, product_id, start=None, days=7):
+        """일정상 가장 긴 확인 간격 (확인 중단 시간대는 간격에 넣지 않음, heartbeat 허용 시간 계산용)"""
+        when = (start or datetime.now()).replace(second=0, microsecond=0)
+        longest = gap = 0
+        for _ in range(days * 24 * 60):
+            if self.in_blackout(product_id, when) or self.is_due(product_id, when):
+                gap = 0
+            else:
+                gap += 1
+                longest = max(longest, gap)
+            when += timedelta(minutes=1)
+        return (longest + 1) * 60
+
+    def snapshot(self, product_ids=()):
+        """관리 명령/상태 조회용 요약"""
+        now = datetime.now()
+        products = {}
+        for product_id in product_ids:
+            next_run = self.next_run(product_id, now) if self.has_cron(product_id) else None
+            products[product_id] = {
+                'cron': [cron.spec for cron in self._lookup(self.crons, product_id) or []],
+                'next_run': next_run.strftime('%Y-%m-%d %H:%M') if next_run else None,
+                'blackout': self.in_blackout(product_id, now),
+                'quiet_hours': self.in_quiet_hours(product_id, now),
+            }
+        return {'config': dict(self.spec), 'products': products}
+
+class AlertDigest:
+    """알림 금지 시간대에 보류한 알림 (수신처 키별), 시간대가 끝나면 묶어서 발송"""
+
+    def __init__(self, max_items=10, max_failures=3, limit=MESSAGE_LIMIT):
+        self.max_items = max_items
+        self.max_failures = max_failures
+        self.limit = limit
+        self.held = {}  # 수신처 키 → [(보류 시각 문자열, 메시지)]
+        self.failures = {}  # 수신처 키 → 연속 발송 실패 횟수
+        self.dropped = 0
+
+    def hold(self, key, message, now=None):
+        self.held.setdefault(key, []).append(((now or datetime.now()).strftime('%H:%M'), message))
+
+    def pending(self):
+        return sum(len(messages) for messages in self.held.values())
+
+    def messages(self, items):
+        """보류 알림 → limit자 이하 메시지 목록 [(메시지, 포함한 알림 수)] (max_items개 뒤는 건수만, 긴 알림은 잘라냄)"""
+        header = (f"📬 **알림 금지 시간 동안 보류된 알림 {len(items)}건** 📬\n"
+                  f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        blocks = [(f"[{held_at}] {text}", 1) for held_at, text in items[:self.max_items]]
+        if len(items) > self.max_items:
+            blocks.append((f"... 외 {len(items) - self.max_items}건", len(items) - self.max_items))
+
+        messages = []
+        body, count = header, 0
+        for block, items_in_block in blocks:
+            separator = "\n\n" if count else ""
+            if count and len(body) + len(separator) + len(block) > self.limit:
+                messages.append((body, count))
+                body, count, separator = "📬 **보류된 알림 (계속)** 📬\n", 0, ""
+            room = self.limit - len(body) - len(separator)
+            if len(block) > room:
+                block = block[:room - 1] + "…"
+            body += separator + block
+            count += items_in_block
+        messages.append((body, count))
+        return messages
+
+    def flush(self, key, send):
+        """key의 보류 알림을 묶어 send(메시지)로 발송 → 발송한 알림 수
+
+        실패하면 보내지 못한 알림만 다시 보류, max_failures번 연속 실패하면 버림 (dropped에 누적)
+        """
+        items = self.held.pop(key, [])
+        if not items:
+            return 0
+        sent = 0
+        for message, count in self.messages(items):
+            if not send(message):
+                break
+            sent += count
+        else:
+            self.failures.pop(key, None)
+            return sent
+
+        remaining = items[sent:]
+        failures = self.failures.get(key, 0) + 1
+        if failures >= self.max_failures:
+            self.failures.pop(key, None)
+            self.dropped += len(remaining)
+            logger.error(f"보류 알림 {len(remaining)}건 발송 {failures}회 연속 실패 - 버림 ({key[1]})")
+        else:
+            self.failures[key] = failures
+            self.held[key] = remaining + self.held.get(key, [])
+        return sent
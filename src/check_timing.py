@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+재고 확인 단계별 시간 측정
+- 시도(attempt)별 단계(navigate/ready_wait/locate/extract 등) monotonic 타임스탬프 기록
+- 결과를 싱크(log / ring / history / metrics)로 전달
+- 싱크가 없으면 아무것도 하지 않는 NullTimer 사용 (오버헤드 거의 없음)
+"""
+
+import os
+import json
+import time
+import logging
+from collections import deque
+from threading import Lock
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+class CheckTimer:
+    """재고 확인 1회의 단계별 시간 기록"""
+
+    enabled = True
+
+    def __init__(self, product_id, sinks):
+        self.product_id = product_id
+        self.sinks = sinks
+        self.started = time.monotonic()
+        self.last_mark = self.started
+        self.attempts = []
+
+    def start_attempt(self, attempt):
+        now = time.monotonic()
+        self.attempts.append({'attempt': attempt, 'started': now, 'ended': None, 'error': None, 'phases': []})
+        self.last_mark = now
+
+    def mark(self, phase):
+        """직전 표시 시점부터 지금까지를 phase 구간으로 기록"""
+        now = time.monotonic()
+        if self.attempts:
+            self.attempts[-1]['phases'].append({'phase': phase, 'started': self.last_mark, 'ended': now})
+        self.last_mark = now
+
+    def end_attempt(self, error=None):
+        if self.attempts:
+            self.attempts[-1]['ended'] = time.monotonic()
+            self.attempts[-1]['error'] = error
+
+    def finish(self, outcome):
+        """측정 종료 후 싱크로 전달하고 요약(dict) 반환"""
+        timing = {
+            'product_id': self.product_id,
+            'outcome': outcome,
+            'started': self.started,
+            'total_seconds': round(time.monotonic() - self.started, 4),
+            'attempts': self.attempts,
+        }
+        for sink in self.sinks:
+            try:
+                sink.emit(timing)
+            except Exception as e:
+                logger.debug(f"시간 측정 싱크 오류 ({type(sink).__name__}): {str(e)}")
+        return timing
+
+class NullTimer:
+    """비활성화 상태의 타이머 (모든 호출 무시)"""
+
+    enabled = False
+
+    def start_attempt(self, attempt):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_attempt(self, error=None):
+        pass
+
+    def finish(self, outcome):
+        return None
+
+NULL_TIMER = NullTimer()
+
+def phase_durations(timing):
+    """마지막 시도의 단계별 소요 시간 {phase: seconds}"""
+    if not timing or not timing['attempts']:
+        return {}
+    return {p['phase']: round(p['ended'] - p['started'], 4) for p in timing['attempts'][-1]['phases']}
+
+class LogSink:
+    """단계별 소요 시간을 한 줄로 로그 기록"""
+
+    def emit(self, timing):
+        phases = ', '.join(f"{phase}={seconds:.2f}s" for phase, seconds in phase_durations(timing).items())
+        logger.info(f"재고 확인 시간 [{timing['product_id']}] 총 {timing['total_seconds']:.2f}s "
+                    f"(시도 {len(timing['attempts'])}회) - {phases}")
+
+class RingBufferSink:
+    """최근 N건을 메모리에 보관 (관리 소켓 stats에서 조회)"""
+
+    def __init__(self, size=100):
+        self.buffer = deque(maxlen=size)
+        self.lock = Lock()
+
+    def emit(self, timing):
+        with self.lock:
+            self.buffer.append(timing)
+
+    def recent(self, limit=None):
+        with self.lock:
+            items = list(self.buffer)
+        return items[-limit:] if limit else items
+
+class HistorySink:
+    """확인 이력 파일(JSON Lines)에 추가 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, timing):
+        record = dict(timing, recorded_at=time.time())
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+class MetricsSink:
+    """단계별 소요 시간을 Prometheus 히스토그램에 기록"""
+
+    def emit(self, timing):
+        for attempt in timing['attempts']:
+            for phase in attempt['phases']:
+                metrics.CHECK_PHASE_SECONDS.observe(phase['ended'] - phase['started'],
+                                                    product=timing['product_id'], phase=phase['phase'])
+
+_default_sinks = None
+
+def get_default_sinks():
+    """환경변수 기준 기본 싱크 목록 (프로세스 내 공유)
+
+    CHECK_TIMING_SINKS: 쉼표 구분 (log, ring, history)
+    METRICS_PORT가 설정되면 metrics 싱크 자동 추가
+    """
+    global _default_sinks
+    if _default_sinks is None:
+        names = [n.strip().lower() for n in os.getenv('CHECK_TIMING_SINKS', '').split(',') if n.strip()]
+        sinks = []
+        for name in names:
+            if name == 'log':
+                sinks.append(LogSink())
+            elif name == 'ring':
+                sinks.append(RingBufferSink(int(os.getenv('CHECK_TIMING_RING_SIZE', 100))))
+            elif name == 'history':
+                default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'check_history.jsonl')
+                sinks.append(HistorySink(os.getenv('CHECK_HISTORY_FILE', default_path)))
+            else:
+                logger.warning(f"알 수 없는 시간 측정 싱크: {name}")
+        if os.getenv('METRICS_PORT'):
+            sinks.append(MetricsSink())
+        _default_sinks = sinks
+    return _default_sinks
+
+def get_ring_buffer():
+    """기본 싱크 중 RingBufferSink 반환 (없으면 None)"""
+    for sink in get_default_sinks():
+        if isinstance(sink, RingBufferSink):
+            return sink
+    return None
+
+def new_timer(product_id, sinks=None):
+    """싱크가 있으면 CheckTimer, 없으면 NullTimer"""
+    sinks = get_default_sinks() if sinks is None else sinks
+    return CheckTimer(product_id, sinks) if sinks else NULL_TIMER
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+호스트별 서킷 브레이커
+- closed: 정상, 연속 실패가 기준 횟수에 도달하면 open
+- open: 확인을 건너뜀, 대기 시간이 지나면 half_open으로 확인 1회 허용
+- half_open: 확인 성공 시 closed, 실패 시 대기 시간을 두 배로 늘려 다시 open (상한까지)
+- 상태가 바뀔 때만 이벤트(opened / closed)를 돌려주어 장애 중 알림 폭주 방지
+"""
+
+import os
+import time
+import logging
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 메트릭 게이지 값
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# 상태 변경 이벤트
+OPENED = 'opened'
+CLOSED_AGAIN = 'closed'
+
+class CircuitBreaker:
+    """호스트 1개에 대한 확인 허용 여부 판단"""
+
+    def __init__(self, host, failure_threshold=3, open_seconds=300, max_open_seconds=3600, clock=time.monotonic):
+        self.host = host
+        self.failure_threshold = failure_threshold  # 0이면 비활성화
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.open_count = 0  # 복구 없이 연속으로 open된 횟수 (대기 시간 지수 증가)
+        self.retry_at = None
+        self.last_error = None
+        self.opened_at = None  # 처음 open된 시각 (time.time(), 복구 알림의 장애 지속 시간 계산용)
+        self._set_state(CLOSED)
+
+    @classmethod
+    def from_env(cls, host):
+        """CIRCUIT_BREAKER_* 환경변수로 생성"""
+        return cls(host,
+                   failure_threshold=int(os.getenv('CIRCUIT_BREAKER_FAILURES', 3)),
+                   open_seconds=float(os.getenv('CIRCUIT_BREAKER_OPEN_SECONDS', 300)),
+                   max_open_seconds=float(os.getenv('CIRCUIT_BREAKER_MAX_OPEN_SECONDS', 3600)))
+
+    @property
+    def enabled(self):
+        return self.failure_threshold > 0
+
+    def allow(self):
+        """지금 확인해도 되는지 (open 대기 시간이 지났으면 half_open으로 바꾸고 허용)"""
+        if self.state == OPEN and self.clock() >= self.retry_at:
+            self._set_state(HALF_OPEN)
+            logger.info(f"서킷 브레이커 half-open - 복구 확인 시도: {self.host}")
+        return self.state != OPEN
+
+    def retry_in(self):
+        """다음 복구 확인까지 남은 시간 (초, open이 아니면 0)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.retry_at - self.clock())
+
+    def record_success(self):
+        """확인 성공 → open/half_open에서 복구됐으면 CLOSED_AGAIN 반환"""
+        recovered = self.state != CLOSED
+        self.failures = 0
+        self.open_count = 0
+        self.retry_at = None
+        self.last_error = None
+        if recovered:
+            self._set_state(CLOSED)
+            logger.info(f"서킷 브레이커 closed - 복구됨: {self.host}")
+            return CLOSED_AGAIN
+        return None
+
+    def record_failure(self, error):
+        """확인 실패 → closed에서 open으로 바뀌었으면 OPENED 반환"""
+        self.failures += 1
+        self.last_error = error
+        if not self.enabled:
+            return None
+
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            first_open = self.state == CLOSED
+            self.open_count += 1
+            wait = min(self.open_seconds * 2 ** (self.open_count - 1), self.max_open_seconds)
+            self.retry_at = self.clock() + wait
+            self._set_state(OPEN)
+            if first_open:
+                self.opened_at = time.time()
+            logger.warning(f"서킷 브레이커 open ({self.failures}회 연속 실패, {wait:.0f}초 후 재시도): {self.host} - {error}")
+            return OPENED if first_open else None
+        return None
+
+    def snapshot(self):
+        """관리 명령/상태 조회용 요약"""
+        return {
+            'host': self.host,
+            'state': self.state,
+            'failures': self.failures,
+            'open_count': self.open_count,
+            'retry_in_seconds': round(self.retry_in(), 1),
+            'last_error': self.last_error,
+        }
+
+    def _set_state(self, state):
+        self.state = state
+        metrics.CIRCUIT_BREAKER_STATE.set(STATE_VALUES[state], host=self.host)
@@ -34,6 +34,9 @@ class ConfigManager:
             'NOTIFICATION_MODE': os.getenv('NOTIFICATION_MODE', 'stock_available_only'),
             'CHECK_INTERVAL_MINUTES': int(os.getenv('CHECK_INTERVAL_MINUTES', 3)),
             'HEALTH_CHECK_TIMES': os.getenv('HEALTH_CHECK_TIMES', '09:00,12:00,15:00,18:00,21:00,00:00'),
+            'CHECK_SCHEDULE': os.getenv('CHECK_SCHEDULE', ''),
+            'CHECK_BLACKOUT': os.getenv('CHECK_BLACKOUT', ''),
+            'QUIET_HOURS': os.getenv('QUIET_HOURS', ''),
             'WEBSITE_URL': os.getenv('WEBSITE_URL', ''),
             'STOCK_SELECTOR': os.getenv('STOCK_SELECTOR', ''),
         }
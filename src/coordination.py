@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+여러 인스턴스가 공유하는 조정 저장소 (lease)
+- lease: 이름별 소유 노드 + 만료 시각 + fencing token (소유자가 바뀔 때마다 증가)
+- 노드 등록: 노드마다 만료 시각을 갱신, 만료된 노드는 떠난 것으로 봄
+- 백엔드: SQLite 파일 (공유 스토리지, 트랜잭션으로 원자적 획득), 메모리 (같은 프로세스 안의 대역)
+- LeaseKeeper: 확인 1회가 lease 시간보다 오래 걸려도 가진 lease가 만료되지 않도록 백그라운드 스레드에서 갱신
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from threading import Lock, Thread, Event
+
+logger = logging.getLogger(__name__)
+
+class LeaseStore:
+    """조정 저장소 인터페이스 (시각은 모두 epoch 초, 노드 간 시계가 맞아야 함)"""
+
+    def register_node(self, node_id, ttl, now=None):
+        """노드 등록/갱신 (ttl초 동안 유효)"""
+        raise NotImplementedError
+
+    def remove_node(self, node_id):
+        raise NotImplementedError
+
+    def live_nodes(self, now=None):
+        """만료되지 않은 노드 ID 목록 (정렬)"""
+        raise NotImplementedError
+
+    def acquire(self, name, node_id, ttl, now=None):
+        """lease 획득/갱신 → fencing token (다른 노드가 유효한 lease를 가졌으면 None)"""
+        raise NotImplementedError
+
+    def release(self, name, node_id, now=None):
+        """node_id가 가진 lease 반납 (다른 노드 소유면 무시, 만료 시각은 반납 시각으로 남김)"""
+        raise NotImplementedError
+
+    def get(self, name):
+        """lease 기록 (소유 노드 또는 None, 만료/반납 시각, token), 없으면 None (만료 여부와 관계없이)"""
+        raise NotImplementedError
+
+    def leases(self, now=None):
+        """유효한 lease {이름: (소유 노드, 만료 시각, token)}"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class MemoryLeaseStore(LeaseStore):
+    """메모리 조정 저장소 (같은 프로세스 안의 여러 노드, 벤치마크/로컬 실행용)"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.nodes = {}  # 노드 ID → 만료 시각
+        self.entries = {}  # 이름 → [소유 노드, 만료 시각, token]
+
+    def register_node(self, node_id, ttl, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            self.nodes[node_id] = now + ttl
+
+    def remove_node(self, node_id):
+        with self.lock:
+            self.nodes.pop(node_id, None)
+
+    def live_nodes(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            return sorted(node_id for node_id, expires_at in self.nodes.items() if expires_at > now)
+
+    def acquire(self, name, node_id, ttl, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = self.entries[name] = [None, 0.0, 0]
+            owner, expires_at, token = entry
+            if owner != node_id:
+                if owner is not None and expires_at > now:
+                    return None
+                token += 1
+            self.entries[name] = [node_id, now + ttl, token]
+            return token
+
+    def release(self, name, node_id, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry and entry[0] == node_id:
+                entry[0], entry[1] = None, now
+
+    def get(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+            return tuple(entry) if entry else None
+
+    def leases(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            return {name: (owner, expires_at, token) for name, (owner, expires_at, token) in self.entries.items()
+                    if owner is not None and expires_at > now}
+
+class SQLiteLeaseStore(LeaseStore):
+    """SQLite 파일 조정 저장소 (같은 파일을 여러 호스트/컨테이너가 공유)
+
+    획득은 BEGIN IMMEDIATE 트랜잭션 안에서 확인 후 갱신 (쓰기 잠금으로 두 노드가 동시에 얻지 못함)
+    """
+
+    def __init__(self, path, timeout=10.0):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = Lock()
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        with self.lock:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS nodes (node_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT, "
+                              "expires_at REAL NOT NULL, token INTEGER NOT NULL)")
+
+    def _transaction(self, fn):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self.conn)
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+
+    def register_node(self, node_id, ttl, now=None):
+        now = time.time() if now is None else now
+        self._transaction(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO nodes (node_id, expires_at) VALUES (?, ?)", (node_id, now + ttl)))
+
+    def remove_node(self, node_id):
+        self._transaction(lambda conn: conn.execute("DELETE FROM nodes WHERE node_id = ?", (node_id,)))
+
+    def live_nodes(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            rows = self.conn.execute("SELECT node_id FROM nodes WHERE expires_at > ? ORDER BY node_id", (now,))
+            return [row[0] for row in rows]
+
+    def acquire(self, name, node_id, ttl, now=None):
+        now = time.time() if now is None else now
+
+        def acquire(conn):
+            row = conn.execute("SELECT owner, expires_at, token FROM leases WHERE name = ?", (name,)).fetchone()
+            owner, expires_at, token = row if row else (None, 0.0, 0)
+            if owner != node_id:
+                if owner is not None and expires_at > now:
+                    return None
+                token += 1
+            conn.execute("INSERT OR REPLACE INTO leases (name, owner, expires_at, token) VALUES (?, ?, ?, ?)",
+                         (name, node_id, now + ttl, token))
+            return token
+
+        return self._transaction(acquire)
+
+    def release(self, name, node_id, now=None):
+        now = time.time() if now is None else now
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE leases SET owner = NULL, expires_at = ? WHERE name = ? AND owner = ?", (now, name, node_id)))
+
+    def get(self, name):
+        with self.lock:
+            return self.conn.execute("SELECT owner, expires_at, token FROM leases WHERE name = ?", (name,)).fetchone()
+
+    def leases(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            rows = self.conn.execute("SELECT name, owner, expires_at, token FROM leases "
+                                     "WHERE owner IS NOT NULL AND expires_at > ?", (now,))
+            return {name: (owner, expires_at, token) for name, owner, expires_at, token in rows}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def create_lease_store(spec):
+    """'memory' 또는 SQLite 파일 경로 → LeaseStore"""
+    if spec == 'memory':
+        return MemoryLeaseStore()
+    return SQLiteLeaseStore(spec)
+
+class LeaseKeeper:
+    """가진 lease 갱신 함수를 interval초마다 호출하는 백그라운드 스레드
+
+    메인 루프가 긴 확인(브라우저 페이지 로드 타임아웃, 재시도, 많은 구독 제품) 중이어도 lease 유지,
+    새 lease 획득과 그에 따른 확인은 메인 루프가 맡음 (갱신 함수는 가진 lease만 연장해야 함)
+    """
+
+    def __init__(self, renewers, interval=1.0):
+        self.renewers = list(renewers)
+        self.interval = interval
+        self.stopped = Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = Thread(target=self._run, name='lease-keeper', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            for renew in self.renewers:
+                try:
+                    renew()
+                except Exception as e:
+                    logger.error(f"lease 갱신 스레드 오류: {str(e)}")
@@ -1,24 +1,58 @@
+import os
 import requests
 import logging
 import time
 from datetime import datetime
+from urllib.parse import urlparse
+
+from src import metrics
+from src.proxy_pool import get_proxy_pool, ProxyUnavailableError, OK as PROXY_OK, ERROR as PROXY_ERROR
 
 logger = logging.getLogger(__name__)
 
+# 로컬 mock 서버 호스트 (allow_local_webhook 사용 시에만 허용, 'localhost.example.com' 같은 주소는 제외)
+LOCAL_WEBHOOK_HOSTS = frozenset(['127.0.0.1', 'localhost', '::1'])
+
 class DiscordNotifier:
-    def __init__(self, webhook_url):
+    def __init__(self, webhook_url, product='', allow_local_webhook=None, proxy_pool=None, fence=None):
         self.webhook_url = webhook_url
+        self.product = product  # 메트릭 라벨
+        # 발송 직전 호출, False면 발송하지 않음 (active/standby에서 밀려난 이전 leader의 중복 알림 차단)
+        self.fence = fence
+        if allow_local_webhook is None:
+            allow_local_webhook = os.getenv('DISCORD_WEBHOOK_ALLOW_LOCAL', '').lower() in ('1', 'true', 'yes')
+        self.allow_local_webhook = allow_local_webhook
+        # PROXY_NOTIFIER=true면 재고 확인과 같은 프록시 풀로 발송 (분당 상한에는 포함하지 않음)
+        if proxy_pool is None and os.getenv('PROXY_NOTIFIER', '').lower() in ('1', 'true', 'yes'):
+            proxy_pool = get_proxy_pool()
+        self.proxy_pool = proxy_pool
         self._validate_webhook()
+        # 연결 재사용 (warm_up으로 미리 열어둔 TLS 연결을 첫 알림에서 그대로 사용)
+        self.session = requests.Session()
         
     def _validate_webhook(self):
         """Webhook URL 유효성 검사"""
         if not self.webhook_url:
             raise ValueError("Discord Webhook URL이 설정되지 않았습니다")
+        if self.allow_local_webhook and self._is_local_webhook():
+            logger.warning(f"로컬 Webhook URL 사용 (테스트 전용): {self.webhook_url}")
+            return
         if not self.webhook_url.startswith('https://discord.com/api/webhooks/'):
             raise ValueError("올바른 Discord Webhook URL 형식이 아닙니다")
             
+    def _is_local_webhook(self):
+        """Webhook URL의 호스트가 로컬 주소인지 (http/https만)"""
+        try:
+            parsed = urlparse(self.webhook_url)
+            return parsed.scheme in ('http', 'https') and parsed.hostname in LOCAL_WEBHOOK_HOSTS
+        except ValueError:
+            return False
+            
     def send_message(self, message, max_retries=3):
         """Discord 채널에 메시지 전송"""
+        if self._fenced():
+            return False
+            
         for attempt in range(max_retries):
             try:
                 # Discord 메시지 페이로드
@@ -29,11 +63,10 @@ class DiscordNotifier:
                 }
                 
                 # Discord Webhook 요청
-                response = requests.post(
-                    self.webhook_url,
-                    json=payload,
-                    timeout=10
-                )
+                started = time.monotonic()
+                response = self._post(payload)
+                metrics.WEBHOOK_DELIVERY_SECONDS.observe(time.monotonic() - started, product=self.product,
+                                                         status=response.status_code)
                 
                 # 응답 확인
                 if response.status_code == 204:
@@ -41,6 +74,7 @@ class DiscordNotifier:
                     return True
                 elif response.status_code == 429:
                     # Rate limit 처리
+                    metrics.WEBHOOK_RATE_LIMITED_TOTAL.inc(product=self.product)
                     retry_after = response.json().get('retry_after', 1)
                     logger.warning(f"Discord Rate limit - {retry_after}초 후 재시도")
                     time.sleep(retry_after)
@@ -85,12 +119,11 @@ class DiscordNotifier:
             "embeds": [embed]
         }
         
+        if self._fenced():
+            return False
+            
         try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
+            response = self._post(payload)
             
             if response.status_code == 204:
                 logger.info("Discord Embed 메시지 전송 성공")
@@ -103,6 +136,47 @@ class DiscordNotifier:
             logger.error(f"Discord Embed 메시지 전송 오류: {str(e)}")
             return False
             
+    def _fenced(self):
+        """fence가 발송을 막으면 True"""
+        if self.fence and not self.fence():
+            logger.warning("leader가 아니므로 알림 발송하지 않음 (fencing token 불일치)")
+            return True
+        return False
+        
+    def _post(self, payload):
+        """Webhook 요청 (프록시 풀 사용 시 프록시 선택/결과 기록, 사용 가능한 프록시가 없으면 직접 발송)"""
+        proxy = None
+        if self.proxy_pool:
+            try:
+                proxy = self.proxy_pool.acquire(rate_limited=False)
+            except ProxyUnavailableError as e:
+                logger.warning(f"프록시 없이 Discord 발송: {str(e)}")
+                
+        started = time.monotonic()
+        try:
+            response = self.session.post(self.webhook_url, json=payload, timeout=10,
+                                         proxies=proxy.requests_proxies() if proxy else None)
+        except requests.exceptions.RequestException:
+            if proxy:
+                self.proxy_pool.record(proxy, PROXY_ERROR)
+            raise
+        if proxy:
+            # 응답을 받았으면 (429/5xx 포함) 프록시는 정상
+            self.proxy_pool.record(proxy, PROXY_OK, time.monotonic() - started)
+        return response
+        
+    def warm_up(self):
+        """Webhook 호스트에 미리 연결 (DNS/TLS, 메시지는 보내지 않음)"""
+        started = time.monotonic()
+        try:
+            # GET은 Webhook 정보 조회라 채널에 아무것도 남기지 않음
+            self.session.get(self.webhook_url, timeout=5)
+            logger.info(f"Discord 연결 준비 완료 ({time.monotonic() - started:.2f}s)")
+            return True
+        except Exception as e:
+            logger.warning(f"Discord 연결 준비 실패 (무시): {str(e)}")
+            return False
+            
     def test_webhook(self):
         """Webhook 연결 테스트"""
         test_message = f"🧪 **Discord Webhook 연결 테스트** 🧪\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n✅ 연결이 정상적으로 작동합니다!"
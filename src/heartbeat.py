@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+서비스 heartbeat 파일 + 헬스체크 probe
+- 서비스가 스케줄러 루프와 재고 확인 시작/완료 시마다 상태 파일(JSON) 갱신
+- 확인이 진행 중이면 루프 갱신 허용 간격에 확인 1회 제한 시간을 더함 (긴 페이지 로드 중 재시작 방지)
+- probe는 표준 라이브러리만 사용해 파일을 읽고 판단 (앱/requests import 없음)
+- 스케줄러 멈춤(루프 갱신 끊김)과 재고 확인 연속 실패를 모두 감지
+
+사용 예:
+    python src/heartbeat.py            # 정상이면 종료 코드 0, 아니면 1
+    python src/heartbeat.py --verbose
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+DEFAULT_HEARTBEAT_PATH = '/tmp/sony_stock_monitor.heartbeat.json'
+
+# 스케줄러 루프 갱신이 이 시간(초) 이상 끊기면 비정상
+DEFAULT_MAX_TICK_AGE = 90
+
+# 확인 1회 제한 시간 (초, Selenium 페이지 로드 기본 타임아웃 300초 + 요소 대기/재시작 여유)
+DEFAULT_CHECK_TIMEOUT = 330
+
+def get_heartbeat_path():
+    """HEARTBEAT_FILE 환경변수 (빈 문자열이면 비활성화)"""
+    return os.getenv('HEARTBEAT_FILE', DEFAULT_HEARTBEAT_PATH)
+
+class HeartbeatWriter:
+    """서비스 상태를 heartbeat 파일에 원자적으로 기록"""
+
+    def __init__(self, path, check_interval_seconds, tick_write_interval=10, check_timeout_seconds=DEFAULT_CHECK_TIMEOUT):
+        self.path = path
+        self.tick_write_interval = tick_write_interval
+        self.last_tick_written = 0
+        self.state = {
+            'pid': os.getpid(),
+            'started_at': time.time(),
+            'check_interval_seconds': check_interval_seconds,
+            'check_timeout_seconds': check_timeout_seconds,
+            'tick_at': None,
+            'check_started_at': None,
+            'scheduler_lag_seconds': 0.0,
+            'last_check_at': None,
+            'last_check_ok': None,
+            'last_success_at': None,
+            'consecutive_failures': 0,
+            'paused': False,
+            'resumed_at': None,
+        }
+
+    def tick(self, scheduler_lag_seconds=0.0, paused=False):
+        """스케줄러 루프 1회 (tick_write_interval초마다만 파일 기록)"""
+        now = time.time()
+        if self.state['paused'] and not paused:
+            # 일시정지/확인 중단 시간대가 끝난 시각부터 다시 확인 간격을 셈
+            self.state['resumed_at'] = now
+        # 루프로 돌아왔으면 진행 중인 확인 없음 (재시도 예약으로 완료 기록 없이 끝난 확인 포함)
+        self.state.update(tick_at=now, scheduler_lag_seconds=round(scheduler_lag_seconds, 3), paused=paused,
+                          check_started_at=None)
+        if now - self.last_tick_written >= self.tick_write_interval:
+            self._write()
+            self.last_tick_written = now
+
+    def check_started(self):
+        """재고 확인 1회 시작 (루프 갱신으로도 기록, 확인이 끝날 때까지 check_timeout_seconds만큼 더 기다림)"""
+        now = time.time()
+        self.state.update(tick_at=now, check_started_at=now)
+        self._write()
+
+    def check_completed(self, ok):
+        """재고 확인 1회 완료 (ok: 오류 없이 결과를 얻었는지)"""
+        now = time.time()
+        self.state.update(tick_at=now, check_started_at=None)
+        self.state['last_check_at'] = now
+        self.state['last_check_ok'] = ok
+        if ok:
+            self.state['last_success_at'] = now
+            self.state['consecutive_failures'] = 0
+        else:
+            self.state['consecutive_failures'] += 1
+        self._write()
+
+    def set_check_interval(self, check_interval_seconds):
+        self.state['check_interval_seconds'] = check_interval_seconds
+
+    def _write(self):
+        self.state['updated_at'] = time.time()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # heartbeat 기록 실패가 서비스를 멈추면 안 됨 (probe가 오래된 파일로 감지)
+            pass
+
+def read_heartbeat(path):
+    """heartbeat 파일 읽기 (없거나 깨졌으면 None)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def evaluate(heartbeat, now=None, max_tick_age=DEFAULT_MAX_TICK_AGE, max_check_age=None):
+    """heartbeat 판정 → (정상 여부, 사유)
+
+    max_check_age 미지정 시 체크 주기 × 3 + 60초 안에 성공한 확인이 있어야 정상
+    확인이 진행 중이면 루프 갱신은 max_tick_age + 확인 제한 시간(check_timeout_seconds)까지 허용
+    (일시정지 상태에서는 확인 시각을 보지 않음, 일시정지가 끝난 직후는 재개 시각부터 셈)
+    """
+    if heartbeat is None:
+        return False, "heartbeat 파일 없음"
+
+    now = now or time.time()
+    tick_at = heartbeat.get('tick_at')
+    if tick_at is None:
+        return False, "스케줄러 루프 시작 전"
+    tick_age = now - tick_at
+    if heartbeat.get('check_started_at'):
+        max_tick_age += heartbeat.get('check_timeout_seconds', DEFAULT_CHECK_TIMEOUT)
+    if tick_age > max_tick_age:
+        if heartbeat.get('check_started_at'):
+            return False, f"재고 확인이 {now - heartbeat['check_started_at']:.0f}초 동안 끝나지 않음"
+        return False, f"스케줄러 루프 {tick_age:.0f}초 동안 갱신 없음"
+
+    if heartbeat.get('paused'):
+        return True, "일시정지 상태"
+
+    if max_check_age is None:
+        max_check_age = heartbeat.get('check_interval_seconds', 180) * 3 + 60
+    last_success = heartbeat.get('last_success_at') or heartbeat.get('started_at') or now
+    last_success = max(last_success, heartbeat.get('resumed_at') or 0)
+    check_age = now - last_success
+    if check_age > max_check_age:
+        return False, (f"마지막 성공 확인 {check_age:.0f}초 전 "
+                       f"(연속 실패 {heartbeat.get('consecutive_failures', 0)}회)")
+
+    return True, f"정상 (루프 {tick_age:.0f}초 전, 성공 확인 {check_age:.0f}초 전)"
+
+def main():
+    parser = argparse.ArgumentParser(description="heartbeat 기반 헬스체크")
+    parser.add_argument('--file', type=str, default=None, help='heartbeat 파일 경로 (기본값: HEARTBEAT_FILE)')
+    parser.add_argument('--max-tick-age', type=float, default=float(os.getenv('HEARTBEAT_MAX_TICK_AGE', DEFAULT_MAX_TICK_AGE)),
+                        help='스케줄러 루프 갱신 허용 간격 (초)')
+    parser.add_argument('--max-check-age', type=float, default=None, help='마지막 성공 확인 허용 간격 (초)')
+    parser.add_argument('--verbose', action='store_true', help='판정 사유 출력')
+    args = parser.parse_args()
+
+    healthy, reason = evaluate(read_heartbeat(args.file or get_heartbeat_path()),
+                               max_tick_age=args.max_tick_age, max_check_age=args.max_check_age)
+    if args.verbose or not healthy:
+        print(reason)
+    return 0 if healthy else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+재고 확인 hedged request
+- 확인이 최근 지연 시간의 백분위수(기본 p95) 안에 끝나지 않으면 보조 StockMonitor(별도 연결/브라우저/백엔드)로 한 번 더 확인
+- 먼저 성공한 결과 사용, 늦은 쪽은 백그라운드에서 끝까지 실행 (그동안 다음 확인은 쉬고 있는 모니터로)
+- 예산(확인 1회당 적립 비율)을 넘으면 hedge하지 않아 부하가 두 배가 되지 않음
+"""
+
+import os
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+class LatencyWindow:
+    """최근 확인 소요 시간 (초) 보관 + 백분위수"""
+
+    def __init__(self, size=50):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, pct):
+        """최근접 순위 방식 백분위수 (기록이 없으면 None)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+        return ordered[index]
+
+class HedgeBudget:
+    """확인마다 ratio만큼 적립, hedge 1회에 1 사용 (최대 burst까지 적립)"""
+
+    def __init__(self, ratio=0.1, burst=2.0):
+        self.ratio = ratio
+        self.burst = max(1.0, burst)
+        self.tokens = 0.0
+
+    def earn(self):
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def spend(self):
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+class HedgedStockMonitor:
+    """StockMonitor 두 개로 hedged 확인 (check_stock / warm_up / close 등은 StockMonitor와 같은 방식으로 사용)"""
+
+    def __init__(self, primary, secondary, percentile=95, min_delay=1.0, budget_ratio=0.1, window=200, min_samples=10):
+        self.primary = primary
+        self.secondary = secondary
+        self.product_id = primary.product_id
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples  # 기록이 이보다 적으면 hedge하지 않음 (기준 지연을 모름)
+        # 창이 짧으면 느린 응답이 몰릴 때 백분위수가 느린 값으로 올라가 정작 필요한 때 hedge가 꺼짐
+        self.latencies = LatencyWindow(window)
+        self.budget = HedgeBudget(budget_ratio)
+        self.stats = {'checks': 0, 'hedged': 0, 'hedge_won': 0, 'budget_exhausted': 0, 'busy': 0}
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='hedge')
+        self._inflight = {primary: None, secondary: None}  # 모니터별 실행 중인 확인 (늦게 끝난 쪽 포함)
+
+    @classmethod
+    def from_env(cls, primary, create_monitor):
+        """HEDGE_* 환경변수로 생성 (create_monitor(fetch_backend) → 보조 StockMonitor)"""
+        backend = os.getenv('HEDGE_BACKEND', '').lower() or primary.fetch_backend
+        return cls(primary, create_monitor(backend),
+                   percentile=float(os.getenv('HEDGE_PERCENTILE', 95)),
+                   min_delay=float(os.getenv('HEDGE_MIN_DELAY_SECONDS', 1)),
+                   budget_ratio=float(os.getenv('HEDGE_BUDGET_RATIO', 0.1)))
+
+    def hedge_delay(self):
+        """지금 확인에서 hedge를 시작할 때까지 기다릴 시간 (초, 기록이 부족하면 None)"""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    def check_stock(self, max_retries=3):
+        """재고 확인 (먼저 성공한 쪽의 CheckResult 반환, 둘 다 실패하면 주 확인의 예외)"""
+        first, second = self._pick_monitors()
+        self.stats['checks'] += 1
+        self.budget.earn()
+        delay = self.hedge_delay()
+        if delay is not None:
+            metrics.HEDGE_DELAY_SECONDS.set(delay, product=self.product_id)
+
+        # 기준 지연은 주 모니터의 확인만으로 계산 (보조 모니터는 백엔드/프록시가 달라 지연 분포가 다름)
+        primary_future = self._submit(first, max_retries, record=first is self.primary)
+        try:
+            return primary_future.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+
+        if second is None:
+            # 직전 확인의 늦은 요청이 아직 보조 모니터를 쓰는 중
+            self.stats['busy'] += 1
+            metrics.HEDGED_CHECKS_TOTAL.inc(product=self.product_id, outcome='busy')
+            return primary_future.result()
+
+        if not self.budget.spend():
+            self.stats['budget_exhausted'] += 1
+            metrics.HEDGED_CHECKS_TOTAL.inc(product=self.product_id, outcome='budget_exhausted')
+            logger.info(f"확인이 {delay:.2f}초를 넘었지만 hedge 예산 부족 - 주 확인 대기")
+            return primary_future.result()
+
+        self.stats['hedged'] += 1
+        logger.info(f"확인이 {delay:.2f}초(p{self.percentile:g})를 넘어 보조 확인 시작 ({second.fetch_backend})")
+        hedge_future = self._submit(second, 1)
+
+        # 먼저 성공한 결과 사용, 한쪽이 실패하면 다른 쪽을 기다림
+        pending = {primary_future, hedge_future}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    won = 'hedge' if future is hedge_future else 'primary'
+                    if future is hedge_future:
+                        self.stats['hedge_won'] += 1
+                    metrics.HEDGED_CHECKS_TOTAL.inc(product=self.product_id, outcome=won)
+                    logger.info(f"hedged 확인 - {'보조' if won == 'hedge' else '주'} 확인 결과 사용")
+                    return future.result()
+
+        metrics.HEDGED_CHECKS_TOTAL.inc(product=self.product_id, outcome='failed')
+        return primary_future.result()
+
+    def _submit(self, monitor, max_retries, record=False):
+        """모니터 확인을 작업 스레드에서 시작 (record: 성공 시 소요 시간을 기준 지연에 기록)"""
+        started = time.monotonic()
+        future = self._pool.submit(monitor.check_stock, max_retries=max_retries)
+        self._inflight[monitor] = future
+        if record:
+            # hedge가 이겨도 주 확인이 끝난 시점까지 기록해야 백분위수가 낮게 치우치지 않음
+            def record_latency(f):
+                if f.exception() is None:
+                    self.latencies.add(time.monotonic() - started)
+            future.add_done_callback(record_latency)
+        return future
+
+    def _busy(self, monitor):
+        future = self._inflight[monitor]
+        return future is not None and not future.done()
+
+    def _pick_monitors(self):
+        """(이번 확인에 쓸 모니터, hedge에 쓸 모니터 또는 None)
+
+        같은 모니터를 동시에 쓰지 않도록 직전 확인의 늦은 요청이 남아 있으면 쉬고 있는 쪽을 사용하고,
+        둘 다 실행 중이면 먼저 끝나는 쪽을 기다림
+        """
+        if not self._busy(self.primary):
+            return self.primary, None if self._busy(self.secondary) else self.secondary
+        if not self._busy(self.secondary):
+            logger.debug("주 모니터가 직전 확인을 처리 중 - 보조 모니터로 확인")
+            return self.secondary, None
+        wait([self._inflight[self.primary], self._inflight[self.secondary]], return_when=FIRST_COMPLETED)
+        return self._pick_monitors()
+
+    def warm_up(self):
+        results = [self.primary.warm_up(), self.secondary.warm_up()]
+        return all(results)
+
+    def get_browser_rss_bytes(self):
+        """주/보조 브라우저 RSS 합계 (둘 다 측정 불가면 None)"""
+        values = [v for v in (self.primary.get_browser_rss_bytes(), self.secondary.get_browser_rss_bytes()) if v is not None]
+        return sum(values) if values else None
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.primary.close()
+        self.secondary.close()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+브라우저 없이 HTML에서 CSS Selector 요소 텍스트 추출
+- 표준 라이브러리 HTMLParser 기반 (조각 단위 feed 가능)
+- 지원 Selector: 태그, #id, .class 조합과 자손(공백) / 자식(>) 결합자
+- 카테고리/검색 목록 페이지의 상품 타일별 요소(배지, 링크, 이름) 추출
+"""
+
+import re
+from html.parser import HTMLParser
+
+# 종료 태그가 없는 요소
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+])
+
+# 화면에 보이지 않는 텍스트 (innerText와 동일하게 제외)
+_HIDDEN_TEXT_ELEMENTS = frozenset(['script', 'style', 'template', 'noscript'])
+
+# 비활성(구매 불가) 상태로 보는 클래스
+_DISABLED_CLASSES = frozenset(['disabled', 'is-disabled', 'is_disabled'])
+
+_COMPOUND_RE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[#.][\w-]+)*)$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+class UnsupportedSelectorError(ValueError):
+    """HTTP 추출에서 지원하지 않는 CSS Selector"""
+
+def parse_selector(selector):
+    """CSS Selector를 [(결합자, (태그, id, 클래스집합)), ...] 로 변환"""
+    tokens = selector.replace('>', ' > ').split()
+    if not tokens or tokens[0] == '>' or tokens[-1] == '>':
+        raise UnsupportedSelectorError(f"지원하지 않는 Selector: {selector}")
+
+    parts = []
+    combinator = ' '
+    for token in tokens:
+        if token == '>':
+            if combinator == '>':
+                raise UnsupportedSelectorError(f"지원하지 않는 Selector: {selector}")
+            combinator = '>'
+            continue
+
+        match = _COMPOUND_RE.match(token)
+        if not match or not token:
+            raise UnsupportedSelectorError(f"지원하지 않는 Selector 조각: {token}")
+
+        tag = (match.group('tag') or '*').lower()
+        element_id = None
+        classes = set()
+        for piece in re.findall(r'[#.][\w-]+', match.group('rest')):
+            if piece[0] == '#':
+                element_id = piece[1:]
+            else:
+                classes.add(piece[1:])
+
+        parts.append((combinator, (tag, element_id, frozenset(classes))))
+        combinator = ' '
+
+    return parts
+
+def is_disabled_element(attrs):
+    """disabled 속성, aria-disabled="true", 비활성 클래스 중 하나라도 있으면 True"""
+    if 'disabled' in attrs or (attrs.get('aria-disabled') or '').lower() == 'true':
+        return True
+    return bool(_DISABLED_CLASSES & set((attrs.get('class') or '').split()))
+
+def _matches_compound(element, compound):
+    tag, element_id, classes = compound
+    el_tag, el_id, el_classes = element
+    if tag != '*' and tag != el_tag:
+        return False
+    if element_id is not None and element_id != el_id:
+        return False
+    return classes <= el_classes
+
+def _matches(stack, index, parts, part_index):
+    """stack[index] 요소가 parts[:part_index+1] 조건을 만족하는지 (오른쪽→왼쪽)"""
+    if not _matches_compound(stack[index], parts[part_index][1]):
+        return False
+    if part_index == 0:
+        return True
+
+    combinator = parts[part_index][0]
+    if combinator == '>':
+        return index > 0 and _matches(stack, index - 1, parts, part_index - 1)
+    return any(_matches(stack, i, parts, part_index - 1) for i in range(index - 1, -1, -1))
+
+class _Capture:
+    """Selector 하나의 일치 요소 텍스트 수집 상태"""
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.depth = None
+        self.captured = []
+        self.matched_attrs = None
+        self.matched_disabled = False  # 일치한 요소 또는 상위 요소가 비활성 상태인지
+        self.done = False
+
+    @property
+    def found(self):
+        return self.matched_attrs is not None
+
+    @property
+    def text(self):
+        """수집된 텍스트 (공백 정리)"""
+        return _WHITESPACE_RE.sub(' ', ''.join(self.captured)).strip()
+
+class MultiSelectorTextParser(HTMLParser):
+    """여러 Selector 각각에 처음 일치하는 요소의 텍스트를 한 번의 파싱으로 수집
+
+    selectors: {이름: Selector}. feed()를 조각 단위로 호출할 수 있으며, 모든 요소가 닫히면 done이 True가 됨
+    """
+
+    def __init__(self, selectors):
+        super().__init__(convert_charrefs=True)
+        self.captures = {name: _Capture(parse_selector(selector)) for name, selector in selectors.items()}
+        self.pending = list(self.captures.values())  # 아직 일치 요소를 찾지 못한 Selector
+        self.active = []  # 텍스트 수집 중인 Selector
+        self.stack = []
+        self.disabled_stack = []  # stack과 같은 길이, 요소별 비활성 여부
+
+    @property
+    def done(self):
+        return not self.pending and not self.active
+
+    def state(self, name):
+        """이름별 (텍스트, 비활성 여부), 요소가 없으면 None"""
+        capture = self.captures[name]
+        return (capture.text, capture.matched_disabled) if capture.found else None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+
+        attr_map = dict(attrs)
+        element = (tag, attr_map.get('id'), frozenset((attr_map.get('class') or '').split()))
+        self.stack.append(element)
+        self.disabled_stack.append(is_disabled_element(attr_map))
+
+        for capture in list(self.pending):
+            if _matches(self.stack, len(self.stack) - 1, capture.parts, len(capture.parts) - 1):
+                capture.depth = len(self.stack)
+                capture.matched_attrs = attr_map
+                capture.matched_disabled = any(self.disabled_stack)
+                self.pending.remove(capture)
+                self.active.append(capture)
+
+    def handle_endtag(self, tag):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+
+        # 짝이 맞지 않는 종료 태그는 가장 가까운 같은 태그까지 닫음
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                del self.disabled_stack[i:]
+                break
+
+        for capture in list(self.active):
+            if len(self.stack) < capture.depth:
+                capture.done = True
+                self.active.remove(capture)
+
+    def handle_data(self, data):
+        if not self.active:
+            return
+        if self.stack and self.stack[-1][0] in _HIDDEN_TEXT_ELEMENTS:
+            return
+        for capture in self.active:
+            capture.captured.append(data)
+
+class TileListParser(HTMLParser):
+    """tile_selector에 일치하는 요소(상품 타일)마다 fields 요소의 텍스트/속성을 수집
+
+    fields: {이름: 타일 기준 Selector}, 빈 문자열이면 타일 요소 자체. 타일 안의 타일은 바깥 타일에 포함
+    """
+
+    def __init__(self, tile_selector, fields):
+        super().__init__(convert_charrefs=True)
+        self.tile_parts = parse_selector(tile_selector)
+        self.field_parts = {name: parse_selector(selector) if selector else None for name, selector in fields.items()}
+        self.tiles = []  # 닫힌 타일별 {이름: _Capture}
+        self.stack = []
+        self.disabled_stack = []
+        self.tile_depth = None  # 열린 타일 요소의 stack 깊이 (타일 밖이면 None)
+        self.captures = None
+        self.pending = []
+        self.active = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            # 링크/이미지 속성만 필요한 경우를 위해 타일 안의 void 요소도 일치 검사
+            if self.tile_depth is not None:
+                self._match_fields(tag, dict(attrs), push=False)
+            return
+
+        attr_map = dict(attrs)
+        if self.tile_depth is None:
+            self.stack.append((tag, attr_map.get('id'), frozenset((attr_map.get('class') or '').split())))
+            self.disabled_stack.append(is_disabled_element(attr_map))
+            if _matches(self.stack, len(self.stack) - 1, self.tile_parts, len(self.tile_parts) - 1):
+                self._open_tile(attr_map)
+            return
+        self._match_fields(tag, attr_map, push=True)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                del self.disabled_stack[i:]
+                break
+
+        for capture in list(self.active):
+            if len(self.stack) < capture.depth:
+                capture.done = True
+                self.active.remove(capture)
+        if self.tile_depth is not None and len(self.stack) < self.tile_depth:
+            self.tiles.append(self.captures)
+            self.tile_depth = None
+            self.captures = None
+            self.pending = []
+            self.active = []
+
+    def handle_data(self, data):
+        if not self.active:
+            return
+        if self.stack and self.stack[-1][0] in _HIDDEN_TEXT_ELEMENTS:
+            return
+        for capture in self.active:
+            capture.captured.append(data)
+
+    def close(self):
+        super().close()
+        if self.tile_depth is not None:
+            # 닫히지 않은 마지막 타일 (잘린 HTML)
+            self.tiles.append(self.captures)
+            self.tile_depth = None
+
+    def _open_tile(self, attr_map):
+        self.tile_depth = len(self.stack)
+        self.captures = {}
+        self.pending = []
+        self.active = []
+        for name, parts in self.field_parts.items():
+            capture = self.captures[name] = _Capture(parts)
+            if parts is None:
+                capture.depth = self.tile_depth
+                capture.matched_attrs = attr_map
+                capture.matched_disabled = any(self.disabled_stack)
+                self.active.append(capture)
+            else:
+                self.pending.append(capture)
+
+    def _match_fields(self, tag, attr_map, push):
+        element = (tag, attr_map.get('id'), frozenset((attr_map.get('class') or '').split()))
+        disabled = any(self.disabled_stack) or is_disabled_element(attr_map)
+        # 타일 요소 아래만 보고 일치 검사 (Selector는 타일 기준)
+        substack = self.stack[self.tile_depth:] + [element]
+        if push:
+            self.stack.append(element)
+            self.disabled_stack.append(is_disabled_element(attr_map))
+        for capture in list(self.pending):
+            if _matches(substack, len(substack) - 1, capture.parts, len(capture.parts) - 1):
+                capture.matched_attrs = attr_map
+                capture.matched_disabled = disabled
+                self.pending.remove(capture)
+                if push:
+                    capture.depth = len(self.stack)
+                    self.active.append(capture)
+
+def extract_tiles(html, tile_selector, fields):
+    """목록 페이지의 타일별 {이름: (텍스트, 비활성 여부, 속성 dict) 또는 None} 목록 (페이지 순서)"""
+    parser = TileListParser(tile_selector, fields)
+    parser.feed(html)
+    parser.close()
+    return [{name: (capture.text, capture.matched_disabled, capture.matched_attrs) if capture.found else None
+             for name, capture in tile.items()}
+            for tile in parser.tiles]
+
+def extract_selector_states(html, selectors):
+    """HTML 한 번 파싱으로 {이름: (텍스트, 비활성 여부) 또는 None} 추출"""
+    parser = MultiSelectorTextParser(selectors)
+    parser.feed(html)
+    parser.close()
+    return {name: parser.state(name) for name in selectors}
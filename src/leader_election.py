@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+active/standby 이중화 (leader 선출)
+- 두 인스턴스가 조정 저장소의 'leader' lease를 두고 경쟁, lease를 가진 쪽만 재고 확인
+- standby는 브라우저/연결을 띄워둔 채 확인하지 않고 lease만 지켜봄 (1초마다), 만료/반납되면 바로 넘겨받음
+- fencing token: lease를 얻을 때마다 증가, 알림 직전 저장소의 현재 token과 비교해 밀려난 이전 leader의 중복 알림 차단
+- leader lease는 LeaseKeeper 스레드에서도 갱신 (확인 1회가 lease 시간보다 오래 걸려도 standby가 넘겨받지 않음)
+"""
+
+import os
+import time
+import logging
+from threading import Lock
+
+from src import metrics
+from src.coordination import create_lease_store
+from src.sharding import default_node_id
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE = 'leader'
+
+# standby가 lease를 확인하는 간격 (초, 정상 종료한 leader를 넘겨받는 시간)
+STANDBY_POLL_SECONDS = 1.0
+
+class LeaderElection:
+    """이 노드의 leader lease 상태"""
+
+    def __init__(self, store, node_id, lease_seconds=20.0, standby_poll_seconds=STANDBY_POLL_SECONDS, clock=time.time):
+        if lease_seconds <= 0:
+            raise ValueError(f"LEADER_LEASE_SECONDS는 0보다 커야 합니다: {lease_seconds}")
+        self.store = store
+        self.node_id = node_id
+        self.lease_seconds = lease_seconds
+        self.renew_interval = lease_seconds / 3
+        self.standby_poll_seconds = standby_poll_seconds
+        self.clock = clock
+        self.token = None  # leader일 때 fencing token
+        self.expires_at = 0.0
+        self.leader_since = None
+        self.previous_seen_at = None  # 넘겨받은 이전 leader가 마지막으로 살아 있던 시각
+        self.last_poll = None
+        self.pending_event = None  # renew()에서 생긴 이벤트 (다음 maybe_poll()에서 메인 루프로 전달)
+        self.lock = Lock()
+        self.stats = {'promotions': 0, 'demotions': 0, 'poll_failed': 0, 'fenced': 0}
+
+    @classmethod
+    def from_env(cls):
+        """LEADER_* 환경변수로 생성 (LEADER_STORE가 비어 있으면 None)"""
+        spec = os.getenv('LEADER_STORE', '')
+        if not spec:
+            return None
+        election = cls(create_lease_store(spec), os.getenv('NODE_ID', '') or default_node_id(),
+                       lease_seconds=float(os.getenv('LEADER_LEASE_SECONDS', 20)))
+        logger.info(f"active/standby 사용 - 노드 {election.node_id}, lease {election.lease_seconds:.0f}초 ({spec})")
+        return election
+
+    def is_leader(self, now=None):
+        """leader lease를 가지고 있고 아직 유효한지"""
+        now = self.clock() if now is None else now
+        return self.token is not None and self.expires_at > now
+
+    def maybe_poll(self):
+        """leader는 lease 시간의 1/3마다 갱신, standby는 standby_poll_seconds마다 획득 시도 → poll() 결과"""
+        with self.lock:
+            event, self.pending_event = self.pending_event, None
+            now = self.clock()
+            interval = self.renew_interval if self.token is not None else self.standby_poll_seconds
+            if self.last_poll is not None and now - self.last_poll < interval:
+                return event
+            return self.poll(now) or event
+
+    def renew(self):
+        """leader일 때만 갱신 주기가 지났으면 lease 갱신 (LeaseKeeper 스레드에서 호출, standby는 획득 시도하지 않음)"""
+        with self.lock:
+            now = self.clock()
+            if self.token is None or (self.last_poll is not None and now - self.last_poll < self.renew_interval):
+                return
+            event = self.poll(now)
+            if event:
+                self.pending_event = event
+
+    def poll(self, now=None):
+        """lease 획득/갱신 (maybe_poll/renew는 lock을 잡고 호출) → 'promoted'(leader가 됨), 'demoted'(leader에서 밀려남), None(변화 없음)
+
+        promoted이면 previous_seen_at에 이전 leader가 마지막으로 살아 있던 시각(갱신/반납 시각)을 남김
+        """
+        now = self.clock() if now is None else now
+        self.last_poll = now
+        try:
+            previous = self.store.get(LEADER_LEASE)
+            token = self.store.acquire(LEADER_LEASE, self.node_id, self.lease_seconds, now)
+        except Exception as e:
+            # 저장소에 닿지 않으면 lease 만료 시각까지만 leader (이후 확인 중단)
+            self.stats['poll_failed'] += 1
+            logger.error(f"leader lease 갱신 실패: {str(e)}")
+            return None
+
+        event = None
+        if token is None:
+            if self.token is not None:
+                event = 'demoted'
+                self.stats['demotions'] += 1
+                logger.warning(f"leader lease를 다른 노드가 가져감 - standby로 전환 (token {self.token})")
+            self.token = None
+            self.leader_since = None
+        else:
+            if token != self.token:
+                event = 'promoted'
+                self.stats['promotions'] += 1
+                self.leader_since = now
+                self.previous_seen_at = None
+                if previous and previous[2] and previous[0] != self.node_id:
+                    owner, expires_at, _ = previous
+                    # 반납했으면 반납 시각, 아니면 마지막 갱신 시각 (만료 시각 - lease 시간)
+                    self.previous_seen_at = expires_at if owner is None else expires_at - self.lease_seconds
+                logger.info(f"leader 선출 - 재고 확인 시작 (token {token})")
+            self.token = token
+            self.expires_at = now + self.lease_seconds
+        metrics.LEADER_STATE.set(1 if self.token is not None else 0, node=self.node_id)
+        return event
+
+    def fence(self):
+        """알림 직전 확인: 저장소의 leader가 이 노드이고 token이 같을 때만 True
+
+        저장소에 닿지 않으면 아직 유효한 자기 lease 기준으로 판단
+        """
+        if self.token is None:
+            allowed = False
+        else:
+            try:
+                current = self.store.get(LEADER_LEASE)
+                allowed = bool(current) and current[0] == self.node_id and current[2] == self.token
+            except Exception as e:
+                logger.warning(f"fencing token 확인 실패 - lease 만료 시각으로 판단: {str(e)}")
+                allowed = self.is_leader()
+        if not allowed:
+            self.stats['fenced'] += 1
+            metrics.FENCED_NOTIFICATIONS_TOTAL.inc(node=self.node_id)
+        return allowed
+
+    def resign(self):
+        """종료 시 lease 반납 (standby가 만료를 기다리지 않고 바로 넘겨받음)"""
+        if self.token is not None:
+            try:
+                self.store.release(LEADER_LEASE, self.node_id, self.clock())
+            except Exception as e:
+                logger.warning(f"leader lease 반납 실패 (만료 후 standby가 넘겨받음): {str(e)}")
+        self.token = None
+        metrics.LEADER_STATE.set(0, node=self.node_id)
+        self.store.close()
+
+    def snapshot(self):
+        """관리 명령/상태 조회용 요약"""
+        return {
+            'node_id': self.node_id,
+            'role': 'leader' if self.is_leader() else 'standby',
+            'token': self.token,
+            'lease_seconds': self.lease_seconds,
+            'stats': dict(self.stats),
+        }
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+카테고리/검색 목록 페이지 일괄 모니터링
+- 목록 페이지를 한 번 가져와 상품 타일마다 재고 배지와 링크 추출 (제품 페이지 N개 대신 목록 1회)
+- 직전 목록과 비교해 새 상품 / 재입고 / 배지 변경 / 사라진 상품 보고
+- 배지가 바뀐 상품만 제품 페이지를 열어 STOCK_SELECTOR로 재확인 (drill-down)
+"""
+
+import os
+import time
+import logging
+import requests
+from urllib.parse import urljoin, urldefrag, urlparse
+
+from src import metrics
+from src.html_extract import extract_tiles, parse_selector, UnsupportedSelectorError
+from src.stock_classifier import StockClassifier, IN_STOCK, UNKNOWN
+from src.stock_monitor import (StockMonitor, BlockedPageError, BLOCKED_STATUS_CODES, USER_AGENT, detect_challenge,
+                               product_id_from_url, proxy_result_for)
+from src.state_table import content_hash
+from src.proxy_pool import get_proxy_pool, OK as PROXY_OK, BLOCKED as PROXY_BLOCKED
+
+logger = logging.getLogger(__name__)
+
+class ListingResult:
+    """목록 확인 결과 (타일/변경 목록은 {'product_id', 'url', 'name', 'badge', 'status', ...} dict)"""
+
+    def __init__(self, listing_id, tiles, new=None, restocked=None, changed=None, removed=None, baseline=False,
+                 duration=0.0):
+        self.listing_id = listing_id
+        self.tiles = tiles
+        self.new = new or []
+        self.restocked = restocked or []  # 품절/확인 불가 → 재고 있음 (new에 포함된 상품 제외)
+        self.changed = changed or []  # 배지가 바뀐 상품 전체 (restocked 포함)
+        self.removed = removed or []
+        self.baseline = baseline  # 첫 목록 (비교 대상 없음)
+        self.duration = duration
+
+    def to_dict(self):
+        return {
+            'listing_id': self.listing_id,
+            'tiles': len(self.tiles),
+            'in_stock': sum(1 for tile in self.tiles if tile['status'] == IN_STOCK),
+            'new': self.new,
+            'restocked': self.restocked,
+            'changed': [tile['url'] for tile in self.changed],
+            'removed': self.removed,
+            'baseline': self.baseline,
+            'duration_seconds': round(self.duration, 3),
+        }
+
+class ListingMonitor:
+    """목록 페이지 1개 모니터 (HTTP로 가져옴, 타일은 서버가 내려준 HTML에 있어야 함)"""
+
+    def __init__(self, listing_url, tile_selector, badge_selector, link_selector='a', name_selector='',
+                 product_selector='', drill_backend='http', proxy_pool=None, create_monitor=None):
+        self.listing_url = listing_url
+        self.listing_id = product_id_from_url(listing_url)
+        self.tile_selector = tile_selector
+        self.fields = {'badge': badge_selector, 'link': link_selector}
+        if name_selector:
+            self.fields['name'] = name_selector
+        for name, selector in [('tile', tile_selector)] + [(n, s) for n, s in self.fields.items() if s]:
+            try:
+                parse_selector(selector)
+            except UnsupportedSelectorError as e:
+                raise ValueError(f"목록 Selector를 해석할 수 없습니다 ({name}): {str(e)}")
+        self.product_selector = product_selector  # 비어 있으면 drill-down 없이 배지로만 판단
+        self.drill_backend = drill_backend
+        self.classifier = StockClassifier.from_env(self.listing_id)
+        self.proxy_pool = get_proxy_pool() if proxy_pool is None else proxy_pool
+        # 제품 페이지 재확인용 모니터 (옵션 Selector는 단일 제품 설정이므로 사용하지 않음)
+        self.create_monitor = create_monitor or (lambda url: StockMonitor(
+            url, self.product_selector, fetch_backend=self.drill_backend, variants={}, proxy_pool=self.proxy_pool))
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept-Language': 'ko-KR,ko;q=0.9'})
+        self.previous = None  # 직전 목록 {URL: 타일}
+        self.stats = {'listings': 0, 'drill_downs': 0, 'drill_down_failed': 0}
+
+    @classmethod
+    def from_env(cls, product_selector=''):
+        """LISTING_* 환경변수로 생성 (LISTING_URL이 비어 있으면 None, product_selector: 재확인용 STOCK_SELECTOR)"""
+        listing_url = os.getenv('LISTING_URL', '')
+        if not listing_url:
+            return None
+        tile_selector = os.getenv('LISTING_TILE_SELECTOR', '')
+        badge_selector = os.getenv('LISTING_BADGE_SELECTOR', '')
+        if not tile_selector or not badge_selector:
+            raise ValueError("LISTING_URL을 쓰려면 LISTING_TILE_SELECTOR와 LISTING_BADGE_SELECTOR가 필요합니다")
+        drill_down = os.getenv('LISTING_DRILL_DOWN', 'true').lower() in ('1', 'true', 'yes')
+        return cls(listing_url, tile_selector, badge_selector,
+                   link_selector=os.getenv('LISTING_LINK_SELECTOR', 'a'),
+                   name_selector=os.getenv('LISTING_NAME_SELECTOR', ''),
+                   product_selector=product_selector if drill_down else '',
+                   drill_backend=os.getenv('LISTING_DRILL_DOWN_BACKEND', 'http').lower())
+
+    def check_listing(self):
+        """목록 확인 → ListingResult (첫 확인은 기준 목록으로만 저장)"""
+        started = time.monotonic()
+        html = self._fetch()
+        tiles = self._parse(html)
+        self.stats['listings'] += 1
+        metrics.LISTING_TILES.set(len(tiles), listing=self.listing_id)
+        if not tiles:
+            # Selector가 바뀌었거나 JavaScript로 그리는 목록 → 전부 사라진 것으로 보지 않음
+            raise ValueError(f"목록에서 상품 타일을 찾지 못했습니다: {self.tile_selector}")
+
+        if self.previous is None:
+            self.previous = tiles
+            logger.info(f"기준 목록 저장: 상품 {len(tiles)}개")
+            return ListingResult(self.listing_id, list(tiles.values()), baseline=True,
+                                 duration=time.monotonic() - started)
+
+        new, changed = [], []
+        for url, tile in tiles.items():
+            before = self.previous.get(url)
+            if before is None:
+                new.append(tile)
+            elif (before['status'], before['badge_hash']) != (tile['status'], tile['badge_hash']):
+                tile['previous_status'] = before['status']
+                changed.append(tile)
+        removed = [url for url in self.previous if url not in tiles]
+
+        # 배지가 바뀐 상품만 제품 페이지로 재확인
+        for tile in new + changed:
+            self._drill_down(tile)
+        restocked = [tile for tile in changed if tile['status'] == IN_STOCK and tile['previous_status'] != IN_STOCK]
+
+        # 비교 기준은 목록 배지 상태 (재확인 결과로 덮어쓰면 다음 목록에서 다시 변경으로 보임)
+        self.previous = {url: dict(tile, status=tile.get('badge_status', tile['status'])) for url, tile in tiles.items()}
+        for kind, items in (('new', new), ('restocked', restocked), ('changed', changed), ('removed', removed)):
+            if items:
+                metrics.LISTING_CHANGES_TOTAL.inc(len(items), listing=self.listing_id, kind=kind)
+        if new or changed or removed:
+            logger.info(f"목록 변경 - 새 상품 {len(new)}개, 재입고 {len(restocked)}개, 변경 {len(changed)}개, "
+                        f"사라짐 {len(removed)}개")
+        return ListingResult(self.listing_id, list(tiles.values()), new, restocked, changed, removed,
+                             duration=time.monotonic() - started)
+
+    def _fetch(self):
+        """목록 HTML (차단/챌린지 페이지면 BlockedPageError)"""
+        proxy = self.proxy_pool.acquire() if self.proxy_pool else None
+        started = time.monotonic()
+        try:
+            response = self.session.get(self.listing_url, timeout=15,
+                                        proxies=proxy.requests_proxies() if proxy else None)
+            if response.status_code in BLOCKED_STATUS_CODES:
+                raise BlockedPageError(f"HTTP {response.status_code} 응답", kind='http_status')
+            response.raise_for_status()
+            marker = detect_challenge(response.text)
+            if marker:
+                raise BlockedPageError(f"차단/챌린지 페이지 감지 ({marker})", kind='challenge')
+        except BlockedPageError as e:
+            metrics.BLOCKED_PAGES_TOTAL.inc(product=self.listing_id, kind=e.kind)
+            if proxy:
+                self.proxy_pool.record(proxy, PROXY_BLOCKED)
+            raise
+        except Exception as e:
+            # 네트워크/연결 오류만 프록시 실패 (503 등 사이트 오류 응답은 프록시 정상)
+            if proxy:
+                self.proxy_pool.record(proxy, proxy_result_for(e))
+            raise
+        if proxy:
+            self.proxy_pool.record(proxy, PROXY_OK, time.monotonic() - started)
+        return response.text
+
+    def _parse(self, html):
+        """타일 목록 → {제품 URL: 타일} (링크가 없는 타일은 제외, 같은 URL은 처음 것만)"""
+        tiles = {}
+        for fields in extract_tiles(html, self.tile_selector, self.fields):
+            link = fields['link']
+            href = link[2].get('href') if link else None
+            if not href:
+                continue
+            url = urldefrag(urljoin(self.listing_url, href))[0]
+            if url in tiles:
+                continue
+            badge = fields['badge']
+            if badge:
+                badge_text = badge[0]
+                status, matched = self.classifier.classify(badge_text, disabled=badge[1])
+            else:
+                badge_text, status, matched = '', UNKNOWN, None
+            name = fields.get('name')
+            tiles[url] = {
+                'product_id': product_id_from_url(url),
+                'url': url,
+                'name': name[0] if name else (link[0] or None),
+                'badge': badge_text,
+                'badge_hash': content_hash(badge_text),
+                'status': status,
+                'matched': matched,
+            }
+        return tiles
+
+    def _drill_down(self, tile):
+        """제품 페이지에서 재고 재확인 (성공하면 tile['status']를 제품 페이지 결과로 바꾸고 True)"""
+        if not self.product_selector:
+            return False
+        self.stats['drill_downs'] += 1
+        monitor = None
+        try:
+            monitor = self.create_monitor(tile['url'])
+            result = monitor.check_stock(max_retries=1)
+            metrics.LISTING_DRILL_DOWNS_TOTAL.inc(listing=self.listing_id, result=result.status)
+        except Exception as e:
+            self.stats['drill_down_failed'] += 1
+            metrics.LISTING_DRILL_DOWNS_TOTAL.inc(listing=self.listing_id, result='error')
+            logger.warning(f"제품 페이지 재확인 실패 - 목록 배지로 판단 ({tile['product_id']}): {str(e)}")
+            return False
+        finally:
+            if monitor:
+                monitor.close()
+        if result.status != UNKNOWN:
+            tile['badge_status'] = tile['status']
+            tile['status'] = result.status
+            tile['price'] = result.price
+        logger.info(f"제품 페이지 재확인 ({tile['product_id']}): 배지 '{tile['badge']}' → {result.status}")
+        return True
+
+    def warm_up(self):
+        """목록 호스트에 미리 접속 (실패해도 무시)"""
+        parsed = urlparse(self.listing_url)
+        try:
+            self.session.get(f"{parsed.scheme}://{parsed.netloc}/", timeout=10)
+            return True
+        except Exception as e:
+            logger.warning(f"목록 호스트 사전 접속 실패 (무시): {str(e)}")
+            return False
+
+    def snapshot(self):
+        """관리 명령/상태 조회용 요약"""
+        return {
+            'listing_url': self.listing_url,
+            'tiles': len(self.previous) if self.previous is not None else None,
+            'drill_down': bool(self.product_selector),
+            'stats': dict(self.stats),
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+로깅 설정
+- 로그 레코드를 큐에 넣고 백그라운드 스레드에서 파일/콘솔 기록 (재고 확인 지연 없음)
+- 크기 + 시간 기준 로테이션, 지난 로그 gzip 압축
+- 반복되는 INFO 로그 샘플링 (호출 위치별 rate limit)
+- LOG_FORMAT=json 으로 구조화 로그
+"""
+
+import os
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import logging
+from threading import Lock
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """크기(maxBytes) 또는 시간(interval초) 기준으로 로테이션하고 지난 파일을 gzip 압축
+
+    backup_count=0이면 지난 파일을 남기지 않고 로테이션 시점에 로그 파일을 비움
+    (RotatingFileHandler는 backupCount=0이면 로테이션하지 않아 파일이 계속 커짐)
+    """
+
+    def __init__(self, filename, max_bytes=0, backup_count=0, interval=0, encoding='utf-8'):
+        if backup_count < 0:
+            raise ValueError(f"LOG_BACKUP_COUNT는 0 이상이어야 합니다: {backup_count}")
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval = interval
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress
+        self.rollover_at = self._next_rollover()
+
+    def _period_start(self, t):
+        """t가 속한 주기의 시작 시각 (로컬 자정 기준 정렬)"""
+        offset = -(time.altzone if time.localtime(t).tm_isdst else time.timezone)
+        return (t + offset) // self.interval * self.interval - offset
+
+    def _next_rollover(self):
+        if not self.interval:
+            return None
+        now = time.time()
+        # 이전 주기에 기록된 파일이 남아 있으면 다음 기록 때 바로 로테이션
+        if os.path.exists(self.baseFilename) and os.path.getmtime(self.baseFilename) < self._period_start(now):
+            return now
+        return self._period_start(now) + self.interval
+
+    @staticmethod
+    def _compress(source, dest):
+        if not os.path.exists(source):
+            return
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        if self.backupCount == 0:
+            # 보관할 파일이 없으므로 그 자리에서 비움
+            if self.stream:
+                self.stream.close()
+            self.stream = self._open()
+            self.stream.truncate(0)
+        else:
+            super().doRollover()
+        if self.interval:
+            self.rollover_at = self._period_start(time.time()) + self.interval
+
+class SamplingFilter(logging.Filter):
+    """INFO 이하 로그를 호출 위치(logger + 줄 번호)별로 window초당 burst건까지만 통과
+
+    WARNING 이상은 항상 통과하며, 생략된 건수는 다음에 통과하는 로그에 덧붙임
+    """
+
+    def __init__(self, window, burst):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.sites = {}
+        self.lock = Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+
+        key = (record.name, record.lineno)
+        now = record.created
+        with self.lock:
+            window_started, count, suppressed = self.sites.get(key, (now, 0, 0))
+            if now - window_started >= self.window:
+                window_started, count = now, 0
+
+            if count >= self.burst:
+                self.sites[key] = (window_started, count, suppressed + 1)
+                return False
+
+            self.sites[key] = (window_started, count + 1, 0)
+
+        if suppressed:
+            record.msg = f"{record.msg} (반복 로그 {suppressed}건 생략)"
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def setup_logging(log_dir, filename='stock_monitor.log'):
+    """루트 로거를 큐 기반 비동기 로깅으로 설정하고 QueueListener 반환
+
+    LOG_LEVEL, LOG_FORMAT(text/json), LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATE_HOURS,
+    LOG_SAMPLE_WINDOW, LOG_SAMPLE_BURST 환경변수로 조정
+    """
+    os.makedirs(log_dir, exist_ok=True)
+
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = CompressingRotatingFileHandler(
+        os.path.join(log_dir, filename),
+        max_bytes=int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+        backup_count=int(os.getenv('LOG_BACKUP_COUNT', 7)),
+        interval=float(os.getenv('LOG_ROTATE_HOURS', 24)) * 3600,
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+
+    sample_window = float(os.getenv('LOG_SAMPLE_WINDOW', 60))
+    sample_burst = int(os.getenv('LOG_SAMPLE_BURST', 10))
+    if sample_window > 0 and sample_burst > 0:
+        queue_handler.addFilter(SamplingFilter(sample_window, sample_burst))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    # 종료 시 큐에 남은 로그 기록
+    atexit.register(listener.stop)
+    return listener
@@ -1,16 +1,36 @@
+import time
+
+# 재시작 후 첫 확인까지 걸린 시간 측정 기준 (무거운 import 이전)
+_PROCESS_STARTED = time.monotonic()
+
 import os
 import sys
-import time
 import schedule
 import logging
+from queue import Queue, Empty
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.stock_monitor import StockMonitor
+from src.stock_monitor import StockMonitor, BlockedPageError, product_id_from_url
 from src.discord_notifier import DiscordNotifier
+from src import metrics
+from src.check_timing import get_ring_buffer, phase_durations
+from src.logging_setup import setup_logging
+from src.heartbeat import HeartbeatWriter, DEFAULT_CHECK_TIMEOUT, get_heartbeat_path
+from src.state_table import ProductStateTable, content_hash, CHANGED_STATUS
+from src.circuit_breaker import CircuitBreaker, CLOSED, OPENED, CLOSED_AGAIN, HALF_OPEN
+from src.retry_policy import RetryPolicy
+from src.proxy_pool import get_proxy_pool, ProxyUnavailableError
+from src.stock_classifier import IN_STOCK
+from src.subscriptions import SubscriptionIndex, product_key, fan_out
+from src.check_schedule import CheckSchedule, AlertDigest
+# 선택 기능(hedging/목록/shard/leader/관리 소켓) 모듈은 사용할 때 해당 위치에서 import
 
 # config_manager import (없으면 기본 동작)
 try:
@@ -31,21 +51,56 @@ class NotificationMode:
 
 # 로깅 설정
 log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-os.makedirs(log_dir, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(log_dir, 'stock_monitor.log')),
-        logging.StreamHandler()
-    ]
-)
+setup_logging(log_dir)
 
 logger = logging.getLogger(__name__)
 
 class SonyStockMonitorService:
     def __init__(self):
+        # 관리 소켓에서 조회/제어하는 런타임 상태
+        self.started_at = datetime.now()
+        self.paused_products = set()
+        self.last_results = {}
+        self.state_table = ProductStateTable()
+        # 시작 시 백그라운드 브라우저 준비가 끝나 stock_monitor가 정해졌는지 (설정 변경 콜백이 기다림)
+        self.monitors_ready = Event()
+        self.monitors_ready.set()
+        self.breakers = {}  # 호스트 → CircuitBreaker
+        self.retry_policy = RetryPolicy.from_env()
+        self.pending_retry = None  # 등록된 재시도 작업 (schedule.Job)
+        self.stats = {
+            'checks_total': 0,
+            'checks_in_stock': 0,
+            'checks_out_of_stock': 0,
+            'checks_unknown': 0,
+            'checks_failed': 0,
+            'checks_skipped': 0,
+            'checks_suppressed': 0,
+            'checks_proxy_unavailable': 0,
+            'checks_retried': 0,
+            'checks_not_owned': 0,
+            'checks_blackout': 0,
+            'listing_checks': 0,
+            'listing_failed': 0,
+            'notifications_sent': 0,
+            'subscriber_notifications_sent': 0,
+            'subscriber_notifications_quiet': 0,
+            'notifications_held': 0,
+        }
+        self.startup_timings = {}
+        self.command_queue = Queue()
+        self.admin_server = None
+        self.stock_monitor = None
+        self.listing_monitor = None
+        self.subscription_monitors = {}  # 구독 제품 키 → StockMonitor (첫 확인 때 생성)
+        self.subscriber_notifiers = {}  # Webhook URL → DiscordNotifier (구독자끼리 공유)
+        self.heartbeat = None
+        self.standby_warmed_at = time.monotonic()  # standby가 마지막으로 연결을 데운 시각
+        self.check_schedule = None  # CHECK_SCHEDULE/CHECK_BLACKOUT/QUIET_HOURS (설정 로드 시 생성)
+        self.cron_last_run = {}  # 제품 ID → cron 작업이 마지막으로 실행된 분
+        self.digest = AlertDigest()  # 알림 금지 시간대에 보류한 알림
+        
         # config_manager 사용 가능한 경우 초기화
         if CONFIG_MANAGER_AVAILABLE:
             self.config_manager = get_config_manager()
@@ -57,8 +112,28 @@ class SonyStockMonitorService:
             self.config_manager = None
             self._load_config_from_env()
             
-        self._setup_monitors()
+        # 브라우저는 run()에서 다른 시작 작업과 병렬로 띄움
         self._validate_config()
+        # 구독 설정 (SUBSCRIPTIONS_FILE, 파일 오류는 시작 시 바로 알림)
+        self.subscriptions = SubscriptionIndex.from_env(self.stock_selector)
+        # shard 분산 (SHARD_STORE 설정 시 같은 설정의 다른 노드와 감시 목록을 나눠 확인)
+        self.shards = None
+        if os.getenv('SHARD_STORE'):
+            from src.sharding import ShardCoordinator
+            self.shards = ShardCoordinator.from_env()
+        if self.shards and self.shards.lease_seconds * 4 / 3 > self.check_interval * 60:
+            logger.warning(f"SHARD_LEASE_SECONDS({self.shards.lease_seconds:.0f}초)가 체크 주기보다 길어 "
+                           f"죽은 노드의 제품을 한 주기 안에 넘겨받지 못할 수 있습니다")
+        # active/standby (LEADER_STORE 설정 시 leader lease를 가진 인스턴스만 확인/알림)
+        self.leader = None
+        if os.getenv('LEADER_STORE'):
+            from src.leader_election import LeaderElection
+            self.leader = LeaderElection.from_env()
+        if self.leader and self.shards:
+            raise ValueError("LEADER_STORE와 SHARD_STORE는 함께 쓸 수 없습니다 (shard 분산도 죽은 노드의 제품을 넘겨받음)")
+        self._setup_notifier()
+        self._setup_subscriber_notifiers()
+        self._setup_heartbeat()
         
     def _load_config_from_manager(self):
         """ConfigManager에서 설정 로드"""
@@ -70,6 +145,10 @@ class SonyStockMonitorService:
         self.discord_webhook = os.getenv('DISCORD_WEBHOOK_URL', '')
         self.health_check_times = config.get('HEALTH_CHECK_TIMES', '09:00,12:00,15:00,18:00,21:00,00:00').split(',')
         self.notification_mode = config.get('NOTIFICATION_MODE', NotificationMode.STOCK_AVAILABLE_ONLY).lower()
+        self.listing_url = os.getenv('LISTING_URL', '')
+        self.product_id = product_id_from_url(self.website_url or self.listing_url) or 'subscriptions'
+        self._load_check_schedule(config.get('CHECK_SCHEDULE', ''), config.get('CHECK_BLACKOUT', ''),
+                                  config.get('QUIET_HOURS', ''))
         
     def _load_config_from_env(self):
         """환경변수에서 설정 로드"""
@@ -79,16 +158,87 @@ class SonyStockMonitorService:
         self.discord_webhook = os.getenv('DISCORD_WEBHOOK_URL', '')
         self.health_check_times = os.getenv('HEALTH_CHECK_TIMES', '09:00,12:00,15:00,18:00,21:00,00:00').split(',')
         self.notification_mode = os.getenv('NOTIFICATION_MODE', NotificationMode.STOCK_AVAILABLE_ONLY).lower()
+        self.listing_url = os.getenv('LISTING_URL', '')
+        self.product_id = product_id_from_url(self.website_url or self.listing_url) or 'subscriptions'
+        self._load_check_schedule(os.getenv('CHECK_SCHEDULE', ''), os.getenv('CHECK_BLACKOUT', ''),
+                                  os.getenv('QUIET_HOURS', ''))
+        
+    def _load_check_schedule(self, schedule_spec, blackout, quiet_hours):
+        """확인 일정/확인 중단/알림 금지 시간대 적용 (시작 시 설정 오류는 그대로 실패, 리로드 중 오류는 이전 일정 유지)"""
+        try:
+            self.check_schedule = CheckSchedule(schedule_spec, blackout, quiet_hours)
+        except ValueError as e:
+            if self.check_schedule is None:
+                raise
+            logger.error(f"확인 일정 설정 오류 - 이전 일정 유지: {str(e)}")
         
     def _setup_monitors(self):
         """모니터링 객체 설정"""
-        self.stock_monitor = StockMonitor(self.website_url, self.stock_selector)
-        self.discord_notifier = DiscordNotifier(self.discord_webhook)
+        if self.stock_monitor:
+            self.stock_monitor.close()
+        self.stock_monitor = self._create_stock_monitor(warm_up=False) if self.website_url else None
+        if self.listing_monitor:
+            # drill-down Selector(STOCK_SELECTOR)가 바뀌었을 수 있음 (직전 목록은 새 모니터에서 다시 기준으로 저장)
+            self.listing_monitor.close()
+            self.listing_monitor = self._create_listing_monitor()
+        self._setup_notifier()
+        
+    def _setup_notifier(self):
+        """Discord 알림 객체 설정"""
+        self.discord_notifier = DiscordNotifier(self.discord_webhook, product=self.product_id,
+                                                fence=self.leader.fence if self.leader else None)
+        
+    def _setup_subscriber_notifiers(self):
+        """구독자 Webhook 알림 객체를 시작 시 미리 생성 (잘못된 Webhook은 재입고 알림 때가 아니라 시작 시 바로 실패)"""
+        if not self.subscriptions:
+            return
+        for subscriber in self.subscriptions.subscribers.values():
+            try:
+                self._subscriber_notifier(subscriber)
+            except ValueError as e:
+                raise ValueError(f"구독자 '{subscriber.name}'의 webhook이 올바르지 않습니다: {str(e)}")
+                
+    def _setup_heartbeat(self):
+        """heartbeat 파일 기록 설정 (HEARTBEAT_FILE을 비우면 비활성화)"""
+        heartbeat_path = get_heartbeat_path()
+        if heartbeat_path:
+            self.heartbeat = HeartbeatWriter(heartbeat_path, self.check_interval * 60,
+                                             check_timeout_seconds=float(os.getenv('HEARTBEAT_CHECK_TIMEOUT', DEFAULT_CHECK_TIMEOUT)))
+            logger.info(f"heartbeat 파일: {heartbeat_path}")
+            
+    def _create_stock_monitor(self, warm_up):
+        """StockMonitor 생성 (warm_up: 제품 호스트 사전 접속, HEDGE_REQUESTS 설정 시 보조 확인용 모니터 포함)"""
+        stock_monitor = StockMonitor(self.website_url, self.stock_selector)
+        if os.getenv('HEDGE_REQUESTS', 'false').lower() in ('1', 'true', 'yes'):
+            from src.hedging import HedgedStockMonitor
+            stock_monitor = HedgedStockMonitor.from_env(
+                stock_monitor, lambda backend: StockMonitor(self.website_url, self.stock_selector, fetch_backend=backend))
+            logger.info(f"hedged 확인 사용 - 보조 백엔드: {stock_monitor.secondary.fetch_backend}")
+        if warm_up:
+            stock_monitor.warm_up()
+        return stock_monitor
+        
+    def _create_listing_monitor(self):
+        """목록 모니터 생성 (LISTING_URL이 비어 있으면 None)"""
+        if not self.listing_url:
+            return None
+        from src.listing_monitor import ListingMonitor
+        return ListingMonitor.from_env(self.stock_selector)
+        
+    def _mark_startup(self, stage):
+        """프로세스 시작부터 stage까지 걸린 시간 기록"""
+        elapsed = time.monotonic() - _PROCESS_STARTED
+        self.startup_timings[stage] = round(elapsed, 3)
+        metrics.STARTUP_SECONDS.set(elapsed, product=self.product_id, stage=stage)
+        logger.info(f"시작 단계 '{stage}': 프로세스 시작 후 {elapsed:.2f}초")
         
     def _on_config_changed(self, old_config, new_config):
         """설정 변경 시 콜백 (ConfigManager 사용 시에만)"""
         logger.info("설정 변경 감지 - 서비스 재구성 중...")
         
+        # 시작 중이면 준비 중인 브라우저가 stock_monitor에 들어갈 때까지 대기 (교체 전에 만든 브라우저가 남지 않도록)
+        self.monitors_ready.wait()
+        
         # 설정 다시 로드
         self._load_config_from_manager()
         
@@ -96,9 +246,16 @@ class SonyStockMonitorService:
         if (old_config.get('WEBSITE_URL') != new_config.get('WEBSITE_URL') or 
             old_config.get('STOCK_SELECTOR') != new_config.get('STOCK_SELECTOR')):
             self._setup_monitors()
+            old_product_id = product_id_from_url(old_config.get('WEBSITE_URL', ''))
+            if old_product_id != self.product_id:
+                # 이전 제품 행과 옵션 행('<제품 ID>#<옵션 이름>') 함께 삭제
+                self.state_table.remove_product(old_product_id)
+                self.last_results.pop(old_product_id, None)
             
-        # 스케줄러 재설정
+        # 스케줄러 재설정 (대기 중인 재시도 작업도 함께 제거됨)
         schedule.clear()
+        self.pending_retry = None
+        self.cron_last_run.clear()
         self.setup_scheduler()
         
         # Discord 알림
@@ -108,9 +265,9 @@ class SonyStockMonitorService:
         
     def _validate_config(self):
         """환경 변수 유효성 검사"""
-        if not self.website_url:
-            raise ValueError("WEBSITE_URL이 설정되지 않았습니다")
-        if not self.stock_selector:
+        if not self.website_url and not self.listing_url and not os.getenv('SUBSCRIPTIONS_FILE'):
+            raise ValueError("WEBSITE_URL이 설정되지 않았습니다 (목록/구독 모니터링만 하려면 LISTING_URL 또는 SUBSCRIPTIONS_FILE)")
+        if self.website_url and not self.stock_selector:
             raise ValueError("STOCK_SELECTOR가 설정되지 않았습니다")
         if not self.discord_webhook:
             raise ValueError("DISCORD_WEBHOOK_URL이 설정되지 않았습니다")
@@ -120,7 +277,7 @@ class SonyStockMonitorService:
             logger.warning(f"잘못된 NOTIFICATION_MODE: {self.notification_mode}. 기본값 '{NotificationMode.STOCK_AVAILABLE_ONLY}' 사용")
             self.notification_mode = NotificationMode.STOCK_AVAILABLE_ONLY
             
-        logger.info(f"설정 완료 - URL: {self.website_url}")
+        logger.info(f"설정 완료 - URL: {self.website_url or '(없음)'}" + (f", 목록: {self.listing_url}" if self.listing_url else ""))
         logger.info(f"체크 주기: {self.check_interval}분")
         logger.info(f"알림 모드: {self._get_mode_description()}")
         
@@ -136,38 +293,678 @@ class SonyStockMonitorService:
             
         return False
         
-    def check_stock(self):
-        """재고 확인 및 Discord 알림"""
+    def check_stock(self, force=False, retry=0):
+        """재고 확인 및 Discord 알림 (force: 일시정지 상태여도 확인, retry: 실패 후 재시도 회차)"""
+        if retry == 0:
+            # 정기 확인/관리 명령이 먼저 실행되면 남아 있던 재시도는 필요 없음
+            self._cancel_pending_retry()
+            
+        if not self.stock_monitor:
+            # 목록 모니터링만 설정됨
+            return
+            
+        if not self._owns(self.website_url):
+            # 다른 노드가 lease를 가진 shard (관리 명령 check도 확인하지 않음)
+            self.stats['checks_not_owned'] += 1
+            return
+            
+        if self.product_id in self.paused_products and not force:
+            self.stats['checks_skipped'] += 1
+            logger.info(f"일시정지된 제품 - 재고 확인 건너뜀: {self.product_id}")
+            return
+            
+        if self._in_blackout(self.product_id, force):
+            return
+            
+        # 사이트 장애/차단 중에는 open 대기 시간 동안 확인하지 않음 (관리 명령 check는 예외)
+        breaker = self._get_breaker()
+        if not breaker.allow() and not force:
+            self.stats['checks_suppressed'] += 1
+            metrics.CHECKS_SUPPRESSED_TOTAL.inc(product=self.product_id)
+            logger.info(f"서킷 브레이커 open - 재고 확인 건너뜀 ({breaker.retry_in():.0f}초 후 복구 확인)")
+            return
+            
+        started = time.monotonic()
+        self.stats['checks_total'] += 1
+        if self.heartbeat:
+            self.heartbeat.check_started()
         try:
-            logger.info("재고 확인 시작")
-            stock_status = self.stock_monitor.check_stock()
+            logger.info("재고 확인 시작" if retry == 0 else f"재고 확인 재시도 ({retry}/{self.retry_policy.max_retries})")
+            # 재시도는 sleep 없이 스케줄러 작업으로 등록 (그동안 다른 작업/관리 명령이 계속 실행됨)
+            result = self.stock_monitor.check_stock(max_retries=1)
+            status = result.status
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # 알림 발송 여부 확인
-            should_notify = self._should_send_notification(stock_status)
+            duration = time.monotonic() - started
             
-            if should_notify:
-                if stock_status:
-                    message = f"🟢 **재고 있음!** 🟢\n⏰ {current_time}\n🔗 {self.website_url}"
-                    logger.info("재고 있음 - Discord 알림 발송")
-                else:
-                    message = f"🔴 **품절** 🔴\n⏰ {current_time}\n🔗 {self.website_url}"
-                    logger.info("품절 - Discord 알림 발송")
+            self.stats[f'checks_{status}'] += 1
+            status_changed = self.state_table.record(self.product_id, status, content_hash(result.text))
+            if status_changed:
+                logger.info(f"재고 상태 변경: {status}")
+            for variant in result.variants:
+                # 옵션은 '<제품 ID>#<옵션 이름>' 행으로 기록
+                if self.state_table.record(f"{self.product_id}#{variant['name']}", variant['status'],
+                                           content_hash(variant['text'])):
+                    logger.info(f"옵션 '{variant['name']}' 재고 상태 변경: {variant['status']}")
+            # 상태/확인 시각/연속 횟수는 상태 테이블에 있으므로 나머지만 보관 (results 명령에서 합침)
+            self.last_results[self.product_id] = {
+                'matched': result.matched,
+                'agreement': result.agreement,
+                'variants': result.variants,
+                'price': result.price,
+                'duration_seconds': round(duration, 3),
+                'source': result.source,
+                'attempts': result.attempts,
+                'phases': phase_durations(result.timing),
+                'error': None,
+            }
+            metrics.CHECKS_TOTAL.inc(product=self.product_id, result=status)
+            metrics.CHECK_DURATION_SECONDS.observe(duration, product=self.product_id)
+            self._update_browser_metrics()
+            if self.heartbeat:
+                self.heartbeat.check_completed(ok=True)
+            if breaker.record_success() == CLOSED_AGAIN:
+                self._send_recovered_alert(breaker)
+            
+            # 옵션을 설정했으면 옵션별로 알림, 아니면 제품 전체 결과로 알림
+            targets = result.variants or [{'name': None, 'status': status, 'in_stock': result.in_stock, 'text': result.text}]
+            for target in targets:
+                self._notify_result(target, current_time, result.price)
+                
+            # 같은 제품을 구독한 구독자에게도 같은 결과 전달 (따로 확인하지 않음)
+            subscribed = self.subscriptions.get(self.website_url, self.stock_selector) if self.subscriptions else None
+            if subscribed:
+                self._fan_out(subscribed, result)
                 
-                # 알림 모드 정보 추가
-                mode_info = self._get_mode_description()
-                message += f"\n📋 알림 모드: {mode_info}"
+        except ProxyUnavailableError as e:
+            self._defer_check(self.product_id, e)
+            
+        except Exception as e:
+            if self._schedule_retry(e, retry, breaker):
+                return
+                
+            self.stats['checks_failed'] += 1
+            self.state_table.record_error(self.product_id)
+            metrics.CHECKS_TOTAL.inc(product=self.product_id, result='error')
+            if self.heartbeat:
+                self.heartbeat.check_completed(ok=False)
+            self.last_results[self.product_id] = {
+                'duration_seconds': round(time.monotonic() - started, 3),
+                'error': str(e),
+            }
+            logger.error(f"재고 확인 중 오류: {str(e)}")
+            
+            # 서킷 브레이커 사용 시 오류마다 알리지 않고 open될 때 한 번만 알림
+            event = breaker.record_failure(str(e))
+            if event == OPENED:
+                self._send_degraded_alert(breaker)
+            elif not breaker.enabled:
+                error_msg = f"❌ **재고 확인 오류** ❌\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n오류: {str(e)}"
+                self.discord_notifier.send_message(error_msg)
+                
+    def _defer_check(self, product_id, error):
+        """사용 가능한 프록시가 없어 이번 확인을 건너뜀 (사이트 장애가 아니므로 서킷 브레이커/재시도/오류 기록에 반영하지 않음)"""
+        self.stats['checks_proxy_unavailable'] += 1
+        metrics.CHECKS_PROXY_UNAVAILABLE_TOTAL.inc(product=product_id)
+        logger.warning(f"사용 가능한 프록시 없음 - 다음 확인까지 건너뜀: {product_id} ({str(error)})")
+        
+    def _schedule_retry(self, error, retry, breaker):
+        """실패한 확인을 재시도 작업으로 등록 (재시도 예산이 남았으면 True)
+        
+        차단 페이지와 복구 확인(half-open)은 재시도하지 않음
+        """
+        next_retry = retry + 1
+        if (not self.retry_policy.allows(next_retry) or isinstance(error, BlockedPageError)
+                or breaker.state == HALF_OPEN):
+            return False
+            
+        delay = self.retry_policy.delay(next_retry)
+        self.stats['checks_retried'] += 1
+        metrics.CHECK_RETRIES_TOTAL.inc(product=self.product_id)
+        logger.warning(f"재고 확인 실패 - {delay:.0f}초 후 재시도 ({next_retry}/{self.retry_policy.max_retries}): {str(error)}")
+        self.pending_retry = schedule.every(delay).seconds.do(self._run_retry, next_retry).tag('check', 'retry')
+        return True
+        
+    def _run_retry(self, retry):
+        """재시도 작업 실행 (1회만 실행되고 스케줄에서 제거됨)"""
+        self.pending_retry = None
+        self.check_stock(retry=retry)
+        return schedule.CancelJob
+        
+    def _cancel_pending_retry(self):
+        """대기 중인 재시도 작업 취소"""
+        if self.pending_retry is not None:
+            schedule.cancel_job(self.pending_retry)
+            self.pending_retry = None
+            
+    def check_listing(self, force=False):
+        """목록 페이지 확인 후 새 상품/재입고 알림 (force: 일시정지/서킷 브레이커 open 상태여도 확인)"""
+        listing_id = self.listing_monitor.listing_id
+        if not self._owns(self.listing_url):
+            self.stats['checks_not_owned'] += 1
+            return
+            
+        if listing_id in self.paused_products and not force:
+            self.stats['checks_skipped'] += 1
+            logger.info(f"일시정지된 목록 - 확인 건너뜀: {listing_id}")
+            return
+            
+        if self._in_blackout(listing_id, force):
+            return
+            
+        breaker = self._get_breaker(self.listing_url)
+        if not breaker.allow() and not force:
+            self.stats['checks_suppressed'] += 1
+            metrics.CHECKS_SUPPRESSED_TOTAL.inc(product=listing_id)
+            logger.info(f"서킷 브레이커 open - 목록 확인 건너뜀 ({breaker.retry_in():.0f}초 후 복구 확인)")
+            return
+            
+        started = time.monotonic()
+        self.stats['listing_checks'] += 1
+        if self.heartbeat:
+            self.heartbeat.check_started()
+        try:
+            logger.info("목록 확인 시작")
+            result = self.listing_monitor.check_listing()
+        except ProxyUnavailableError as e:
+            self._defer_check(listing_id, e)
+            return
+        except Exception as e:
+            self.stats['listing_failed'] += 1
+            metrics.CHECKS_TOTAL.inc(product=listing_id, result='error')
+            if self.heartbeat:
+                self.heartbeat.check_completed(ok=False)
+            self.last_results[listing_id] = {
+                'checked_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_seconds': round(time.monotonic() - started, 3),
+                'error': str(e),
+            }
+            logger.error(f"목록 확인 중 오류: {str(e)}")
+            
+            event = breaker.record_failure(str(e))
+            if event == OPENED:
+                self._send_degraded_alert(breaker)
+            elif not breaker.enabled:
+                error_msg = f"❌ **목록 확인 오류** ❌\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n오류: {str(e)}"
+                self.discord_notifier.send_message(error_msg)
+            return
+            
+        metrics.CHECK_DURATION_SECONDS.observe(result.duration, product=listing_id)
+        if self.heartbeat:
+            self.heartbeat.check_completed(ok=True)
+        if breaker.record_success() == CLOSED_AGAIN:
+            self._send_recovered_alert(breaker)
+            
+        # 목록의 상품도 제품별 상태 테이블에 기록 (status 명령으로 조회)
+        for tile in result.tiles:
+            self.state_table.record(tile['product_id'], tile['status'], tile['badge_hash'])
+        summary = result.to_dict()
+        summary['checked_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        summary['error'] = None
+        self.last_results[listing_id] = summary
+        self._notify_listing(result)
+        
+    def _notify_listing(self, result, max_lines=15):
+        """목록 변경 알림 (메시지 1개로 묶음, 알림 모드에 따라 품절 변경은 제외)"""
+        always = self.notification_mode == NotificationMode.ALWAYS
+        labels = {'in_stock': '재고 있음', 'out_of_stock': '품절', 'unknown': '확인 불가'}
+        lines = []
+        for tile in result.new:
+            if tile['status'] == IN_STOCK or always:
+                lines.append(f"🆕 새 상품: {tile['name'] or tile['product_id']} ({labels[tile['status']]})\n🔗 {tile['url']}")
+        for tile in result.restocked:
+            price = f" 💰 {tile['price']:,}원" if tile.get('price') is not None else ""
+            lines.append(f"🟢 재입고: {tile['name'] or tile['product_id']}{price}\n🔗 {tile['url']}")
+        if always:
+            for tile in result.changed:
+                if tile not in result.restocked:
+                    lines.append(f"🔴 {labels[tile['status']]}: {tile['name'] or tile['product_id']} ('{tile['badge']}')")
                     
-                self.discord_notifier.send_message(message)
+        if not lines:
+            if not result.baseline:
+                logger.info("알림 발송하지 않음 - 목록에 알릴 변경 없음")
+            return
+            
+        message = f"📦 **목록 변경 {len(lines)}건** 📦\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n" + "\n".join(lines[:max_lines])
+        if len(lines) > max_lines:
+            message += f"\n... 외 {len(lines) - max_lines}건\n🔗 {self.listing_url}"
+        message += f"\n📋 알림 모드: {self._get_mode_description()}"
+        logger.info(f"목록 변경 {len(lines)}건 - Discord 알림 발송")
+        if self._send_alert(self.listing_monitor.listing_id, message):
+            self.stats['notifications_sent'] += 1
+            
+    def check_subscription(self, key, force=False):
+        """구독 제품 1개 확인 후 구독자 전체에 결과 전달 (제품마다 주기당 1회)"""
+        product = self.subscriptions.products[key]
+        if not self._owns(product.url):
+            self.stats['checks_not_owned'] += 1
+            return
+            
+        if product.product_id in self.paused_products and not force:
+            self.stats['checks_skipped'] += 1
+            logger.info(f"일시정지된 제품 - 재고 확인 건너뜀: {product.product_id}")
+            return
+            
+        if self._in_blackout(product.product_id, force):
+            return
+            
+        breaker = self._get_breaker(product.url)
+        if not breaker.allow() and not force:
+            self.stats['checks_suppressed'] += 1
+            metrics.CHECKS_SUPPRESSED_TOTAL.inc(product=product.product_id)
+            logger.info(f"서킷 브레이커 open - 구독 제품 확인 건너뜀: {product.product_id}")
+            return
+            
+        started = time.monotonic()
+        self.stats['checks_total'] += 1
+        if self.heartbeat:
+            self.heartbeat.check_started()
+        try:
+            monitor = self.subscription_monitors.get(key)
+            if monitor is None:
+                # 구독 제품은 옵션/가격 Selector 없이 재고만 확인
+                monitor = self.subscription_monitors[key] = StockMonitor(product.url, product.selector, variants={},
+                                                                         price_selector='')
+            logger.info(f"구독 제품 재고 확인 시작: {product.product_id} (구독자 {len(product.subscribers)}명)")
+            result = monitor.check_stock(max_retries=1)
+        except ProxyUnavailableError as e:
+            self._defer_check(product.product_id, e)
+            return
+        except Exception as e:
+            self.stats['checks_failed'] += 1
+            self.state_table.record_error(product.product_id)
+            metrics.CHECKS_TOTAL.inc(product=product.product_id, result='error')
+            if self.heartbeat:
+                self.heartbeat.check_completed(ok=False)
+            self.last_results[product.product_id] = {
+                'duration_seconds': round(time.monotonic() - started, 3),
+                'error': str(e),
+            }
+            logger.error(f"구독 제품 재고 확인 중 오류 ({product.product_id}): {str(e)}")
+            # 장애/오류 알림은 서비스 운영 채널로만
+            if breaker.record_failure(str(e)) == OPENED:
+                self._send_degraded_alert(breaker)
+            return
+            
+        duration = time.monotonic() - started
+        self.stats[f'checks_{result.status}'] += 1
+        if self.state_table.record(product.product_id, result.status, content_hash(result.text)):
+            logger.info(f"구독 제품 재고 상태 변경 ({product.product_id}): {result.status}")
+        self.last_results[product.product_id] = {
+            'matched': result.matched,
+            'duration_seconds': round(duration, 3),
+            'source': result.source,
+            'subscribers': len(product.subscribers),
+            'error': None,
+        }
+        metrics.CHECKS_TOTAL.inc(product=product.product_id, result=result.status)
+        metrics.CHECK_DURATION_SECONDS.observe(duration, product=product.product_id)
+        if self.heartbeat:
+            self.heartbeat.check_completed(ok=True)
+        if breaker.record_success() == CLOSED_AGAIN:
+            self._send_recovered_alert(breaker)
+        self._fan_out(product, result)
+        
+    def _fan_out(self, product, result):
+        """구독자별 알림 모드/알림 금지 시간대에 따라 결과 전달"""
+        counts = fan_out(product, result, self._subscriber_notifier, digest=self.digest)
+        self.stats['subscriber_notifications_sent'] += counts['sent']
+        self.stats['subscriber_notifications_quiet'] += counts['quiet']
+        if counts['sent'] or counts['quiet'] or counts['failed']:
+            logger.info(f"구독자 알림 ({product.product_id}): 발송 {counts['sent']}, 금지 시간대 보류 {counts['quiet']}, "
+                        f"실패 {counts['failed']}")
+            metrics.ALERTS_HELD.set(self.digest.pending())
+                        
+    def _subscriber_notifier(self, subscriber):
+        """구독자 Webhook의 DiscordNotifier (같은 Webhook은 연결 재사용)"""
+        notifier = self.subscriber_notifiers.get(subscriber.webhook)
+        if notifier is None:
+            notifier = self.subscriber_notifiers[subscriber.webhook] = DiscordNotifier(
+                subscriber.webhook, product=subscriber.name, fence=self.leader.fence if self.leader else None)
+        return notifier
+        
+    def _check_all(self, force=False):
+        """제품/목록/구독 제품 전체 확인 (이 노드가 맡지 않은 것은 각 확인에서 건너뜀)"""
+        self.check_stock(force=force)
+        if self.listing_monitor:
+            self.check_listing(force=force)
+        for key in self._subscription_keys():
+            self.check_subscription(key, force=force)
+            
+    def _subscription_keys(self):
+        """따로 확인할 구독 제품 키 (WEBSITE_URL 제품과 같으면 기본 확인 결과를 함께 사용)"""
+        if not self.subscriptions:
+            return []
+        own = product_key(self.website_url, self.stock_selector) if self.website_url else None
+        return [key for key in self.subscriptions.products if key != own]
+        
+    def _check_jobs(self):
+        """정기 확인 작업 목록 [(제품 ID, 확인 함수, 인자, 태그)]"""
+        jobs = []
+        if self.website_url:
+            jobs.append((self.product_id, self.check_stock, (), ('check',)))
+        if self.listing_monitor:
+            jobs.append((self.listing_monitor.listing_id, self.check_listing, (), ('check', 'listing')))
+        for key in self._subscription_keys():
+            jobs.append((self.subscriptions.products[key].product_id, self.check_subscription, (key,),
+                         ('check', 'subscription')))
+        return jobs
+        
+    def _admin_targets(self):
+        """관리 명령(pause/resume/check)으로 지정할 수 있는 제품 ID"""
+        return {self.product_id} | {job[0] for job in self._check_jobs()}
+        
+    def _run_cron_check(self, product_id, check, *args):
+        """CHECK_SCHEDULE 제품의 매분 작업 - 일정에 맞는 분이면 확인 (앞 작업이 길어 분을 넘겼으면 지나간 분도 봄)"""
+        now = datetime.now().replace(second=0, microsecond=0)
+        last = self.cron_last_run.get(product_id, now - timedelta(minutes=1))
+        self.cron_last_run[product_id] = now
+        missed = min(int((now - last).total_seconds() // 60), 60)
+        if any(self.check_schedule.is_due(product_id, now - timedelta(minutes=i)) for i in range(missed)):
+            check(*args)
+            
+    def _in_blackout(self, product_id, force=False):
+        """확인 중단 시간대(CHECK_BLACKOUT)라 확인을 건너뛰는지 (관리 명령 check는 예외)"""
+        if force or not self.check_schedule.in_blackout(product_id):
+            return False
+        self.stats['checks_blackout'] += 1
+        metrics.CHECKS_BLACKOUT_TOTAL.inc(product=product_id)
+        logger.info(f"확인 중단 시간대 - 재고 확인 건너뜀: {product_id}")
+        return True
+        
+    def _owns(self, url):
+        """이 노드가 확인할 제품/목록인지 (standby는 전부 False, shard 분산을 쓰지 않으면 항상 True)"""
+        if self.leader and not self.leader.is_leader():
+            return False
+        return not self.shards or self.shards.owns(product_key(url, '')[0])
+        
+    def _sharded_checks(self, shards):
+        """shard 번호 집합에 속한 확인 작업 목록"""
+        checks = []
+        if self.website_url and self.shards.shard_of(product_key(self.website_url, '')[0]) in shards:
+            checks.append(self.check_stock)
+        if self.listing_monitor and self.shards.shard_of(product_key(self.listing_url, '')[0]) in shards:
+            checks.append(self.check_listing)
+        for key in self._subscription_keys():
+            if self.shards.shard_of(key[0]) in shards:
+                checks.append(lambda key=key: self.check_subscription(key))
+        return checks
+        
+    def _sync_shards(self):
+        """shard lease 갱신 (lease 시간의 1/3마다), 새로 맡은 shard의 제품은 다음 주기를 기다리지 않고 바로 확인"""
+        gained, lost = self.shards.maybe_sync()
+        for key in list(self.subscription_monitors):
+            if self.shards.shard_of(key[0]) in lost:
+                # 넘겨준 구독 제품의 브라우저/세션 정리
+                self.subscription_monitors.pop(key).close()
+        for check in self._sharded_checks(gained):
+            check()
+            
+    def _poll_leader(self):
+        """leader lease 갱신, standby에서 leader가 되면 다음 주기를 기다리지 않고 바로 전체 확인"""
+        event = self.leader.maybe_poll()
+        if event == 'promoted':
+            self._check_all()
+            if self.leader.previous_seen_at:
+                # 이전 leader가 마지막으로 살아 있던 시각부터 넘겨받은 첫 확인 완료까지
+                recovery = time.time() - self.leader.previous_seen_at
+                self.stats['failover_recovery_seconds'] = round(recovery, 3)
+                metrics.FAILOVER_RECOVERY_SECONDS.set(recovery, node=self.leader.node_id)
+                logger.info(f"leader 전환 - 이전 leader 중단 후 {recovery:.1f}초 만에 확인 재개")
+        elif not self.leader.is_leader():
+            warm_interval = float(os.getenv('STANDBY_WARM_UP_SECONDS', 300))
+            if warm_interval > 0 and time.monotonic() - self.standby_warmed_at >= warm_interval:
+                self._warm_standby()
                 
+    def _warm_standby(self):
+        """standby 연결 유지 (제품/목록 호스트와 Discord에 사전 접속만 하고 재고는 확인하지 않음)"""
+        self.standby_warmed_at = time.monotonic()
+        if self.stock_monitor:
+            self.stock_monitor.warm_up()
+        if self.listing_monitor:
+            self.listing_monitor.warm_up()
+        self.discord_notifier.warm_up()
+        
+    def _get_breaker(self, url=None):
+        """제품(또는 목록) 호스트의 서킷 브레이커 (호스트별로 하나)"""
+        host = urlparse(url or self.website_url or self.listing_url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker.from_env(host)
+        return breaker
+        
+    def _send_degraded_alert(self, breaker):
+        """서킷 브레이커 open 알림 (장애 동안 1회)"""
+        message = (f"🟠 **재고 확인 장애 - 확인 간격 늘림** 🟠\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                   f"🌐 {breaker.host}\n❌ 연속 실패 {breaker.failures}회: {breaker.last_error}\n"
+                   f"🔁 {breaker.retry_in():.0f}초 후 복구 확인 (실패 시 간격 두 배, 최대 {breaker.max_open_seconds:.0f}초)")
+        if self.discord_notifier.send_message(message):
+            self.stats['notifications_sent'] += 1
+            
+    def _send_recovered_alert(self, breaker):
+        """서킷 브레이커 closed 알림"""
+        duration = time.time() - breaker.opened_at if breaker.opened_at else 0
+        message = (f"🟢 **재고 확인 복구** 🟢\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                   f"🌐 {breaker.host}\n⏱️ 장애 지속: {duration / 60:.0f}분")
+        breaker.opened_at = None
+        if self.discord_notifier.send_message(message):
+            self.stats['notifications_sent'] += 1
+            
+    def _notify_result(self, target, current_time, price=None):
+        """제품 또는 옵션 1개의 확인 결과 알림 (알림 모드에 따라 발송 여부 결정)"""
+        stock_status = bool(target['in_stock'])
+        status = target['status']
+        label = f" ({target['name']})" if target['name'] else ""
+        
+        if not self._should_send_notification(stock_status):
+            reason = self._get_no_notification_reason(stock_status, status)
+            logger.info(f"알림 발송하지 않음{label} - {reason}")
+            return
+            
+        if stock_status:
+            message = f"🟢 **재고 있음!{label}** 🟢\n⏰ {current_time}\n🔗 {self.website_url}"
+            if price is not None:
+                message += f"\n💰 {price:,}원"
+            logger.info(f"재고 있음{label} - Discord 알림 발송")
+        elif status == 'unknown':
+            message = f"❓ **재고 상태 확인 불가{label}** ❓\n⏰ {current_time}\n🔗 {self.website_url}\n🔎 추출 텍스트: {target['text'] or '(요소 없음)'}"
+            logger.info(f"재고 상태 확인 불가{label} - Discord 알림 발송")
+        else:
+            message = f"🔴 **품절{label}** 🔴\n⏰ {current_time}\n🔗 {self.website_url}"
+            logger.info(f"품절{label} - Discord 알림 발송")
+            
+        # 알림 모드 정보 추가
+        mode_info = self._get_mode_description()
+        message += f"\n📋 알림 모드: {mode_info}"
+        
+        if self._send_alert(self.product_id, message):
+            self.stats['notifications_sent'] += 1
+            
+    def _send_alert(self, product_id, message):
+        """재고/목록 알림 발송 (알림 금지 시간대면 보류했다가 시간대가 끝나면 묶어서 발송) → 발송 여부"""
+        if self.check_schedule.in_quiet_hours(product_id):
+            self.digest.hold(('product', product_id), message)
+            self.stats['notifications_held'] += 1
+            metrics.ALERTS_HELD.set(self.digest.pending())
+            logger.info(f"알림 금지 시간대 - 알림 보류: {product_id} (보류 {self.digest.pending()}건)")
+            return False
+        return self.discord_notifier.send_message(message)
+        
+    def _flush_digests(self):
+        """알림 금지 시간대가 끝난 수신처의 보류 알림을 묶어 발송 (Discord 길이 상한을 넘으면 나눠 발송)"""
+        for key in list(self.digest.held):
+            kind, name = key
+            if kind == 'product':
+                if self.check_schedule.in_quiet_hours(name):
+                    continue
+                sent = self.digest.flush(key, self.discord_notifier.send_message)
             else:
-                reason = self._get_no_notification_reason(stock_status)
-                logger.info(f"알림 발송하지 않음 - {reason}")
+                subscriber = self.subscriptions.subscribers.get(name) if self.subscriptions else None
+                if subscriber is None:
+                    # 구독 설정에서 빠진 구독자
+                    self.digest.held.pop(key)
+                    continue
+                if subscriber.quiet_hours.contains():
+                    continue
+                sent = self.digest.flush(key, self._subscriber_notifier(subscriber).send_message)
+            if sent:
+                logger.info(f"알림 금지 시간대 종료 - 보류 알림 {sent}건 묶어서 발송 ({name})")
+            metrics.ALERTS_HELD.set(self.digest.pending())
+            
+    def _update_browser_metrics(self):
+        """브라우저 RSS 게이지 갱신"""
+        rss = self.stock_monitor.get_browser_rss_bytes()
+        if rss is not None:
+            metrics.BROWSER_RSS_BYTES.set(rss, product=self.product_id)
+            
+    def _record_scheduler_lag(self):
+        """실행 대기 중인 작업의 예정 시각 대비 지연 기록 (최대 지연 초 반환)"""
+        now = datetime.now()
+        max_lag = 0.0
+        for job in schedule.get_jobs():
+            if job.should_run:
+                job_name = next((tag for tag in ('retry', 'check', 'digest') if tag in job.tags), 'health')
+                lag = (now - job.next_run).total_seconds()
+                max_lag = max(max_lag, lag)
+                metrics.SCHEDULER_LAG_SECONDS.observe(lag, product=self.product_id, job=job_name)
+        return max_lag
                 
+    def handle_admin_command(self, command, **params):
+        """관리 소켓 명령 처리 (관리 소켓 스레드에서 호출됨)"""
+        if command == 'status':
+            return {'ok': True, 'status': self._get_status()}
+            
+        elif command == 'results':
+            return {'ok': True, 'results': {product_id: self._get_result(product_id) for product_id in list(self.last_results)}}
+            
+        elif command == 'stats':
+            return {'ok': True, 'stats': self._get_stats()}
+            
+        # 기본 제품, 목록 ID, 구독 제품 ID 중 하나 (생략하면 기본 제품)
+        product = params.get('product') or self.product_id
+        if product not in self._admin_targets():
+            return {'ok': False, 'error': f"알 수 없는 제품: {product}"}
+            
+        if command == 'pause':
+            self.paused_products.add(product)
+            logger.info(f"제품 모니터링 일시정지: {product}")
+            return {'ok': True, 'paused': sorted(self.paused_products)}
+            
+        elif command == 'resume':
+            self.paused_products.discard(product)
+            logger.info(f"제품 모니터링 재개: {product}")
+            return {'ok': True, 'paused': sorted(self.paused_products)}
+            
+        # check / reload는 브라우저와 스케줄러를 건드리므로 메인 스레드에서 실행
+        done = Event()
+        holder = {}
+        self.command_queue.put((command, params, done, holder))
+        
+        if command == 'check' and not params.get('wait'):
+            return {'ok': True, 'queued': True}
+            
+        if not done.wait(timeout=120):
+            return {'ok': False, 'error': f"{command} 명령 처리 시간 초과"}
+        return holder['response']
+        
+    def _process_admin_commands(self, timeout):
+        """관리 명령 큐 처리 (명령이 없으면 timeout초 동안 대기)"""
+        try:
+            command, params, done, holder = self.command_queue.get(timeout=timeout)
+        except Empty:
+            return
+            
+        try:
+            if command == 'check':
+                product = params.get('product')
+                jobs = {job[0]: job for job in self._check_jobs()}
+                if product in jobs:
+                    logger.info(f"관리 명령 - 즉시 재고 확인: {product}")
+                    _, check, args, _ = jobs[product]
+                    check(*args, force=True)
+                else:
+                    logger.info("관리 명령 - 즉시 재고 확인")
+                    self._check_all(force=True)
+                holder['response'] = {'ok': True, 'result': self._get_result(product or self.product_id)}
+            elif command == 'reload':
+                holder['response'] = self._reload_config()
         except Exception as e:
-            error_msg = f"❌ **재고 확인 오류** ❌\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n오류: {str(e)}"
-            logger.error(f"재고 확인 중 오류: {str(e)}")
-            self.discord_notifier.send_message(error_msg)
+            logger.error(f"관리 명령 실행 오류 ({command}): {str(e)}")
+            holder['response'] = {'ok': False, 'error': str(e)}
+        finally:
+            done.set()
+            
+    def _reload_config(self):
+        """runtime_config.json을 다시 읽어 서비스에 적용"""
+        if not self.config_manager:
+            return {'ok': False, 'error': "config_manager를 사용할 수 없습니다"}
+            
+        logger.info("관리 명령 - 설정 리로드")
+        old_config = {'WEBSITE_URL': self.website_url, 'STOCK_SELECTOR': self.stock_selector}
+        self.config_manager.load_runtime_config()
+        self._on_config_changed(old_config, self.config_manager.get_config())
+        return {'ok': True, 'config': self.config_manager.get_config()}
+        
+    def _get_status(self):
+        """서비스 상태 요약"""
+        next_run = schedule.next_run()
+        return {
+            'product_id': self.product_id,
+            'website_url': self.website_url,
+            'check_interval_minutes': self.check_interval,
+            'notification_mode': self.notification_mode,
+            'paused': sorted(self.paused_products),
+            'circuit_breaker': self._get_breaker().snapshot(),
+            'proxies': get_proxy_pool().snapshot() if get_proxy_pool() else None,
+            'listing': self.listing_monitor.snapshot() if self.listing_monitor else None,
+            'subscriptions': self.subscriptions.snapshot() if self.subscriptions else None,
+            'shards': self.shards.snapshot() if self.shards else None,
+            'leader': self.leader.snapshot() if self.leader else None,
+            'schedule': self.check_schedule.snapshot([job[0] for job in self._check_jobs()]),
+            'alerts_held': self.digest.pending(),
+            'alerts_dropped': self.digest.dropped,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'next_run': next_run.strftime('%Y-%m-%d %H:%M:%S') if next_run else None,
+            'retry_at': self.pending_retry.next_run.strftime('%Y-%m-%d %H:%M:%S') if self.pending_retry else None,
+            'state': self.state_table.get(self.product_id),
+            'changed_since_health_check': self.state_table.changed(CHANGED_STATUS),
+        }
+        
+    def _get_result(self, product_id):
+        """제품 1개의 마지막 확인 결과 (상태 테이블 행 + last_results의 부가 정보, 목록 ID는 목록 요약만)"""
+        extras = self.last_results.get(product_id)
+        state = self.state_table.get(product_id)
+        if state is None:
+            return extras
+        result = {
+            'status': state['status'],
+            'in_stock': state['status'] == IN_STOCK if state['status'] else None,
+            'checked_at': datetime.fromtimestamp(state['last_checked_at']).strftime('%Y-%m-%d %H:%M:%S'),
+            'consecutive': state['consecutive'],
+            'error_streak': state['error_streak'],
+        }
+        result.update(extras or {})
+        return result
+        
+    def _get_stats(self):
+        """누적 통계"""
+        stats = dict(self.stats)
+        stats['uptime_seconds'] = int((datetime.now() - self.started_at).total_seconds())
+        stats['startup'] = dict(self.startup_timings)
+        if self.stock_monitor is not None and not isinstance(self.stock_monitor, StockMonitor):
+            # HEDGE_REQUESTS 설정 시 HedgedStockMonitor
+            stats['hedging'] = dict(self.stock_monitor.stats)
+        if self.listing_monitor:
+            stats['listing'] = dict(self.listing_monitor.stats)
+        
+        # CHECK_TIMING_SINKS에 ring이 있으면 최근 단계별 소요 시간 포함
+        ring_buffer = get_ring_buffer()
+        if ring_buffer:
+            stats['recent_timings'] = [
+                {'outcome': t['outcome'], 'total_seconds': t['total_seconds'], 'phases': phase_durations(t)}
+                for t in ring_buffer.recent(limit=20)
+            ]
+        return stats
             
     def _get_mode_description(self):
         """알림 모드 설명 반환"""
@@ -177,9 +974,11 @@ class SonyStockMonitorService:
             return "매번 확인시마다"
         return self.notification_mode
         
-    def _get_no_notification_reason(self, current_stock_status):
+    def _get_no_notification_reason(self, current_stock_status, status=None):
         """알림을 보내지 않는 이유 반환"""
         if self.notification_mode == NotificationMode.STOCK_AVAILABLE_ONLY:
+            if status == 'unknown':
+                return "재고 상태 판단 불가 (재고 있을때만 알림 설정)"
             if not current_stock_status:
                 return "품절 상태 (재고 있을때만 알림 설정)"
         
@@ -189,27 +988,59 @@ class SonyStockMonitorService:
         """서비스 정상 동작 확인"""
         try:
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            message = f"💚 **재고 모니터링 서비스 정상 동작** 💚\n⏰ {current_time}\n📊 모니터링 URL: {self.website_url}\n📋 알림 모드: {self._get_mode_description()}"
+            message = f"💚 **재고 모니터링 서비스 정상 동작** 💚\n⏰ {current_time}\n📊 모니터링 URL: {self.website_url or self.listing_url}\n📋 알림 모드: {self._get_mode_description()}"
+            # 지난 헬스체크 이후 재고 상태가 바뀐 제품 (옵션/목록 상품 포함)
+            changed = self.state_table.changed(CHANGED_STATUS)
+            if changed:
+                shown = ', '.join(changed[:10]) + (f" 외 {len(changed) - 10}개" if len(changed) > 10 else '')
+                message += f"\n🔄 지난 헬스체크 이후 상태 변경: {len(changed)}개 ({shown})"
             logger.info("헬스체크 - 서비스 정상 동작")
             self.discord_notifier.send_message(message)
+            self.state_table.clear_changed()
         except Exception as e:
             logger.error(f"헬스체크 중 오류: {str(e)}")
             
     def setup_scheduler(self):
         """스케줄러 설정"""
-        # 재고 확인 스케줄
-        schedule.every(self.check_interval).minutes.do(self.check_stock)
+        # 재고 확인 스케줄 (CHECK_SCHEDULE 규칙이 있는 제품은 매분 깨어나 cron 규칙에 맞을 때만 확인)
+        jobs = self._check_jobs()
+        cron_products = []
+        for product_id, check, args, tags in jobs:
+            if self.check_schedule.has_cron(product_id):
+                schedule.every().minute.at(':00').do(self._run_cron_check, product_id, check, *args).tag(*tags, 'cron')
+                cron_products.append(product_id)
+            else:
+                schedule.every(self.check_interval).minutes.do(check, *args).tag(*tags)
+                
+        # heartbeat 허용 간격은 일정상 가장 긴 확인 간격 기준 (확인 중단 시간대 제외)
+        if self.heartbeat:
+            interval = self.check_interval * 60
+            for product_id in cron_products:
+                interval = max(interval, self.check_schedule.longest_gap_seconds(product_id))
+            self.heartbeat.set_check_interval(interval)
+            
+        # 알림 금지 시간대가 끝나면 보류 알림 발송 (시간대는 분 단위)
+        schedule.every().minute.at(':00').do(self._flush_digests).tag('digest')
         
         # 헬스체크 스케줄
         for time_str in self.health_check_times:
-            schedule.every().day.at(time_str.strip()).do(self.health_check)
+            schedule.every().day.at(time_str.strip()).do(self.health_check).tag('health')
             
-        logger.info(f"스케줄러 설정 완료 - 재고체크: {self.check_interval}분마다, 헬스체크: {', '.join(self.health_check_times)}")
+        logger.info(f"스케줄러 설정 완료 - 재고체크: {self.check_interval}분마다"
+                    + (f" (cron 일정: {', '.join(cron_products)})" if cron_products else "")
+                    + f", 헬스체크: {', '.join(self.health_check_times)}")
         
     def run(self):
         """서비스 실행"""
         logger.info("Sony 재고 모니터링 서비스 시작")
         
+        # 브라우저 실행 + 제품 호스트 사전 접속, Discord 연결 준비를 백그라운드에서 먼저 시작
+        warm_up = os.getenv('STARTUP_WARM_UP', 'true').lower() in ('1', 'true', 'yes')
+        startup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='startup')
+        self.monitors_ready.clear()
+        monitor_future = startup_pool.submit(self._create_stock_monitor, warm_up) if self.website_url else None
+        notifier_future = startup_pool.submit(self.discord_notifier.warm_up) if warm_up else None
+        
         # ConfigManager 사용 가능한 경우 설정 파일 감시 시작
         config_observer = None
         if CONFIG_MANAGER_AVAILABLE and self.config_manager:
@@ -219,25 +1050,97 @@ class SonyStockMonitorService:
             except Exception as e:
                 logger.warning(f"설정 파일 감시 시작 실패: {str(e)}")
         
-        # 시작 메시지 발송
-        dynamic_config_status = "활성화" if config_observer else "비활성화"
-        start_message = f"🚀 **Sony 재고 모니터링 서비스 시작** 🚀\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n📊 모니터링 URL: {self.website_url}\n🔄 체크 주기: {self.check_interval}분\n📋 알림 모드: {self._get_mode_description()}\n⚙️ 동적 설정 변경: {dynamic_config_status}"
-        self.discord_notifier.send_message(start_message)
+        # 관리 소켓 시작 (ADMIN_SOCKET_PATH를 비우면 비활성화)
+        if os.getenv('ADMIN_SOCKET_PATH', None) != '':
+            try:
+                from src.admin_server import AdminServer
+                self.admin_server = AdminServer(self)
+                self.admin_server.start()
+            except Exception as e:
+                self.admin_server = None
+                logger.warning(f"관리 소켓 시작 실패: {str(e)}")
+        
+        # 메트릭 엔드포인트 시작 (METRICS_PORT 설정 시)
+        try:
+            metrics.start_metrics_server()
+        except Exception as e:
+            logger.warning(f"메트릭 엔드포인트 시작 실패: {str(e)}")
         
+        # leader lease 먼저 시도 (standby면 시작 메시지/확인/알림 없이 대기)
+        if self.leader:
+            self.leader.poll()
+            if not self.leader.is_leader():
+                logger.info("standby로 시작 - 브라우저/연결만 준비하고 leader lease가 풀리면 넘겨받음")
+                
+        # 목록 모니터 (브라우저 없이 HTTP로 가져오므로 바로 생성)
+        self.listing_monitor = self._create_listing_monitor()
+        if self.listing_monitor:
+            logger.info(f"목록 모니터링 사용: {self.listing_url}" + ("" if self.listing_monitor.product_selector else " (drill-down 없음)"))
+            
         # 스케줄러 설정
         self.setup_scheduler()
         
-        # 초기 재고 확인
-        self.check_stock()
+        # 시작 메시지 발송 (연결 준비가 끝난 세션 사용, 브라우저는 계속 준비 중)
+        if notifier_future:
+            notifier_future.result()
+        dynamic_config_status = "활성화" if config_observer else "비활성화"
+        start_message = f"🚀 **Sony 재고 모니터링 서비스 시작** 🚀\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n📊 모니터링 URL: {self.website_url or self.listing_url}\n🔄 체크 주기: {self.check_interval}분\n📋 알림 모드: {self._get_mode_description()}\n⚙️ 동적 설정 변경: {dynamic_config_status}"
+        self.discord_notifier.send_message(start_message)
+        
+        # 브라우저 준비 완료 대기
+        try:
+            self.stock_monitor = monitor_future.result() if monitor_future else None
+        finally:
+            self.monitors_ready.set()
+        startup_pool.shutdown()
+        self._mark_startup('ready')
+        
+        # shard lease를 먼저 받고 맡은 제품만 초기 확인
+        if self.shards:
+            self.shards.sync()
+            
+        # 확인 1회가 lease 시간보다 오래 걸려도 가진 leader/shard lease가 만료되지 않도록 백그라운드에서 갱신
+        lease_keeper = None
+        if self.leader or self.shards:
+            from src.coordination import LeaseKeeper
+            lease_keeper = LeaseKeeper([c.renew for c in (self.leader, self.shards) if c])
+            lease_keeper.start()
+            
+        # 초기 재고 확인 (목록은 첫 확인 결과가 비교 기준)
+        self._check_all()
+        self._mark_startup('first_check')
         
         try:
             # 스케줄러 실행
             while True:
+                lag = self._record_scheduler_lag()
                 schedule.run_pending()
-                time.sleep(1)
+                if self.shards:
+                    self._sync_shards()
+                if self.leader:
+                    self._poll_leader()
+                if self.heartbeat:
+                    # 사이트 장애로 브레이커가 열린 동안은 일시정지처럼 취급 (컨테이너 재시작으로 해결되지 않음)
+                    paused = self.product_id in self.paused_products or self._get_breaker().state != CLOSED
+                    # 맡은 shard에 제품이 없는 노드도 확인하지 않는 것이 정상
+                    paused = paused or bool(self.shards and not self._sharded_checks(self.shards.owned))
+                    paused = paused or bool(self.leader and not self.leader.is_leader())
+                    # 모든 확인 대상이 확인 중단 시간대
+                    jobs = self._check_jobs()
+                    paused = paused or bool(jobs and all(self.check_schedule.in_blackout(job[0]) for job in jobs))
+                    self.heartbeat.tick(lag, paused=paused)
+                self._process_admin_commands(timeout=1)
         except KeyboardInterrupt:
             logger.info("서비스 중단됨")
         finally:
+            if lease_keeper:
+                lease_keeper.stop()
+            if self.shards:
+                self.shards.leave()
+            if self.leader:
+                self.leader.resign()
+            if self.admin_server:
+                self.admin_server.stop()
             if config_observer:
                 config_observer.stop()
                 config_observer.join()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Prometheus 형식 메트릭
+- 외부 의존성 없는 Counter / Gauge / Histogram
+- METRICS_PORT 설정 시 로컬 HTTP /metrics 엔드포인트 제공
+"""
+
+import os
+import logging
+from threading import Lock, Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# 재고 확인 단계/웹훅 전송 지연 시간용 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, description, label_names=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.extend(self._sample_lines(key, value))
+        return lines
+
+    def _sample_lines(self, key, value):
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+    metric_type = 'histogram'
+
+    def __init__(self, name, description, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        super().__init__(name, description, label_names)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def _sample_lines(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state['counts']):
+            cumulative += count
+            labels = _format_labels(self.label_names, key, ('le', _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+class MetricsRegistry:
+    """등록된 메트릭 모음"""
+
+    def __init__(self):
+        self.metrics = []
+        self.lock = Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        with self.lock:
+            metrics = list(self.metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+# 재고 확인
+CHECKS_TOTAL = Counter('sony_stock_checks_total', '재고 확인 횟수 (결과별)', ['product', 'result'])
+CHECK_DURATION_SECONDS = Histogram('sony_stock_check_duration_seconds', '재고 확인 전체 소요 시간', ['product'])
+CHECK_PHASE_SECONDS = Histogram('sony_stock_check_phase_seconds', '재고 확인 단계별 소요 시간 (navigate/ready_wait/locate/extract)', ['product', 'phase'])
+HTTP_RESPONSE_BYTES = Histogram('sony_stock_http_response_bytes', 'HTTP 백엔드가 확인 1회에 받은 응답 크기 (스트리밍 중단 포함)', ['product'], buckets=(16384, 65536, 131072, 262144, 524288, 1048576, 2097152, 4194304))
+STRUCTURED_DATA_AGREEMENT_TOTAL = Counter('sony_stock_structured_data_agreement_total', 'JSON-LD 재고 판단과 Selector 판단 비교 결과', ['product', 'result'])
+CHECK_RETRIES_TOTAL = Counter('sony_stock_check_retries_total', '실패한 재고 확인을 스케줄러 재시도 작업으로 등록한 횟수', ['product'])
+HEDGED_CHECKS_TOTAL = Counter('sony_stock_hedged_checks_total', 'hedged 확인 결과 (primary/hedge/failed/budget_exhausted/busy)', ['product', 'outcome'])
+HEDGE_DELAY_SECONDS = Gauge('sony_stock_hedge_delay_seconds', '보조 확인을 시작하는 기준 지연 (최근 지연 백분위수)', ['product'])
+
+# 차단/장애
+BLOCKED_PAGES_TOTAL = Counter('sony_stock_blocked_pages_total', '차단/챌린지 페이지 감지 횟수 (http_status/challenge)', ['product', 'kind'])
+CIRCUIT_BREAKER_STATE = Gauge('sony_stock_circuit_breaker_state', '호스트별 서킷 브레이커 상태 (0: closed, 1: half_open, 2: open)', ['host'])
+CHECKS_SUPPRESSED_TOTAL = Counter('sony_stock_checks_suppressed_total', '서킷 브레이커 open으로 건너뛴 재고 확인 횟수', ['product'])
+
+# 프록시 풀
+PROXY_REQUESTS_TOTAL = Counter('sony_stock_proxy_requests_total', '프록시별 요청 결과 (ok/error/blocked)', ['proxy', 'result'])
+PROXY_HEALTHY = Gauge('sony_stock_proxy_healthy', '프록시 사용 가능 여부 (1: 사용 중, 0: 제외됨)', ['proxy'])
+PROXY_EJECTIONS_TOTAL = Counter('sony_stock_proxy_ejections_total', '프록시 제외 횟수', ['proxy'])
+CHECKS_PROXY_UNAVAILABLE_TOTAL = Counter('sony_stock_checks_proxy_unavailable_total', '사용 가능한 프록시가 없어 건너뛴 확인 횟수', ['product'])
+
+# 목록 페이지 모니터링
+LISTING_TILES = Gauge('sony_stock_listing_tiles', '마지막 목록에서 찾은 상품 타일 수', ['listing'])
+LISTING_CHANGES_TOTAL = Counter('sony_stock_listing_changes_total', '목록 변경 상품 수 (new/restocked/changed/removed)', ['listing', 'kind'])
+LISTING_DRILL_DOWNS_TOTAL = Counter('sony_stock_listing_drill_downs_total', '배지가 바뀐 상품의 제품 페이지 재확인 결과', ['listing', 'result'])
+
+# shard 분산
+SHARDS_OWNED = Gauge('sony_stock_shards_owned', '이 노드가 lease를 가진 shard 수', ['node'])
+SHARD_CHANGES_TOTAL = Counter('sony_stock_shard_changes_total', 'shard lease 획득/반납 횟수 (acquired/released)', ['node', 'kind'])
+
+# active/standby
+LEADER_STATE = Gauge('sony_stock_leader', 'leader 여부 (1: leader, 0: standby)', ['node'])
+FENCED_NOTIFICATIONS_TOTAL = Counter('sony_stock_fenced_notifications_total', 'leader가 아니어서(fencing token 불일치) 막은 알림 수', ['node'])
+FAILOVER_RECOVERY_SECONDS = Gauge('sony_stock_failover_recovery_seconds', '이전 leader가 마지막으로 살아 있던 시각부터 넘겨받은 첫 확인 완료까지', ['node'])
+
+# 페이지 캡처
+CAPTURES_TOTAL = Counter('sony_stock_captures_total', '페이지 캡처 저장 횟수 (stored/deduplicated)', ['product', 'result'])
+CAPTURE_STORE_BYTES = Gauge('sony_stock_capture_store_bytes', '캡처 저장소 압축 파일 합계 크기')
+
+# 브라우저
+DRIVER_RESTARTS_TOTAL = Counter('sony_stock_driver_restarts_total', 'WebDriver 재시작 횟수', ['product'])
+BROWSER_RSS_BYTES = Gauge('sony_stock_browser_rss_bytes', '브라우저(드라이버+Chrome 프로세스) RSS 합계', ['product'])
+
+# Discord 웹훅
+WEBHOOK_DELIVERY_SECONDS = Histogram('sony_stock_webhook_delivery_seconds', 'Discord 웹훅 요청 소요 시간 (응답 코드별)', ['product', 'status'])
+WEBHOOK_RATE_LIMITED_TOTAL = Counter('sony_stock_webhook_rate_limited_total', 'Discord 웹훅 429 응답 횟수', ['product'])
+
+# 서비스 시작
+STARTUP_SECONDS = Gauge('sony_stock_startup_seconds', '프로세스 시작부터 단계(ready/first_check)까지 걸린 시간', ['product', 'stage'])
+
+# 스케줄러
+SCHEDULER_LAG_SECONDS = Histogram('sony_stock_scheduler_lag_seconds', '예정 시각 대비 작업 실행 지연', ['product', 'job'], buckets=(0.5, 1, 2, 5, 10, 30, 60, 120, 300))
+
+# 확인 일정 / 알림 금지 시간대
+CHECKS_BLACKOUT_TOTAL = Counter('sony_stock_checks_blackout_total', '확인 중단 시간대(CHECK_BLACKOUT)라 건너뛴 재고 확인 횟수', ['product'])
+ALERTS_HELD = Gauge('sony_stock_alerts_held', '알림 금지 시간대(QUIET_HOURS)라 보류 중인 알림 수')
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 스크레이프마다 로그가 쌓이지 않도록 무시
+        pass
+
+def start_metrics_server(port=None, host=None):
+    """METRICS_PORT가 설정된 경우 /metrics HTTP 서버 시작 (없으면 None)"""
+    port = port or os.getenv('METRICS_PORT')
+    if not port:
+        return None
+
+    host = host or os.getenv('METRICS_HOST', '127.0.0.1')
+    server = ThreadingHTTPServer((host, int(port)), _MetricsRequestHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    logger.info(f"메트릭 엔드포인트 시작: http://{host}:{port}/metrics")
+    return server
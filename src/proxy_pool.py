@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+HTTP/SOCKS 프록시 풀
+- PROXY_URLS에 설정한 프록시 중 확인마다 하나를 골라 사용 (점수가 낮은 쪽, 두 개를 무작위로 뽑아 비교)
+- 점수: 응답 시간 지수이동평균 × 실패율(오류/차단) 가중치
+- 실패율이 기준을 넘거나 차단/챌린지 응답을 받으면 일정 시간 제외, 시간이 지나면 1회 시험 후 복귀
+- 프록시별 분당 요청 수 상한 (사이트 rate limit 회피)
+"""
+
+import os
+import time
+import random
+import logging
+from collections import deque
+from threading import Lock
+from urllib.parse import urlparse
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+PROXY_SCHEMES = ('http', 'https', 'socks5', 'socks5h', 'socks4')
+
+ACTIVE = 'active'
+EJECTED = 'ejected'
+PROBATION = 'probation'  # 제외 시간이 지나 1회 시험 중
+
+# 결과 종류
+OK = 'ok'
+ERROR = 'error'
+BLOCKED = 'blocked'  # 403/429, 챌린지 페이지 → 이 IP가 표시된 것이므로 바로 제외 (503 등 사이트 오류 응답은 OK)
+
+class ProxyUnavailableError(Exception):
+    """사용 가능한 프록시 없음 (모두 제외됐거나 분당 상한 도달)"""
+
+class Proxy:
+    """프록시 1개의 상태와 점수"""
+
+    def __init__(self, url):
+        self.url = url
+        parsed = urlparse(url)
+        self.scheme = parsed.scheme.lower()
+        self.label = f"{parsed.hostname}:{parsed.port}" if parsed.port else parsed.hostname  # 메트릭/로그용 (인증 정보 제외)
+        self.state = ACTIVE
+        self.latency = None  # 성공 응답 시간 지수이동평균 (초)
+        self.failure_rate = 0.0  # 오류/차단 비율 지수이동평균
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.eject_count = 0  # 복귀 없이 연속으로 제외된 횟수 (제외 시간 지수 증가)
+        self.ejected_until = None
+        self.recent = deque()  # 상한 구간(기본 1분) 안의 요청 시각
+
+    def score(self):
+        """낮을수록 좋음 (처음 쓰는 프록시는 0으로 먼저 시험, 성공 기록 없이 실패만 있어도 실패율만큼 불리)"""
+        return (self.latency or 0.0) * (1 + 10 * self.failure_rate) + self.failure_rate
+
+    def requests_proxies(self):
+        """requests의 proxies 인자"""
+        return {'http': self.url, 'https': self.url}
+
+    def snapshot(self):
+        return {
+            'proxy': self.label,
+            'state': self.state,
+            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+            'failure_rate': round(self.failure_rate, 3),
+            'requests': self.requests,
+            'recent_per_minute': len(self.recent),
+        }
+
+class ProxyPool:
+    """프록시 선택 / 결과 기록 (여러 모니터와 알림 객체가 함께 사용, 스레드 안전)"""
+
+    def __init__(self, urls, max_per_minute=0, eject_failure_rate=0.5, eject_seconds=300, min_requests=3,
+                 rate_window=60, clock=time.monotonic, rng=None):
+        if not urls:
+            raise ValueError("프록시가 설정되지 않았습니다")
+        self.proxies = [Proxy(url) for url in urls]
+        for proxy in self.proxies:
+            if proxy.scheme not in PROXY_SCHEMES:
+                raise ValueError(f"지원하지 않는 프록시 형식: {proxy.label} (가능: {', '.join(PROXY_SCHEMES)})")
+        self.max_per_minute = max_per_minute  # 0이면 상한 없음
+        self.rate_window = rate_window  # 상한 기준 구간 (초, 벤치마크에서 줄여서 사용)
+        self.eject_failure_rate = eject_failure_rate
+        self.eject_seconds = eject_seconds
+        self.min_requests = min_requests  # 실패율로 제외하기 전 최소 요청 수
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.lock = Lock()
+        for proxy in self.proxies:
+            metrics.PROXY_HEALTHY.set(1, proxy=proxy.label)
+
+    @classmethod
+    def from_env(cls):
+        """PROXY_* 환경변수로 생성 (PROXY_URLS가 비어 있으면 None)"""
+        urls = [u.strip() for u in os.getenv('PROXY_URLS', '').split(',') if u.strip()]
+        if not urls:
+            return None
+        if any(urlparse(u).scheme.lower().startswith('socks') for u in urls):
+            try:
+                import socks  # noqa: F401  (requests의 SOCKS 지원은 PySocks 필요)
+            except ImportError:
+                raise ValueError("SOCKS 프록시를 사용하려면 PySocks가 필요합니다 (pip install 'requests[socks]')")
+        return cls(urls,
+                   max_per_minute=int(os.getenv('PROXY_MAX_PER_MINUTE', 0)),
+                   eject_failure_rate=float(os.getenv('PROXY_EJECT_FAILURE_RATE', 0.5)),
+                   eject_seconds=float(os.getenv('PROXY_EJECT_SECONDS', 300)))
+
+    def acquire(self, rate_limited=True):
+        """이번 요청에 쓸 프록시 선택 (rate_limited: 분당 상한에 포함, 사이트 요청이 아니면 False)"""
+        with self.lock:
+            now = self.clock()
+            candidates = [p for p in self.proxies if self._available(p, now, rate_limited)]
+            if not candidates:
+                raise ProxyUnavailableError(self._unavailable_reason(now))
+            # 두 개를 무작위로 뽑아 점수가 낮은 쪽 (항상 최고 점수만 쓰면 한 프록시에 몰림)
+            proxy = min(self.rng.sample(candidates, min(2, len(candidates))), key=Proxy.score)
+            self._take(proxy, now, rate_limited)
+            return proxy
+
+    def try_use(self, proxy, rate_limited=True):
+        """정해진 프록시(브라우저 세션)를 이번 요청에도 쓸 수 있으면 True"""
+        with self.lock:
+            now = self.clock()
+            if not self._available(proxy, now, rate_limited):
+                return False
+            self._take(proxy, now, rate_limited)
+            return True
+
+    def record(self, proxy, result, latency=None):
+        """요청 결과 기록 (result: OK / ERROR / BLOCKED)"""
+        with self.lock:
+            metrics.PROXY_REQUESTS_TOTAL.inc(proxy=proxy.label, result=result)
+            if result == OK:
+                if latency is not None:
+                    proxy.latency = latency if proxy.latency is None else 0.7 * proxy.latency + 0.3 * latency
+                proxy.failure_rate *= 0.8
+                proxy.consecutive_failures = 0
+                if proxy.state == PROBATION:
+                    proxy.state = ACTIVE
+                    proxy.eject_count = 0
+                    metrics.PROXY_HEALTHY.set(1, proxy=proxy.label)
+                    logger.info(f"프록시 복귀: {proxy.label}")
+                return
+
+            proxy.failure_rate = 0.8 * proxy.failure_rate + 0.2
+            proxy.consecutive_failures += 1
+            if result == BLOCKED:
+                self._eject(proxy, "차단/챌린지 응답")
+            elif proxy.state == PROBATION:
+                self._eject(proxy, "복귀 시험 실패")
+            elif proxy.requests >= self.min_requests and (proxy.failure_rate >= self.eject_failure_rate
+                                                          or proxy.consecutive_failures >= 3):
+                self._eject(proxy, f"실패율 {proxy.failure_rate:.2f}")
+
+    def snapshot(self):
+        """관리 명령/상태 조회용 요약"""
+        with self.lock:
+            now = self.clock()
+            for proxy in self.proxies:
+                self._trim(proxy, now)
+            return [proxy.snapshot() for proxy in self.proxies]
+
+    def _available(self, proxy, now, rate_limited):
+        if proxy.state == EJECTED:
+            if now < proxy.ejected_until:
+                return False
+            proxy.state = PROBATION
+            logger.info(f"프록시 제외 시간 종료 - 복귀 시험: {proxy.label}")
+        if rate_limited and self.max_per_minute:
+            self._trim(proxy, now)
+            return len(proxy.recent) < self.max_per_minute
+        return True
+
+    def _take(self, proxy, now, rate_limited):
+        proxy.requests += 1
+        if rate_limited:
+            proxy.recent.append(now)
+
+    def _trim(self, proxy, now):
+        while proxy.recent and now - proxy.recent[0] >= self.rate_window:
+            proxy.recent.popleft()
+
+    def _eject(self, proxy, reason):
+        proxy.eject_count += 1
+        wait = self.eject_seconds * 2 ** min(proxy.eject_count - 1, 3)
+        proxy.state = EJECTED
+        proxy.ejected_until = self.clock() + wait
+        metrics.PROXY_HEALTHY.set(0, proxy=proxy.label)
+        metrics.PROXY_EJECTIONS_TOTAL.inc(proxy=proxy.label)
+        logger.warning(f"프록시 제외 ({reason}, {wait:.0f}초): {proxy.label}")
+
+    def _unavailable_reason(self, now):
+        ejected = [p for p in self.proxies if p.state == EJECTED and now < p.ejected_until]
+        if len(ejected) == len(self.proxies):
+            wait = min(p.ejected_until for p in ejected) - now
+            return f"모든 프록시 제외 중 ({wait:.0f}초 후 복귀 시험)"
+        return f"모든 프록시가 분당 요청 상한({self.max_per_minute}회) 도달"
+
+_default_pool = None
+_default_pool_loaded = False
+
+def get_proxy_pool():
+    """환경변수 기준 기본 프록시 풀 (프로세스 내 공유, 설정이 없으면 None)"""
+    global _default_pool, _default_pool_loaded
+    if not _default_pool_loaded:
+        _default_pool = ProxyPool.from_env()
+        _default_pool_loaded = True
+    return _default_pool
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+재고 확인 재시도 정책
+- 실패한 확인을 그 자리에서 sleep 후 재시도하지 않고 스케줄러 작업으로 다시 등록
+- 재시도 간격은 지수 증가 (+ 지터), 확인 1회당 재시도 횟수 상한(예산)
+"""
+
+import os
+import random
+
+class RetryPolicy:
+    """재시도 간격/횟수 설정"""
+
+    def __init__(self, max_retries=2, base_delay=5.0, max_delay=60.0, jitter=0.2):
+        self.max_retries = max_retries  # 확인 1회가 실패했을 때 추가로 시도하는 횟수 (0이면 재시도 안 함)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter  # 간격의 ±비율 (여러 인스턴스가 동시에 재시도하지 않도록)
+
+    @classmethod
+    def from_env(cls):
+        """CHECK_RETRY_* 환경변수로 생성"""
+        return cls(max_retries=int(os.getenv('CHECK_RETRY_MAX', 2)),
+                   base_delay=float(os.getenv('CHECK_RETRY_DELAY_SECONDS', 5)),
+                   max_delay=float(os.getenv('CHECK_RETRY_MAX_DELAY_SECONDS', 60)))
+
+    def allows(self, retry):
+        """retry회차 재시도가 예산 안인지 (1부터 시작)"""
+        return retry <= self.max_retries
+
+    def delay(self, retry):
+        """retry회차 재시도까지 기다릴 시간 (초)"""
+        delay = min(self.base_delay * 2 ** (retry - 1), self.max_delay)
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(1.0, delay)
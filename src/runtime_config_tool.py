@@ -3,20 +3,21 @@
 런타임 설정 변경 도구 (수정됨)
 - 실행 중인 서비스의 설정을 동적으로 변경
 - JSON 파일을 통한 설정 업데이트
-- 설정 변경 후 강제 리로드 기능 추가
+- 설정 변경 후 관리 소켓으로 즉시 리로드 요청
 """
 
 import os
 import sys
 import json
 import argparse
-import signal
 from datetime import datetime
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config_manager import get_config_manager
+from src.admin_server import send_admin_command
+from src.check_schedule import CheckSchedule
 
 def show_current_config():
     """현재 설정 표시"""
@@ -45,27 +46,58 @@ def show_current_config():
     print("-" * 50)
 
 def trigger_config_reload():
-    """메인 프로세스에 설정 리로드 신호 전송"""
+    """관리 소켓으로 실행 중인 서비스에 설정 리로드 요청"""
     try:
-        # 실행 중인 메인 프로세스 찾기
-        import subprocess
-        result = subprocess.run(['pgrep', '-f', 'src/main.py'], capture_output=True, text=True)
+        print("🔄 실행 중인 서비스에 설정 리로드 요청...")
+        response = send_admin_command('reload', timeout=30)
         
-        if result.returncode == 0 and result.stdout.strip():
-            pid = int(result.stdout.strip().split('\n')[0])
-            print(f"🔄 메인 프로세스 (PID: {pid})에 리로드 신호 전송...")
-            
-            # SIGUSR1 신호로 설정 리로드 요청
-            os.kill(pid, signal.SIGUSR1)
-            print("✅ 설정 리로드 신호 전송 완료")
+        if response.get('ok'):
+            print("✅ 설정 리로드 완료")
             return True
         else:
-            print("⚠️ 실행 중인 메인 프로세스를 찾을 수 없습니다")
+            print(f"⚠️ 설정 리로드 실패: {response.get('error')}")
             return False
             
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("⚠️ 실행 중인 서비스를 찾을 수 없습니다 (관리 소켓 없음)")
+        return False
     except Exception as e:
-        print(f"⚠️ 설정 리로드 신호 전송 실패: {str(e)}")
+        print(f"⚠️ 설정 리로드 요청 실패: {str(e)}")
+        return False
+
+def show_service_status():
+    """관리 소켓으로 서비스 상태 및 마지막 확인 결과 조회"""
+    try:
+        status = send_admin_command('status')
+        results = send_admin_command('results')
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("⚠️ 실행 중인 서비스를 찾을 수 없습니다 (관리 소켓 없음)")
+        return False
+        
+    print("📡 서비스 상태:")
+    print("-" * 50)
+    for key, value in status.get('status', {}).items():
+        print(f"{key}: {value}")
+    print("-" * 50)
+    for product_id, result in results.get('results', {}).items():
+        print(f"{product_id}: {result}")
+    return True
+
+def set_product_paused(paused, product=None):
+    """관리 소켓으로 제품 모니터링 일시정지/재개"""
+    command = 'pause' if paused else 'resume'
+    params = {'product': product} if product else {}
+    try:
+        response = send_admin_command(command, **params)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("⚠️ 실행 중인 서비스를 찾을 수 없습니다 (관리 소켓 없음)")
         return False
+        
+    if response.get('ok'):
+        print(f"✅ {'일시정지' if paused else '재개'} 완료 - 일시정지 목록: {response.get('paused')}")
+        return True
+    print(f"❌ {response.get('error')}")
+    return False
 
 def update_notification_mode(mode):
     """알림 모드 변경"""
@@ -157,6 +189,51 @@ def update_health_check_times(times):
         print("❌ 헬스체크 시간 변경 실패")
     return success
 
+def _update_schedule_setting(key, value, label, example, **schedule_args):
+    """CHECK_SCHEDULE/CHECK_BLACKOUT/QUIET_HOURS 검증 후 변경 (빈 문자열이면 해제)"""
+    value = value.strip()
+    try:
+        schedule = CheckSchedule(**schedule_args)
+    except ValueError as e:
+        print(f"❌ 잘못된 {label}: {str(e)}")
+        print(f"   예: {example}")
+        return False
+    
+    config_manager = get_config_manager()
+    
+    # 변경 전 설정 확인 (runtime_config.json의 다른 변경도 함께 읽어 둠)
+    print(f"변경 전 {label}: {config_manager.get_config(key) or '(없음)'}")
+    
+    success = config_manager.update_config(**{key: value})
+    
+    if success:
+        print(f"✅ {label} 변경: {value or '(해제)'}")
+        if key == 'CHECK_SCHEDULE':
+            # 규칙별 다음 확인 예정 시각 미리보기
+            for product_id in schedule.crons:
+                next_run = schedule.next_run(product_id)
+                print(f"   {product_id or '공통'}: 다음 확인 {next_run.strftime('%Y-%m-%d %H:%M') if next_run else '(8일 안에 없음)'}")
+        trigger_config_reload()
+    else:
+        print(f"❌ {label} 변경 실패 (같은 값이거나 저장 실패)")
+    return success
+
+def update_check_schedule(schedule):
+    """제품별 확인 일정(cron) 변경"""
+    return _update_schedule_setting('CHECK_SCHEDULE', schedule, '확인 일정',
+                                    "*/2 10-12 * * mon-fri; */15 * * * *; [2000012345] */5 * * * *",
+                                    schedule=schedule)
+
+def update_check_blackout(blackout):
+    """확인 중단 시간대 변경"""
+    return _update_schedule_setting('CHECK_BLACKOUT', blackout, '확인 중단 시간대',
+                                    "02:00-06:00,sun 00:00-09:00", blackout=blackout)
+
+def update_quiet_hours(quiet_hours):
+    """알림 금지 시간대 변경"""
+    return _update_schedule_setting('QUIET_HOURS', quiet_hours, '알림 금지 시간대',
+                                    "23:00-07:00,sat-sun 00:00-10:00", quiet_hours=quiet_hours)
+
 def update_website_info(url, selector):
     """웹사이트 정보 변경"""
     if not url.startswith('http'):
@@ -212,9 +289,11 @@ def interactive_mode():
         print("4. 웹사이트 정보 변경")
         print("5. 설정 초기화 (.env 파일로)")
         print("6. 강제 설정 리로드")
-        print("7. 종료")
+        print("7. 서비스 상태 조회")
+        print("8. 확인 일정 / 알림 금지 시간 변경")
+        print("9. 종료")
         
-        choice = input("\n선택하세요 (1-7): ").strip()
+        choice = input("\n선택하세요 (1-9): ").strip()
         
         if choice == '1':
             print("\n알림 모드:")
@@ -263,6 +342,26 @@ def interactive_mode():
             force_reload_config()
             
         elif choice == '7':
+            show_service_status()
+            
+        elif choice == '8':
+            print("\n1. 확인 일정 (CHECK_SCHEDULE, cron 형식)")
+            print("2. 확인 중단 시간대 (CHECK_BLACKOUT)")
+            print("3. 알림 금지 시간대 (QUIET_HOURS)")
+            schedule_choice = input("선택하세요 (1-3): ").strip()
+            
+            keys = {'1': ('CHECK_SCHEDULE', update_check_schedule), '2': ('CHECK_BLACKOUT', update_check_blackout),
+                    '3': ('QUIET_HOURS', update_quiet_hours)}
+            if schedule_choice in keys:
+                key, update = keys[schedule_choice]
+                print(f"현재 {key}: {config_manager.get_config(key) or '(없음)'}")
+                value = input("새로운 값 (';'로 규칙 구분, '[제품 ID] ' 접두어로 제품 전용, '-' 입력 시 해제): ").strip()
+                if value:
+                    update('' if value == '-' else value)
+            else:
+                print("❌ 잘못된 선택")
+            
+        elif choice == '9':
             print("👋 종료합니다.")
             break
         else:
@@ -274,15 +373,22 @@ def main():
     parser.add_argument('--notification-mode', type=str, help='알림 모드 변경 (stock_available_only/always)')
     parser.add_argument('--check-interval', type=int, help='체크 주기 변경 (분)')
     parser.add_argument('--health-times', type=str, help='헬스체크 시간 변경 (예: 09:00,12:00,15:00)')
+    parser.add_argument('--schedule', type=str, help="제품별 확인 일정 변경 (cron, 예: '*/2 10-12 * * mon-fri; */15 * * * *', 빈 문자열이면 해제)")
+    parser.add_argument('--blackout', type=str, help="확인 중단 시간대 변경 (예: '02:00-06:00,sun 00:00-09:00')")
+    parser.add_argument('--quiet-hours', type=str, help="알림 금지 시간대 변경 (예: '23:00-07:00', 보류 후 묶어서 발송)")
     parser.add_argument('--url', type=str, help='모니터링 URL 변경')
     parser.add_argument('--selector', type=str, help='CSS Selector 변경')
     parser.add_argument('--reset', action='store_true', help='설정 초기화')
     parser.add_argument('--reload', action='store_true', help='강제 설정 리로드')
+    parser.add_argument('--status', action='store_true', help='실행 중인 서비스 상태 조회')
+    parser.add_argument('--pause', action='store_true', help='제품 모니터링 일시정지')
+    parser.add_argument('--resume', action='store_true', help='제품 모니터링 재개')
+    parser.add_argument('--product', type=str, help='일시정지/재개 대상 제품 ID')
     
     args = parser.parse_args()
     
     # 인수가 없으면 대화형 모드
-    if not any(vars(args).values()):
+    if not any(value not in (None, False) for value in vars(args).values()):
         interactive_mode()
         return
     
@@ -298,6 +404,15 @@ def main():
     if args.health_times:
         update_health_check_times(args.health_times)
         
+    if args.schedule is not None:
+        update_check_schedule(args.schedule)
+        
+    if args.blackout is not None:
+        update_check_blackout(args.blackout)
+        
+    if args.quiet_hours is not None:
+        update_quiet_hours(args.quiet_hours)
+        
     if args.url and args.selector:
         update_website_info(args.url, args.selector)
     elif args.url or args.selector:
@@ -311,6 +426,15 @@ def main():
         
     if args.reload:
         force_reload_config()
+        
+    if args.status:
+        show_service_status()
+        
+    if args.pause:
+        set_product_paused(True, args.product)
+        
+    if args.resume:
+        set_product_paused(False, args.product)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
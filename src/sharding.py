@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+여러 호스트가 감시 목록을 나눠 확인 (shard + lease)
+- 제품 URL → shard 번호 (해시), shard마다 조정 저장소의 lease를 가진 노드만 확인 → 같은 제품을 두 노드가 확인하지 않음
+- 살아 있는 노드 목록으로 shard 배정 계산 (노드당 상한이 있는 rendezvous 해시, 모든 노드가 같은 결과)
+- 노드가 들어오거나 나가면 배정이 바뀐 shard는 기존 노드가 반납하고 새 노드가 획득
+- 노드가 죽으면 lease가 만료된 뒤 다음 동기화(lease 시간의 1/3마다)에서 다른 노드가 가져감
+- 가진 lease는 LeaseKeeper 스레드에서도 갱신 (확인 1회가 lease 시간보다 오래 걸려도 다른 노드가 가져가지 않음)
+"""
+
+import os
+import math
+import time
+import socket
+import hashlib
+import logging
+from threading import Lock
+
+from src import metrics
+from src.coordination import create_lease_store
+
+logger = logging.getLogger(__name__)
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def shard_of(item, shard_count):
+    """감시 대상(제품/목록 URL) → shard 번호"""
+    return _hash(item) % shard_count
+
+def assign_shards(nodes, shard_count):
+    """살아 있는 노드 목록 → {shard: 노드} (노드마다 최대 ceil(shard 수 / 노드 수)개)"""
+    if not nodes:
+        return {}
+    capacity = math.ceil(shard_count / len(nodes))
+    load = {node: 0 for node in nodes}
+    assignment = {}
+    for shard in range(shard_count):
+        ranked = sorted(nodes, key=lambda node: _hash(f"{shard}:{node}"), reverse=True)
+        for node in ranked:
+            if load[node] < capacity:
+                assignment[shard] = node
+                load[node] += 1
+                break
+    return assignment
+
+def default_node_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class ShardCoordinator:
+    """이 노드가 가진 shard lease 관리"""
+
+    def __init__(self, store, node_id, shard_count=32, lease_seconds=30.0, clock=time.time):
+        if shard_count < 1:
+            raise ValueError(f"SHARD_COUNT는 1 이상이어야 합니다: {shard_count}")
+        if lease_seconds <= 0:
+            raise ValueError(f"SHARD_LEASE_SECONDS는 0보다 커야 합니다: {lease_seconds}")
+        self.store = store
+        self.node_id = node_id
+        self.shard_count = shard_count
+        self.lease_seconds = lease_seconds
+        self.sync_interval = lease_seconds / 3
+        self.clock = clock
+        self.owned = {}  # shard → (fencing token, lease 만료 시각)
+        self.nodes = []
+        self.last_sync = None
+        self.last_renew = None
+        self.lost_pending = set()  # renew()에서 잃은 shard (다음 sync() 결과로 메인 루프에 전달)
+        self.lock = Lock()
+        self.stats = {'syncs': 0, 'sync_failed': 0, 'acquired': 0, 'released': 0, 'lost': 0}
+
+    @classmethod
+    def from_env(cls):
+        """SHARD_* 환경변수로 생성 (SHARD_STORE가 비어 있으면 None)"""
+        spec = os.getenv('SHARD_STORE', '')
+        if not spec:
+            return None
+        coordinator = cls(create_lease_store(spec), os.getenv('NODE_ID', '') or default_node_id(),
+                          shard_count=int(os.getenv('SHARD_COUNT', 32)),
+                          lease_seconds=float(os.getenv('SHARD_LEASE_SECONDS', 30)))
+        logger.info(f"shard 분산 사용 - 노드 {coordinator.node_id}, shard {coordinator.shard_count}개, "
+                    f"lease {coordinator.lease_seconds:.0f}초 ({spec})")
+        return coordinator
+
+    def shard_of(self, item):
+        return shard_of(item, self.shard_count)
+
+    def owns(self, item, now=None):
+        """item의 shard lease를 이 노드가 가지고 있고 아직 유효한지"""
+        lease = self.owned.get(self.shard_of(item))
+        now = self.clock() if now is None else now
+        return lease is not None and lease[1] > now
+
+    def maybe_sync(self):
+        """동기화 주기가 지났으면 sync() → (새로 얻은 shard, 잃은 shard)"""
+        now = self.clock()
+        if self.last_sync is not None and now - self.last_sync < self.sync_interval:
+            return set(), set()
+        return self.sync(now)
+
+    def renew(self):
+        """동기화 주기가 지났으면 노드 등록과 가진 shard lease만 갱신 (LeaseKeeper 스레드에서 호출, 새 shard는 획득하지 않음)"""
+        with self.lock:
+            now = self.clock()
+            last = max(self.last_sync or 0.0, self.last_renew or 0.0)
+            if not self.owned or now - last < self.sync_interval:
+                return
+            self.last_renew = now
+            lost = set()
+            try:
+                self.store.register_node(self.node_id, self.lease_seconds, now)
+                for shard, (token, _) in list(self.owned.items()):
+                    renewed = self.store.acquire(f"shard-{shard}", self.node_id, self.lease_seconds, now)
+                    if renewed != token:
+                        # 다른 노드가 가져갔던 lease를 새 token으로 다시 얻었으면 배정은 다음 sync()에 맡기고 반납
+                        if renewed is not None:
+                            self.store.release(f"shard-{shard}", self.node_id, now)
+                        del self.owned[shard]
+                        lost.add(shard)
+                        continue
+                    self.owned[shard] = (token, now + self.lease_seconds)
+            except Exception as e:
+                self.stats['sync_failed'] += 1
+                logger.error(f"shard lease 갱신 실패: {str(e)}")
+            self.lost_pending |= lost
+            self.stats['lost'] += len(lost)
+            self._record(set(), lost)
+
+    def sync(self, now=None):
+        """노드 등록 갱신, 배정에 맞게 lease 획득/갱신/반납 → (새로 얻은 shard, 잃은 shard)"""
+        with self.lock:
+            return self._sync(now)
+
+    def _sync(self, now=None):
+        now = self.clock() if now is None else now
+        self.last_sync = now
+        try:
+            self.store.register_node(self.node_id, self.lease_seconds, now)
+            self.nodes = self.store.live_nodes(now)
+            if self.node_id not in self.nodes:
+                self.nodes = sorted(self.nodes + [self.node_id])
+            assignment = assign_shards(self.nodes, self.shard_count)
+            gained, lost = set(), set()
+            for shard in range(self.shard_count):
+                name = f"shard-{shard}"
+                if assignment[shard] == self.node_id:
+                    # 이전 소유 노드가 아직 반납하지 않았으면 다음 동기화에서 다시 시도
+                    token = self.store.acquire(name, self.node_id, self.lease_seconds, now)
+                    if token is None:
+                        if self.owned.pop(shard, None):
+                            lost.add(shard)
+                        continue
+                    if shard not in self.owned:
+                        gained.add(shard)
+                    self.owned[shard] = (token, now + self.lease_seconds)
+                elif shard in self.owned:
+                    self.store.release(name, self.node_id, now)
+                    del self.owned[shard]
+                    lost.add(shard)
+        except Exception as e:
+            # 저장소에 닿지 않으면 가진 lease는 만료 시각까지만 유효 (owns()가 False가 되어 확인 중단)
+            self.stats['sync_failed'] += 1
+            logger.error(f"shard 동기화 실패: {str(e)}")
+            return set(), set()
+
+        self.stats['syncs'] += 1
+        self._record(gained, lost)
+        lost |= self.lost_pending
+        self.lost_pending = set()
+        return gained, lost
+
+    def _record(self, gained, lost):
+        self.stats['acquired'] += len(gained)
+        self.stats['released'] += len(lost)
+        metrics.SHARDS_OWNED.set(len(self.owned), node=self.node_id)
+        if gained:
+            metrics.SHARD_CHANGES_TOTAL.inc(len(gained), node=self.node_id, kind='acquired')
+        if lost:
+            metrics.SHARD_CHANGES_TOTAL.inc(len(lost), node=self.node_id, kind='released')
+        if gained or lost:
+            logger.info(f"shard 배정 변경 - 노드 {len(self.nodes)}개, 획득 {sorted(gained)}, 반납 {sorted(lost)} "
+                        f"(보유 {len(self.owned)}/{self.shard_count})")
+
+    def leave(self):
+        """종료 시 lease 반납 (다른 노드가 만료를 기다리지 않고 바로 가져감)"""
+        try:
+            for shard in list(self.owned):
+                self.store.release(f"shard-{shard}", self.node_id, self.clock())
+            self.store.remove_node(self.node_id)
+        except Exception as e:
+            logger.warning(f"shard lease 반납 실패 (만료 후 다른 노드가 가져감): {str(e)}")
+        lost = set(self.owned)
+        self.owned.clear()
+        self._record(set(), lost)
+        self.store.close()
+
+    def snapshot(self):
+        """관리 명령/상태 조회용 요약"""
+        return {
+            'node_id': self.node_id,
+            'nodes': list(self.nodes),
+            'shard_count': self.shard_count,
+            'owned': sorted(self.owned),
+            'lease_seconds': self.lease_seconds,
+            'stats': dict(self.stats),
+        }
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+제품별 모니터링 상태 테이블
+- 제품마다 dict/객체를 두지 않고 필드별 array(열 방향)에 저장 → 제품당 수십 바이트
+- 마지막 상태, 상태 변경 시각, 같은 상태 연속 횟수, 내용 해시, 연속 오류 횟수
+- "바뀐 제품"(changed) 조회는 C 수준 반복(compress)으로 전체를 한 번에 훑음 (헬스체크/status 명령의 상태 변경 보고)
+- 확인 시각 결정은 schedule 작업(고정 주기/cron/shard)이 맡음 (테이블에 다음 확인 시각을 따로 두지 않음)
+"""
+
+import time
+import hashlib
+from array import array
+from itertools import compress
+
+from src.stock_classifier import IN_STOCK, OUT_OF_STOCK, UNKNOWN
+
+# 상태 코드 (0 = 아직 확인 전)
+STATUS_CODES = {IN_STOCK: 1, OUT_OF_STOCK: 2, UNKNOWN: 3}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+# changed 플래그 비트
+CHANGED_STATUS = 1
+CHANGED_CONTENT = 2
+
+def content_hash(text):
+    """추출 텍스트 → 64비트 해시 (0은 '없음'으로 사용하지 않음)"""
+    if not text:
+        return 0
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+class ProductStateTable:
+    """제품 ID → 행 번호, 필드별 array 열"""
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.status = array('b')
+        self.last_change = array('d')
+        self.last_checked = array('d')
+        self.streak = array('I')
+        self.content_hash = array('Q')
+        self.error_streak = array('H')
+        self.flags = bytearray()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, product_id):
+        return product_id in self.index
+
+    def add(self, product_id):
+        """제품 추가 (이미 있으면 기존 행 번호 반환)"""
+        row = self.index.get(product_id)
+        if row is not None:
+            return row
+        row = len(self.ids)
+        self.index[product_id] = row
+        self.ids.append(product_id)
+        self.status.append(0)
+        self.last_change.append(0.0)
+        self.last_checked.append(0.0)
+        self.streak.append(0)
+        self.content_hash.append(0)
+        self.error_streak.append(0)
+        self.flags.append(0)
+        return row
+
+    def remove(self, product_id):
+        """제품 삭제 (마지막 행을 빈자리로 옮겨 열을 촘촘하게 유지)"""
+        row = self.index.pop(product_id)
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.index[moved] = row
+            for column in self._columns():
+                column[row] = column[last]
+        self.ids.pop()
+        for column in self._columns():
+            column.pop()
+
+    def remove_product(self, product_id):
+        """제품 행과 옵션 행('<제품 ID>#<옵션 이름>') 삭제 → 삭제한 행 수"""
+        rows = [row_id for row_id in self.ids if row_id == product_id or row_id.startswith(product_id + '#')]
+        for row_id in rows:
+            self.remove(row_id)
+        return len(rows)
+
+    def record(self, product_id, status, text_hash=0, now=None):
+        """확인 결과 기록 → 상태가 바뀌었으면 True (첫 확인은 바뀐 것으로 보지 않음)"""
+        now = now or time.time()
+        row = self.add(product_id)
+        code = STATUS_CODES[status]
+        previous = self.status[row]
+
+        changed = previous != code
+        if changed:
+            self.status[row] = code
+            self.last_change[row] = now
+            self.streak[row] = 1
+            if previous:
+                self.flags[row] |= CHANGED_STATUS
+        else:
+            self.streak[row] += 1
+
+        if text_hash != self.content_hash[row]:
+            if self.content_hash[row]:
+                self.flags[row] |= CHANGED_CONTENT
+            self.content_hash[row] = text_hash
+
+        self.last_checked[row] = now
+        self.error_streak[row] = 0
+        return changed and bool(previous)
+
+    def record_error(self, product_id, now=None):
+        """확인 실패 기록 (상태는 마지막 값 유지) → 연속 오류 횟수"""
+        row = self.add(product_id)
+        self.last_checked[row] = now or time.time()
+        if self.error_streak[row] < 0xFFFF:
+            self.error_streak[row] += 1
+        return self.error_streak[row]
+
+    def changed(self, mask=CHANGED_STATUS | CHANGED_CONTENT):
+        """마지막 clear_changed() 이후 상태(또는 내용)가 바뀐 제품 ID 목록"""
+        if mask == CHANGED_STATUS | CHANGED_CONTENT:
+            return list(compress(self.ids, self.flags))
+        return list(compress(self.ids, (flag & mask for flag in self.flags)))
+
+    def clear_changed(self):
+        self.flags = bytearray(len(self.ids))
+
+    def get(self, product_id):
+        """한 제품의 상태를 dict로 (관리 명령/로그용)"""
+        row = self.index.get(product_id)
+        if row is None:
+            return None
+        return {
+            'status': STATUS_NAMES.get(self.status[row]),
+            'last_change_at': self.last_change[row] or None,
+            'last_checked_at': self.last_checked[row] or None,
+            'consecutive': self.streak[row],
+            'content_hash': f"{self.content_hash[row]:016x}" if self.content_hash[row] else None,
+            'error_streak': self.error_streak[row],
+        }
+
+    def nbytes(self):
+        """열 데이터 크기 (제품 ID 문자열과 index dict 제외)"""
+        return sum(column.itemsize * len(column) for column in self._columns() if isinstance(column, array)) + len(self.flags)
+
+    def _columns(self):
+        return (self.status, self.last_change, self.last_checked, self.streak,
+                self.content_hash, self.error_streak, self.flags)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+재고 상태 분류기
+- 품절 / 확인 불가 / 재고 있음 문구를 순서(우선순위)대로 설정
+- 모든 문구를 Aho-Corasick 오토마타 하나로 컴파일해 텍스트를 한 번만 훑음 (문구 수와 무관하게 선형)
+- 어느 문구와도 맞지 않으면 재고 있음이 아닌 unknown으로 판단
+- STOCK_PATTERNS_FILE(JSON)로 기본값 / 제품별 문구 변경
+"""
+
+import os
+import json
+from collections import deque
+
+IN_STOCK = 'in_stock'
+OUT_OF_STOCK = 'out_of_stock'
+UNKNOWN = 'unknown'
+STOCK_STATUSES = (IN_STOCK, OUT_OF_STOCK, UNKNOWN)
+
+# 버튼/링크 비활성 상태는 이 표식으로 텍스트에 덧붙여 문구와 같은 방식으로 매칭
+DISABLED_MARKER = '@disabled'
+
+# (상태, 문구) 순서 = 우선순위. 여러 상태 문구가 함께 있으면 앞선 상태로 판단
+DEFAULT_RULES = (
+    (OUT_OF_STOCK, ('일시품절', '품절', '재고 없음', '재고없음', '판매 종료', '판매종료', '입고 예정', '입고예정',
+                    'sold out', 'out of stock', 'coming soon', DISABLED_MARKER)),
+    (UNKNOWN, ('서비스 점검', '잠시 후 다시', 'access denied', 'captcha')),
+    (IN_STOCK, ('구매하기', '구매 가능', '바로 구매', '장바구니', 'add to cart', 'buy now', 'in stock')),
+)
+
+class MultiPatternMatcher:
+    """Aho-Corasick 다중 문자열 매처 (대소문자 무시)"""
+
+    def __init__(self, patterns):
+        self.patterns = [p.lower() for p in patterns]
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append(index)
+
+        # 실패 링크 (BFS), 실패 링크 쪽 출력도 미리 합쳐 검색 시 링크를 따라가지 않음
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_matches(self, text):
+        """text에서 일치하는 패턴 인덱스를 등장 순서대로 생성"""
+        return self.stream().feed(text)
+
+    def stream(self):
+        """조각 단위로 이어서 검색하는 스트림 (조각 경계에 걸친 패턴도 찾음)"""
+        return MatchStream(self)
+
+class MatchStream:
+    """MultiPatternMatcher 상태를 조각 사이에 유지"""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.state = 0
+
+    def feed(self, text):
+        goto, fail, output = self.matcher.goto, self.matcher.fail, self.matcher.output
+        state = self.state
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                self.state = state
+                yield from output[state]
+        self.state = state
+
+class StockClassifier:
+    """텍스트 → (상태, 일치한 문구)"""
+
+    def __init__(self, rules=DEFAULT_RULES, no_match=UNKNOWN):
+        if no_match not in STOCK_STATUSES:
+            raise ValueError(f"알 수 없는 재고 상태: {no_match}")
+        self.rules = [(status, tuple(patterns)) for status, patterns in rules]
+        self.no_match = no_match
+
+        patterns = []
+        self.pattern_rank = []
+        self.pattern_status = []
+        for rank, (status, rule_patterns) in enumerate(self.rules):
+            if status not in STOCK_STATUSES:
+                raise ValueError(f"알 수 없는 재고 상태: {status}")
+            for pattern in rule_patterns:
+                patterns.append(pattern)
+                self.pattern_rank.append(rank)
+                self.pattern_status.append(status)
+        self.matcher = MultiPatternMatcher(patterns)
+
+    @classmethod
+    def from_env(cls, product_id):
+        """STOCK_PATTERNS_FILE의 default + 제품별 설정으로 생성 (파일이 없으면 기본 문구)"""
+        path = os.getenv('STOCK_PATTERNS_FILE', '')
+        if not path:
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+
+        merged = dict(config.get('default', {}))
+        merged.update(config.get(product_id, {}))
+        return cls.from_config(merged)
+
+    @classmethod
+    def from_config(cls, config):
+        """{"order": [...], "out_of_stock": [...], "unknown": [...], "in_stock": [...], "no_match": "unknown"}"""
+        defaults = dict(DEFAULT_RULES)
+        order = config.get('order') or [status for status, _ in DEFAULT_RULES]
+        rules = [(status, config.get(status, defaults.get(status, ()))) for status in order]
+        return cls(rules, no_match=config.get('no_match', UNKNOWN))
+
+    def classify(self, text, disabled=False, page=False):
+        """재고 상태 판단
+
+        disabled: 요소(또는 상위 요소)가 비활성 상태인지
+        page: 요소를 찾지 못해 페이지 전체를 검사하는 경우 (재고 있음 문구는 메뉴 등에도 있으므로 무시)
+        """
+        if disabled:
+            text = f"{text} {DISABLED_MARKER}"
+        scan = PageScan(self, page=page)
+        scan.feed(text)
+        return scan.result
+
+    def page_scan(self):
+        """페이지를 조각 단위로 검사하는 PageScan (스트리밍 조회용)"""
+        return PageScan(self, page=True)
+
+class PageScan:
+    """조각 단위로 텍스트를 받아 가장 우선순위가 높은 문구 유지"""
+
+    def __init__(self, classifier, page):
+        self.classifier = classifier
+        self.page = page
+        self.stream = classifier.matcher.stream()
+        self.best_rank = None
+        self.best_index = None
+
+    def feed(self, text):
+        if self.best_rank == 0:
+            return
+        classifier = self.classifier
+        for index in self.stream.feed(text):
+            rank = classifier.pattern_rank[index]
+            if self.page and classifier.pattern_status[index] == IN_STOCK:
+                continue
+            if self.best_rank is None or rank < self.best_rank:
+                self.best_rank, self.best_index = rank, index
+                if rank == 0:
+                    break
+
+    @property
+    def result(self):
+        """(상태, 일치한 문구)"""
+        if self.best_index is None:
+            return (UNKNOWN if self.page else self.classifier.no_match), None
+        return self.classifier.pattern_status[self.best_index], self.classifier.matcher.patterns[self.best_index]
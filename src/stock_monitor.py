@@ -1,58 +1,390 @@
 import os
+import re
+import json
 import time
+import codecs
 import logging
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+import requests
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+from src import metrics
+from src.check_timing import new_timer
+from src.browser_profile import ChromeProfile
+from src.html_extract import MultiSelectorTextParser, extract_selector_states, parse_selector, UnsupportedSelectorError
+from src.stock_classifier import StockClassifier, IN_STOCK, OUT_OF_STOCK, UNKNOWN
+from src.structured_data import JsonLdStreamScanner, extract_availability
+from src.capture_store import get_capture_store
+from src.proxy_pool import get_proxy_pool, ProxyUnavailableError, OK as PROXY_OK, ERROR as PROXY_ERROR, BLOCKED as PROXY_BLOCKED
 
 logger = logging.getLogger(__name__)
 
+# 페이지를 가져오는 방식
+FETCH_BACKENDS = ('selenium', 'http')
+
+# 구조화 데이터(JSON-LD) 사용 방식
+# prefer: 있으면 우선 사용하고 Selector 결과와 일치 여부 기록, only: 있으면 Selector 확인 생략, off: 사용 안 함
+STRUCTURED_DATA_MODES = ('prefer', 'only', 'off')
+
+# HTTP 스트리밍 조회 시 한 번에 읽는 크기 (바이트)
+HTTP_STREAM_CHUNK_SIZE = 16 * 1024
+
+# Chrome 실행 모드 (low_footprint: 메모리/CPU 제한 컨테이너용)
+BROWSER_MODES = ('default', 'low_footprint')
+
+LOW_FOOTPRINT_ARGUMENTS = (
+    '--headless=new',
+    '--window-size=800,600',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--mute-audio',
+    '--disable-renderer-backgrounding',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-features=Translate,OptimizationHints,MediaRouter,site-per-process',
+    '--renderer-process-limit=1',
+    '--js-flags=--max-old-space-size=128',
+)
+
+# 요소 또는 상위 요소가 비활성(구매 불가) 상태인지 (html_extract.is_disabled_element와 같은 기준)
+_DISABLED_CSS = '[disabled], [aria-disabled="true" i], .disabled, .is-disabled, .is_disabled'
+DISABLED_ANCESTOR_SCRIPT = f"return !!arguments[0].closest({json.dumps(_DISABLED_CSS)});"
+
+# {이름: Selector} → {이름: [텍스트, 비활성 여부] 또는 null} (브라우저 왕복 1회로 옵션/가격 요소 모두 읽기)
+SELECTOR_STATES_SCRIPT = f"""
+const states = {{}};
+for (const [name, selector] of Object.entries(arguments[0])) {{
+  const el = document.querySelector(selector);
+  states[name] = el ? [(el.innerText || el.textContent || '').trim(), !!el.closest({json.dumps(_DISABLED_CSS)})] : null;
+}}
+return states;
+"""
+
+# 메인 재고 요소 / 가격 요소 이름 (옵션 이름은 'variant:<이름>')
+STOCK_KEY = 'stock'
+PRICE_KEY = 'price'
+VARIANT_PREFIX = 'variant:'
+
+_PRICE_DIGITS_RE = re.compile(r'\d[\d,.]*')
+
+# 차단/요청 제한 응답 코드 (이 IP가 표시된 것이므로 재시도하지 않고 프록시 제외)
+# 503은 사이트 장애/점검 응답이라 프록시와 무관 (일반 HTTP 오류로 서킷 브레이커에만 반영)
+BLOCKED_STATUS_CODES = frozenset([403, 429])
+
+# 프록시 경로 문제로 보는 오류 (연결 실패/타임아웃/응답 도중 끊김, 브라우저는 'net::ERR_*' 메시지)
+NETWORK_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                  requests.exceptions.ChunkedEncodingError)
+
+# 봇 차단/챌린지 페이지 표식 - 제목 문구 (제품 페이지 본문의 'captcha' 등과 구분하려고 <title>만 검사)
+CHALLENGE_TITLE_MARKERS = ('just a moment', 'attention required', 'access denied', 'request rejected',
+                           'are you a robot', 'captcha', 'security check', '잠시만 기다려', '접근이 차단')
+
+# 봇 차단/챌린지 페이지 표식 - CDN/WAF 챌린지 스크립트와 리소스 경로
+CHALLENGE_BODY_MARKERS = ('/cdn-cgi/challenge-platform/', 'cf-chl-', '_incapsula_resource', 'px-captcha',
+                          'geo.captcha-delivery.com', '/_fs-ch-')
+
+# 챌린지 표식을 찾을 페이지 앞부분 크기 (챌린지 페이지는 작고, 표식은 <head>에 있음)
+CHALLENGE_SCAN_CHARS = 16 * 1024
+
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title', re.IGNORECASE | re.DOTALL)
+
+class BlockedPageError(Exception):
+    """차단/챌린지 페이지 (kind: http_status / challenge)"""
+    
+    def __init__(self, message, kind):
+        super().__init__(message)
+        self.kind = kind
+        
+def proxy_result_for(error):
+    """실패한 요청의 프록시 결과 (네트워크/연결 오류만 프록시 실패, 사이트 오류 응답/파싱 오류는 프록시 정상)"""
+    if isinstance(error, NETWORK_ERRORS) or 'net::ERR_' in str(error):
+        return PROXY_ERROR
+    return PROXY_OK
+    
+def detect_challenge(html_head):
+    """페이지 앞부분에서 봇 차단/챌린지 표식 찾기 (없으면 None)"""
+    lowered = html_head[:CHALLENGE_SCAN_CHARS].lower()
+    match = _TITLE_RE.search(lowered)
+    title = match.group(1).strip() if match else ''
+    for marker in CHALLENGE_TITLE_MARKERS:
+        if marker in title:
+            return f"title: {title[:80]}"
+    for marker in CHALLENGE_BODY_MARKERS:
+        if marker in lowered:
+            return marker
+    return None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_selenium_modules = None
+
+def _selenium():
+    """Selenium 지연 import (HTTP 백엔드는 불필요, 서비스 시작 시 import 비용 제거)"""
+    global _selenium_modules
+    if _selenium_modules is None:
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        _selenium_modules = SimpleNamespace(
+            webdriver=webdriver, By=By, Options=Options, Service=Service, WebDriverWait=WebDriverWait,
+            EC=EC, TimeoutException=TimeoutException, WebDriverException=WebDriverException,
+        )
+    return _selenium_modules
+
+def product_id_from_url(url):
+    """제품 URL에서 제품 ID 추출 (마지막 경로 조각, 없으면 호스트)"""
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split('/') if s]
+    return segments[-1] if segments else parsed.netloc
+
+def load_variant_selectors():
+    """STOCK_VARIANTS(JSON 객체 {"옵션 이름": "CSS Selector"}) → dict (미설정 시 빈 dict)"""
+    raw = os.getenv('STOCK_VARIANTS', '').strip()
+    if not raw:
+        return {}
+    variants = json.loads(raw)
+    if not isinstance(variants, dict) or not all(isinstance(v, str) and v for v in variants.values()):
+        raise ValueError('STOCK_VARIANTS는 {"옵션 이름": "CSS Selector"} 형식의 JSON 객체여야 합니다')
+    return variants
+
+def parse_price(text):
+    """'459,000원' → 459000 (숫자가 없으면 None)"""
+    match = _PRICE_DIGITS_RE.search(text or '')
+    if not match:
+        return None
+    digits = match.group().replace(',', '')
+    try:
+        return int(float(digits)) if '.' in digits else int(digits)
+    except ValueError:
+        return None
+
+def _process_rss_bytes(pid):
+    """/proc/<pid>/statm 기준 RSS (바이트)"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _process_cpu_seconds(pid):
+    """/proc/<pid>/stat 기준 누적 CPU 시간 (user + system, 초)"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+def process_tree_usage(root_pid):
+    """프로세스와 모든 하위 프로세스의 (RSS 합계 바이트, 누적 CPU 초) - Linux /proc 기반"""
+    # 부모 PID → 자식 PID 목록
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+            
+    rss = 0
+    cpu = 0.0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        rss += _process_rss_bytes(pid)
+        cpu += _process_cpu_seconds(pid)
+        stack.extend(children.get(pid, []))
+    return rss, cpu
+
+class CheckResult:
+    """재고 확인 결과 (bool로 평가하면 재고 여부, status가 unknown이면 False)"""
+    
+    def __init__(self, status, product_id, text='', source='selector', attempts=1, timing=None, matched=None,
+                 agreement=None, variants=None, price=None):
+        self.status = status  # in_stock / out_of_stock / unknown
+        self.in_stock = {IN_STOCK: True, OUT_OF_STOCK: False}.get(status)
+        self.product_id = product_id
+        self.text = text
+        self.source = source  # selector: 요소 텍스트, page_source: 페이지 전체 검색, structured_data: JSON-LD
+        self.attempts = attempts
+        self.timing = timing
+        self.matched = matched  # 판단 근거가 된 문구 / availability 값 (없으면 None)
+        self.agreement = agreement  # JSON-LD와 Selector 결과 비교 (agree / disagree / selector_unknown, 비교 안 했으면 None)
+        self.variants = variants or []  # 옵션별 결과 [{'name', 'status', 'in_stock', 'text', 'matched'}, ...]
+        self.price = price  # PRICE_SELECTOR 요소에서 읽은 가격 (없으면 None)
+        
+    def __bool__(self):
+        return bool(self.in_stock)
+        
+    def __repr__(self):
+        return f"CheckResult(status={self.status!r}, product_id={self.product_id!r}, source={self.source!r})"
+        
+    def to_dict(self):
+        return {
+            'status': self.status,
+            'in_stock': self.in_stock,
+            'product_id': self.product_id,
+            'text': self.text,
+            'source': self.source,
+            'matched': self.matched,
+            'agreement': self.agreement,
+            'variants': self.variants,
+            'price': self.price,
+            'attempts': self.attempts,
+            'timing': self.timing,
+        }
+
 class StockMonitor:
-    def __init__(self, website_url, stock_selector):
+    def __init__(self, website_url, stock_selector, timing_sinks=None, fetch_backend=None, browser_mode=None,
+                 variants=None, price_selector=None, proxy_pool=None, capture_store=None):
         self.website_url = website_url
         self.stock_selector = stock_selector
+        # 같은 페이지에서 함께 읽을 옵션(색상/구성)별 재고 요소와 가격 요소
+        self.variants = load_variant_selectors() if variants is None else dict(variants)
+        self.price_selector = os.getenv('PRICE_SELECTOR', '') if price_selector is None else price_selector
+        self.product_id = product_id_from_url(website_url)
+        self.timing_sinks = timing_sinks  # None이면 환경변수 기본 싱크 사용
+        self.fetch_backend = (fetch_backend or os.getenv('FETCH_BACKEND', 'selenium')).lower()
+        self.browser_mode = (browser_mode or os.getenv('BROWSER_MODE', 'default')).lower()
+        self.structured_data_mode = os.getenv('STRUCTURED_DATA', 'prefer').lower()
+        self.last_agreement = None
+        self.last_extras = {}  # 마지막 확인의 옵션/가격 요소 상태 {이름: (텍스트, 비활성 여부) 또는 None}
+        self.last_stock_state = None  # 마지막 확인의 재고 요소 (텍스트, 비활성 여부), 요소가 없었으면 None
+        self.last_page = None  # 캡처용 페이지 HTML (캡처 저장소를 쓸 때만 보관)
+        self.last_http_status = None  # 캡처용 HTTP 응답 코드 (http 백엔드)
         self.driver = None
-        self._setup_driver()
+        self.session = None
+        self._driver_errors = ()  # 드라이버 재시작이 필요한 예외 (selenium 백엔드에서만 설정)
+        self._driver_broken = False  # 마지막 시도가 드라이버 오류로 끝남 → 다음 확인 전에 재시작
+        self.profile = None
+        self.classifier = StockClassifier.from_env(self.product_id)
+        # 프록시 풀 (PROXY_URLS 설정 시, http: 시도마다 선택 / selenium: 브라우저 세션마다 선택)
+        self.proxy_pool = get_proxy_pool() if proxy_pool is None else proxy_pool  # False: 환경변수와 관계없이 사용 안 함
+        self.proxy = None
+        self._proxy_in_use = None  # 이번 시도에서 요청 수에 포함된 프록시 (결과 기록 대상)
+        self._next_proxy = None  # 다음 브라우저 세션에 쓸 프록시 (_select_proxy에서 미리 고른 경우)
+        # 확인마다 페이지를 저장하는 캡처 저장소 (CAPTURE_DIR 설정 시, 오분류 분석/재생용)
+        self.capture_store = get_capture_store() if capture_store is None else capture_store
+        
+        if self.fetch_backend not in FETCH_BACKENDS:
+            raise ValueError(f"지원하지 않는 FETCH_BACKEND: {self.fetch_backend} (가능: {', '.join(FETCH_BACKENDS)})")
+        if self.structured_data_mode not in STRUCTURED_DATA_MODES:
+            raise ValueError(f"지원하지 않는 STRUCTURED_DATA: {self.structured_data_mode} (가능: {', '.join(STRUCTURED_DATA_MODES)})")
+        if self.browser_mode not in BROWSER_MODES:
+            raise ValueError(f"지원하지 않는 BROWSER_MODE: {self.browser_mode} (가능: {', '.join(BROWSER_MODES)})")
+            
+        if self.fetch_backend == 'http':
+            self._setup_session()
+        else:
+            self.profile = ChromeProfile.from_env(self.product_id)
+            self._setup_driver()
+            
+    def _setup_session(self):
+        """HTTP 백엔드용 세션 설정 (브라우저 없이 HTML만 가져옴)"""
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept-Language': 'ko-KR,ko;q=0.9'})
+        # 조각 단위로 받으며 재고 정보가 확인되면 다운로드 중단
+        self.http_streaming = os.getenv('HTTP_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+        # 요소를 모두 읽은 뒤 JSON-LD를 더 기다리는 크기 (요소 뒤에 있는 JSON-LD용, 0이면 바로 중단)
+        self.structured_lookahead_bytes = int(float(os.getenv('STRUCTURED_DATA_LOOKAHEAD_KB', 64)) * 1024)
+        
+        # 지원하지 않는 Selector면 페이지 전체 검색으로 판단
+        try:
+            parse_selector(self.stock_selector)
+            self.http_selector_supported = True
+        except UnsupportedSelectorError as e:
+            self.http_selector_supported = False
+            logger.warning(f"HTTP 백엔드에서 Selector를 해석할 수 없어 페이지 전체 검색 사용: {str(e)}")
+            
+        # 옵션/가격 Selector는 대체 방법이 없으므로 설정 오류로 처리
+        for name, selector in self._extra_selectors().items():
+            try:
+                parse_selector(selector)
+            except UnsupportedSelectorError as e:
+                raise ValueError(f"HTTP 백엔드에서 해석할 수 없는 Selector ({name}): {str(e)}")
+            
+        logger.info("HTTP 백엔드 설정 완료")
         
     def _setup_driver(self):
         """Chrome WebDriver 설정"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # GUI 없이 실행
+            sel = _selenium()
+            self._driver_errors = (sel.WebDriverException,)
+            chrome_options = sel.Options()
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
             chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+            if self.browser_mode == 'low_footprint':
+                # 새 headless 모드 + 작은 화면, 백그라운드 작업/확장 끄고 렌더러 수와 JS 힙 제한
+                for argument in LOW_FOOTPRINT_ARGUMENTS:
+                    chrome_options.add_argument(argument)
+            else:
+                chrome_options.add_argument('--headless')  # GUI 없이 실행
+                chrome_options.add_argument('--window-size=1920,1080')
+            chrome_options.add_argument(f'--user-agent={USER_AGENT}')
             chrome_options.add_argument('--disable-blink-features=AutomationControlled')
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
+            # 프록시는 Chrome 실행 인자라 브라우저 세션 동안 고정 (사용할 수 없게 되면 드라이버 재시작 시 다시 선택)
+            if self.proxy_pool:
+                self.proxy = self._next_proxy or self.proxy_pool.acquire(rate_limited=False)
+                self._next_proxy = None
+                if urlparse(self.proxy.url).username:
+                    logger.warning(f"Chrome은 --proxy-server 인증 정보를 지원하지 않음: {self.proxy.label}")
+                chrome_options.add_argument(f'--proxy-server={self.proxy.url}')
+                logger.info(f"브라우저 프록시: {self.proxy.label}")
+            
             # Chrome 바이너리 경로 설정 (Docker 환경 지원)
             chrome_bin = os.getenv('CHROME_BIN')
             if chrome_bin and os.path.exists(chrome_bin):
                 chrome_options.binary_location = chrome_bin
                 logger.info(f"Chrome 바이너리 경로 설정: {chrome_bin}")
             
-            # ChromeDriver 경로 설정
-            chromedriver_path = os.getenv('CHROMEDRIVER_PATH')
-            if chromedriver_path and os.path.exists(chromedriver_path):
-                self.driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
-                logger.info(f"ChromeDriver 경로 설정: {chromedriver_path}")
-            else:
-                self.driver = webdriver.Chrome(options=chrome_options)
+            # 재사용 프로필 (CHROME_PROFILE_DIR 설정 시, 재시작 후에도 캐시/쿠키 유지)
+            if self.profile:
+                self.profile.prepare()
+                for argument in self.profile.chrome_arguments():
+                    chrome_options.add_argument(argument)
+            
+            try:
+                self.driver = self._launch_chrome(sel, chrome_options)
+            except Exception as e:
+                if not self.profile:
+                    raise
+                # 프로필 때문에 실행이 안 되는 경우를 대비해 초기화 후 1회 재시도
+                logger.warning(f"Chrome 실행 실패 - 프로필 초기화 후 재시도: {str(e)}")
+                self.profile.reset("Chrome 실행 실패")
+                self.driver = self._launch_chrome(sel, chrome_options)
             
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
-            logger.info("Chrome WebDriver 설정 완료")
+            logger.info(f"Chrome WebDriver 설정 완료 (모드: {self.browser_mode})")
         except Exception as e:
             logger.error(f"WebDriver 설정 중 오류: {str(e)}")
             raise
             
+    def _launch_chrome(self, sel, chrome_options):
+        """ChromeDriver 실행"""
+        # ChromeDriver 경로 설정
+        chromedriver_path = os.getenv('CHROMEDRIVER_PATH')
+        if chromedriver_path and os.path.exists(chromedriver_path):
+            driver = sel.webdriver.Chrome(service=sel.Service(chromedriver_path), options=chrome_options)
+            logger.info(f"ChromeDriver 경로 설정: {chromedriver_path}")
+            return driver
+        return sel.webdriver.Chrome(options=chrome_options)
+        
     def _get_element_text_with_multiple_methods(self, element):
         """다양한 방법으로 element에서 텍스트 추출"""
         methods = [
@@ -87,76 +419,508 @@ class StockMonitor:
         
         time.sleep(2)
         self._setup_driver()
+        metrics.DRIVER_RESTARTS_TOTAL.inc(product=self.product_id)
         logger.info("WebDriver 재시작 완료")
         
+    def warm_up(self):
+        """제품 호스트에 미리 접속해 DNS/TLS/캐시 준비 (실패해도 무시)"""
+        parsed = urlparse(self.website_url)
+        root_url = f"{parsed.scheme}://{parsed.netloc}/"
+        started = time.monotonic()
+        try:
+            if self.fetch_backend == 'http':
+                proxy = self.proxy_pool.acquire(rate_limited=False) if self.proxy_pool else None
+                self.session.get(root_url, timeout=10, proxies=proxy.requests_proxies() if proxy else None)
+            else:
+                self.driver.get(root_url)
+            logger.info(f"사전 접속 완료: {root_url} ({time.monotonic() - started:.2f}s)")
+            return True
+        except Exception as e:
+            logger.warning(f"사전 접속 실패 (무시): {str(e)}")
+            return False
+            
+    def get_browser_pid(self):
+        """ChromeDriver 프로세스 PID (HTTP 백엔드거나 알 수 없으면 None)"""
+        try:
+            return self.driver.service.process.pid
+        except Exception:
+            return None
+            
+    def get_browser_rss_bytes(self):
+        """ChromeDriver와 하위 Chrome 프로세스 RSS 합계 (Linux /proc 기반, 측정 불가 시 None)"""
+        root_pid = self.get_browser_pid()
+        if root_pid is None or not os.path.isdir('/proc'):
+            return None
+        return process_tree_usage(root_pid)[0]
+        
     def check_stock(self, max_retries=3):
-        """재고 확인 (True: 재고있음, False: 품절)"""
+        """재고 확인 (CheckResult 반환, bool로 평가하면 True: 재고있음, False: 품절)"""
+        if self._driver_broken:
+            logger.info("이전 확인의 WebDriver 오류 - 재시작 후 확인")
+            self._restart_driver()
+            self._driver_broken = False
+            
+        timer = new_timer(self.product_id, self.timing_sinks)
+        
         for attempt in range(max_retries):
+            timer.start_attempt(attempt + 1)
+            self.last_agreement = None
+            self.last_extras = {}
+            self.last_stock_state = None
+            self.last_page = None
+            self.last_http_status = None
             try:
                 logger.info(f"재고 확인 시도 {attempt + 1}/{max_retries}")
+                self._select_proxy()
+                attempt_started = time.monotonic()
                 
-                # 페이지 로드
-                self.driver.get(self.website_url)
-                
-                # 페이지 로딩 대기
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                
-                # 추가 대기 (동적 콘텐츠 로딩)
-                time.sleep(3)
-                
-                # 재고 정보 요소 찾기
-                try:
-                    element = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, self.stock_selector))
-                    )
-                except TimeoutException:
-                    logger.warning(f"재고 정보 요소를 찾을 수 없음: {self.stock_selector}")
-                    # 페이지 전체에서 "일시품절" 텍스트 검색
-                    page_source = self.driver.page_source
-                    if "일시품절" in page_source:
-                        logger.info("페이지에서 '일시품절' 텍스트 발견")
-                        return False
-                    else:
-                        logger.info("페이지에서 '일시품절' 텍스트 없음 - 재고 있음으로 판단")
-                        return True
-                
-                # 다양한 방법으로 텍스트 추출
-                text = self._get_element_text_with_multiple_methods(element)
-                
-                logger.info(f"추출된 텍스트: '{text}'")
-                
-                # "일시품절" 텍스트 확인
-                if "일시품절" in text:
-                    logger.info("품절 상태 확인")
-                    return False
+                if self.fetch_backend == 'http':
+                    status, text, source, matched = self._check_once_http(timer)
                 else:
-                    logger.info("재고 있음 상태 확인")
-                    return True
-                    
-            except WebDriverException as e:
+                    status, text, source, matched = self._check_once_selenium(timer)
+                    self._read_extras_selenium(timer)
+                    if self.capture_store:
+                        # 요소를 읽은 시점의 렌더링된 DOM
+                        self.last_page = self.driver.page_source
+                self._record_proxy(PROXY_OK, time.monotonic() - attempt_started)
+                result = self._finish(timer, status, text, source, matched, attempt + 1)
+                self._capture(status, result)
+                return result
+                
+            except BlockedPageError as e:
+                self._record_proxy(PROXY_BLOCKED)
+                self._capture('blocked')
+                # 차단 상태에서 즉시 재시도하면 차단만 길어지므로 재시도하지 않음
+                timer.end_attempt(error=str(e))
+                timer.finish('blocked')
+                metrics.BLOCKED_PAGES_TOTAL.inc(product=self.product_id, kind=e.kind)
+                logger.warning(f"차단/챌린지 페이지 감지 (시도 {attempt + 1}): {str(e)}")
+                raise
+
+            except ProxyUnavailableError as e:
+                # 사이트 요청 전에 실패 (모든 프록시가 제외/분당 상한) → 바로 재시도해도 같으므로 호출한 쪽에 맡김
+                timer.end_attempt(error=str(e))
+                timer.finish('proxy_unavailable')
+                raise
+
+            except self._driver_errors as e:
+                self._record_proxy(proxy_result_for(e))
+                timer.end_attempt(error=str(e))
                 logger.error(f"WebDriver 오류 (시도 {attempt + 1}): {str(e)}")
                 if attempt < max_retries - 1:
                     logger.info("WebDriver 재시작 시도")
                     self._restart_driver()
+                    timer.mark('restart_driver')
                     time.sleep(5)
+                    timer.mark('retry_wait')
                 else:
+                    # 재시도를 호출한 쪽(스케줄러)에 맡기는 경우에도 다음 확인 전에 드라이버 재시작
+                    self._driver_broken = True
+                    timer.finish('error')
                     raise
                     
             except Exception as e:
+                self._record_proxy(proxy_result_for(e))
+                timer.end_attempt(error=str(e))
                 logger.error(f"재고 확인 중 오류 (시도 {attempt + 1}): {str(e)}")
                 if attempt < max_retries - 1:
                     time.sleep(3)
+                    timer.mark('retry_wait')
                 else:
+                    timer.finish('error')
                     raise
                     
+        timer.finish('error')
         raise Exception("모든 재시도 실패")
         
-    def __del__(self):
-        """소멸자 - WebDriver 정리"""
+    def _check_once_selenium(self, timer):
+        """브라우저로 1회 확인 → (재고 상태, 추출 텍스트, 판단 근거, 일치 문구)"""
+        sel = _selenium()
+        
+        # 페이지 로드
+        self.driver.get(self.website_url)
+        timer.mark('navigate')
+        
+        # 페이지 로딩 대기
+        sel.WebDriverWait(self.driver, 10).until(
+            sel.EC.presence_of_element_located((sel.By.TAG_NAME, "body"))
+        )
+        
+        page_source = self.driver.page_source
+        if self.capture_store:
+            self.last_page = page_source
+        self._raise_if_challenge(page_source)
+        
+        # JSON-LD는 서버가 내려준 HTML에 있으므로 동적 콘텐츠 대기 전에 확인
+        structured = self._check_structured_data(page_source, timer)
+        if structured and self.structured_data_mode == 'only' and not self._extra_selectors():
+            return structured
+        
+        # 추가 대기 (동적 콘텐츠 로딩)
+        time.sleep(3)
+        timer.mark('ready_wait')
+        
+        # 재고 정보 요소 찾기
+        try:
+            element = sel.WebDriverWait(self.driver, 10).until(
+                sel.EC.presence_of_element_located((sel.By.CSS_SELECTOR, self.stock_selector))
+            )
+        except sel.TimeoutException:
+            timer.mark('locate')
+            logger.warning(f"재고 정보 요소를 찾을 수 없음: {self.stock_selector}")
+            return self._prefer_structured(structured, self._check_page_source(self.driver.page_source, timer))
+        
+        timer.mark('locate')
+        
+        # 다양한 방법으로 텍스트 추출
+        text = self._get_element_text_with_multiple_methods(element)
+        disabled = bool(self.driver.execute_script(DISABLED_ANCESTOR_SCRIPT, element))
+        return self._prefer_structured(structured, self._check_text(text, timer, disabled))
+        
+    def _check_once_http(self, timer):
+        """HTTP 요청으로 1회 확인 → (재고 상태, 추출 텍스트, 판단 근거, 일치 문구)"""
+        if self.http_streaming:
+            return self._check_once_http_streaming(timer)
+            
+        response = self.session.get(self.website_url, timeout=10, proxies=self._request_proxies())
+        self._raise_if_blocked_status(response)
+        response.raise_for_status()
+        html = response.text
+        timer.mark('navigate')
+        if self.capture_store:
+            self.last_page = html
+        return self._check_html(html, timer)
+        
+    def _check_html(self, html, timer):
+        """HTML 전체로 판단 → (재고 상태, 추출 텍스트, 판단 근거, 일치 문구)"""
+        self._raise_if_challenge(html)
+        
+        structured = self._check_structured_data(html, timer)
+        selectors = self._http_selectors()
+        states = extract_selector_states(html, selectors) if selectors else {}
+        found = states.pop(STOCK_KEY, None)
+        self.last_extras = states
+        timer.mark('locate')
+        if structured and self.structured_data_mode == 'only':
+            return structured
+            
+        if found is None:
+            logger.warning(f"재고 정보 요소를 찾을 수 없음: {self.stock_selector}")
+            return self._prefer_structured(structured, self._check_page_source(html, timer))
+            
+        text, disabled = found
+        return self._prefer_structured(structured, self._check_text(text, timer, disabled))
+        
+    def _check_once_http_streaming(self, timer):
+        """응답을 조각 단위로 파싱하고 필요한 정보가 모이면 연결을 끊음 (메모리는 페이지 크기와 무관)"""
+        selectors = self._http_selectors()
+        parser = MultiSelectorTextParser(selectors) if selectors else None
+        scanner = JsonLdStreamScanner() if self.structured_data_mode != 'off' else None
+        page_scan = self.classifier.page_scan()
+        received = 0
+        selectors_done_at = None  # 요소를 모두 읽은 시점까지 받은 바이트
+        stopped_early = False
+        pieces = [] if self.capture_store else None  # 캡처용 (받은 부분까지만, 재생 시 같은 판단에 충분)
+        
+        with self.session.get(self.website_url, timeout=10, stream=True, proxies=self._request_proxies()) as response:
+            self._raise_if_blocked_status(response)
+            response.raise_for_status()
+            # charset이 없으면 requests 기본값(ISO-8859-1) 대신 UTF-8
+            content_type = response.headers.get('Content-Type', '').lower()
+            encoding = response.encoding if 'charset=' in content_type else 'utf-8'
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            
+            head = ''
+            for chunk in response.iter_content(chunk_size=HTTP_STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                if pieces is not None:
+                    pieces.append(text)
+                if len(head) < CHALLENGE_SCAN_CHARS:
+                    head += text
+                    if len(head) >= CHALLENGE_SCAN_CHARS:
+                        if pieces is not None:
+                            # 챌린지 페이지면 여기서 중단되므로 받은 부분까지 캡처
+                            self.last_page = ''.join(pieces)
+                        self._raise_if_challenge(head)
+                if parser and not parser.done:
+                    parser.feed(text)
+                if scanner:
+                    scanner.feed(text)
+                page_scan.feed(text)
+                if selectors_done_at is None and self._selectors_done(parser):
+                    selectors_done_at = received
+                since_selectors_done = None if selectors_done_at is None else received - selectors_done_at
+                if self._stream_resolved(parser, scanner, since_selectors_done):
+                    stopped_early = True
+                    break
+            else:
+                text = decoder.decode(b'', final=True)
+                if pieces is not None:
+                    pieces.append(text)
+                if parser and not parser.done:
+                    parser.feed(text)
+                    parser.close()
+                if scanner:
+                    scanner.feed(text)
+                page_scan.feed(text)
+                
+            if pieces is not None:
+                self.last_page = ''.join(pieces)
+            if len(head) < CHALLENGE_SCAN_CHARS:
+                # 챌린지 페이지는 대부분 작아서 여기서 검사됨
+                self._raise_if_challenge(head)
+                
+        metrics.HTTP_RESPONSE_BYTES.observe(received, product=self.product_id)
+        logger.debug(f"HTTP 응답 {received} bytes 수신" + (" (재고 정보 확인 후 중단)" if stopped_early else ""))
+        timer.mark('navigate')
+        
+        if parser:
+            self.last_extras = {name: parser.state(name) for name in selectors if name != STOCK_KEY}
+        structured = self._structured_result(scanner.result, timer) if scanner else None
+        if structured and self.structured_data_mode == 'only':
+            return structured
+            
+        timer.mark('locate')
+        found = parser.state(STOCK_KEY) if parser and STOCK_KEY in selectors else None
+        if found is None:
+            logger.warning(f"재고 정보 요소를 찾을 수 없음: {self.stock_selector}")
+            return self._prefer_structured(structured, self._check_page_source(None, timer, scan=page_scan))
+            
+        text, disabled = found
+        return self._prefer_structured(structured, self._check_text(text, timer, disabled))
+        
+    def _select_proxy(self):
+        """이번 시도에 쓸 프록시 선택 (사용 가능한 프록시가 없으면 ProxyUnavailableError)"""
+        self._proxy_in_use = None
+        if not self.proxy_pool:
+            return
+        if self.fetch_backend == 'http':
+            self.proxy = None
+            self.proxy = self.proxy_pool.acquire()
+        elif not self.proxy_pool.try_use(self.proxy):
+            # 브라우저 프록시가 제외됐거나 분당 상한 → 지금 쓸 수 있는 다른 프록시가 있을 때만 브라우저 재시작
+            # (없으면 acquire()가 ProxyUnavailableError, 브라우저는 그대로 두고 다음 확인에서 다시 시도)
+            replacement = self.proxy_pool.acquire()
+            logger.info(f"브라우저 프록시 사용 불가 ({self.proxy.label}) - {replacement.label}로 WebDriver 재시작")
+            self._next_proxy = replacement
+            self._restart_driver()
+        self._proxy_in_use = self.proxy
+        
+    def _record_proxy(self, result, latency=None):
+        """이번 시도의 프록시 결과 기록 (점수/제외 판단)"""
+        proxy, self._proxy_in_use = self._proxy_in_use, None
+        if proxy:
+            self.proxy_pool.record(proxy, result, latency)
+            
+    def _request_proxies(self):
+        """HTTP 요청의 proxies 인자 (프록시 미사용 시 None)"""
+        return self.proxy.requests_proxies() if self.proxy else None
+        
+    def _raise_if_blocked_status(self, response):
+        """차단/요청 제한 응답 코드면 BlockedPageError (캡처 사용 시 응답 본문 앞부분을 last_page에 남김)"""
+        self.last_http_status = response.status_code
+        if response.status_code in BLOCKED_STATUS_CODES:
+            if self.capture_store:
+                self.last_page = self._response_head(response)
+            raise BlockedPageError(f"HTTP {response.status_code} 응답", kind='http_status')
+            
+    def _response_head(self, response):
+        """응답 본문 앞부분 (CHALLENGE_SCAN_CHARS 바이트까지, 스트리밍 응답도 나머지는 받지 않음)"""
+        try:
+            head = next(response.iter_content(chunk_size=CHALLENGE_SCAN_CHARS), b'')
+            return head.decode(response.encoding or 'utf-8', errors='replace')
+        except Exception as e:
+            logger.debug(f"차단 응답 본문 읽기 실패 (캡처 생략): {str(e)}")
+            return None
+            
+    def _raise_if_challenge(self, html_head):
+        """봇 차단/챌린지 페이지면 BlockedPageError"""
+        marker = detect_challenge(html_head)
+        if marker:
+            raise BlockedPageError(f"챌린지 페이지 ({marker})", kind='challenge')
+            
+    def _selectors_done(self, parser):
+        """재고/옵션/가격 요소를 모두 읽었는지 (재고 요소를 Selector로 읽지 못하면(미지원) 페이지 전체 검색을 위해 항상 False)"""
+        return parser is not None and parser.done and STOCK_KEY in parser.captures
+        
+    def _stream_resolved(self, parser, scanner, since_selectors_done):
+        """스트리밍 중 판단에 필요한 정보가 모였는지 (since_selectors_done: 요소를 모두 읽은 뒤 받은 바이트, 아직이면 None)"""
+        if scanner and not scanner.result:
+            # JSON-LD는 재고 요소 뒤에 있을 수도 있으므로 요소를 읽은 뒤에도 structured_lookahead_bytes만큼 더 받음
+            # (JSON-LD가 없는 페이지를 끝까지 받지 않도록, 그 안에 없으면 Selector 결과로 판단)
+            return since_selectors_done is not None and since_selectors_done >= self.structured_lookahead_bytes
+        # JSON-LD가 확인됐고 Selector 비교가 필요 없거나(only) 불가능하면(미지원) 옵션/가격 요소만 기다림
+        if scanner and (self.structured_data_mode == 'only' or not self.http_selector_supported):
+            return parser is None or all(c.done for name, c in parser.captures.items() if name != STOCK_KEY)
+        return since_selectors_done is not None
+        
+    def _extra_selectors(self):
+        """옵션/가격 요소 {이름: Selector}"""
+        selectors = {VARIANT_PREFIX + name: selector for name, selector in self.variants.items()}
+        if self.price_selector:
+            selectors[PRICE_KEY] = self.price_selector
+        return selectors
+        
+    def _http_selectors(self):
+        """HTTP 백엔드가 한 번의 파싱으로 읽을 요소 {이름: Selector}"""
+        selectors = {STOCK_KEY: self.stock_selector} if self.http_selector_supported else {}
+        selectors.update(self._extra_selectors())
+        return selectors
+        
+    def _read_extras_selenium(self, timer):
+        """브라우저에서 옵션/가격 요소 상태를 스크립트 1회로 읽음"""
+        selectors = self._extra_selectors()
+        if not selectors:
+            return
+        states = self.driver.execute_script(SELECTOR_STATES_SCRIPT, selectors) or {}
+        self.last_extras = {name: tuple(states[name]) if states.get(name) else None for name in selectors}
+        timer.mark('variants')
+        
+    def _variant_results(self):
+        """마지막 확인의 옵션별 결과 목록과 가격"""
+        variants = []
+        for name in self.variants:
+            found = self.last_extras.get(VARIANT_PREFIX + name)
+            if found is None:
+                logger.warning(f"옵션 '{name}' 재고 요소를 찾을 수 없음: {self.variants[name]}")
+                status, text, matched = UNKNOWN, None, None
+            else:
+                text, disabled = found
+                status, matched = self.classifier.classify(text, disabled=disabled)
+            variants.append({
+                'name': name,
+                'status': status,
+                'in_stock': {IN_STOCK: True, OUT_OF_STOCK: False}.get(status),
+                'text': text,
+                'matched': matched,
+            })
+        if variants:
+            logger.info("옵션별 재고: " + ', '.join(f"{v['name']}={v['status']}" for v in variants))
+            
+        price_state = self.last_extras.get(PRICE_KEY)
+        price = parse_price(price_state[0]) if price_state else None
+        if self.price_selector:
+            logger.info(f"가격: {price if price is not None else '확인 불가'}")
+        return variants, price
+        
+    def _check_structured_data(self, html, timer):
+        """JSON-LD Offer.availability로 재고 판단 (없거나 사용 안 하면 None)"""
+        if self.structured_data_mode == 'off':
+            return None
+        return self._structured_result(extract_availability(html), timer)
+        
+    def _structured_result(self, found, timer):
+        """extract_availability 결과 → 확인 결과 튜플 (없으면 None)"""
+        timer.mark('structured')
+        if found is None:
+            logger.debug("JSON-LD availability 없음")
+            return None
+        status, values = found
+        logger.info(f"JSON-LD availability: {', '.join(values)} → {status}")
+        return status, '', 'structured_data', ','.join(values)
+        
+    def _prefer_structured(self, structured, selector_result):
+        """JSON-LD 결과가 있으면 우선 사용하고 Selector 결과와의 일치 여부 기록"""
+        if structured is None:
+            return selector_result
+            
+        selector_status = selector_result[0]
+        if selector_status == UNKNOWN:
+            agreement = 'selector_unknown'
+        elif selector_status == structured[0]:
+            agreement = 'agree'
+        else:
+            agreement = 'disagree'
+            logger.warning(f"JSON-LD({structured[0]})와 Selector({selector_status}) 결과 불일치 - JSON-LD 결과 사용")
+        self.last_agreement = agreement
+        metrics.STRUCTURED_DATA_AGREEMENT_TOTAL.inc(product=self.product_id, result=agreement)
+        
+        # 판단은 JSON-LD, 텍스트는 비교용으로 Selector 결과 유지
+        return structured[0], selector_result[1], 'structured_data', structured[3]
+        
+    def _check_text(self, text, timer, disabled=False):
+        """요소 텍스트(+비활성 여부)로 재고 판단"""
+        self.last_stock_state = (text, disabled)
+        status, matched = self.classifier.classify(text, disabled=disabled)
+        timer.mark('extract')
+        logger.info(f"추출된 텍스트: '{text}'" + (" (비활성 요소)" if disabled else ""))
+        
+        if status == OUT_OF_STOCK:
+            logger.info(f"품절 상태 확인 ('{matched}')")
+        elif status == IN_STOCK:
+            logger.info(f"재고 있음 상태 확인 ('{matched}')" if matched else "재고 있음 상태 확인")
+        else:
+            logger.warning(f"재고 상태를 판단할 수 없음 ({'문구 ' + repr(matched) if matched else '일치하는 문구 없음'})")
+        return status, text, 'selector', matched
+            
+    def _check_page_source(self, page_source, timer, scan=None):
+        """요소를 찾지 못했을 때 페이지 전체에서 품절/확인 불가 문구 검색 (없으면 unknown)
+
+        scan: 스트리밍 중 이미 페이지를 검사한 PageScan (있으면 page_source 대신 사용)
+        """
+        status, matched = scan.result if scan else self.classifier.classify(page_source, page=True)
+        timer.mark('extract')
+        if status == OUT_OF_STOCK:
+            logger.info(f"페이지에서 '{matched}' 텍스트 발견")
+        else:
+            logger.warning("재고 정보 요소가 없어 재고 상태를 판단할 수 없음 (페이지 구조 변경 가능성)")
+        return status, '', 'page_source', matched
+        
+    def _finish(self, timer, status, text, source, matched, attempts):
+        """측정 종료 후 CheckResult 생성"""
+        variants, price = self._variant_results()
+        timer.end_attempt()
+        timing = timer.finish(status)
+        return CheckResult(status, self.product_id, text=text, source=source, attempts=attempts, timing=timing,
+                           matched=matched, agreement=self.last_agreement, variants=variants, price=price)
+        
+    def _capture(self, status, result=None):
+        """캡처 저장소에 이번 확인의 페이지(또는 추출 조각) 저장 (실패해도 확인에는 영향 없음)"""
+        if not self.capture_store:
+            return
+        try:
+            self.capture_store.add(self, status, result)
+        except Exception as e:
+            logger.warning(f"페이지 캡처 저장 실패 (무시): {str(e)}")
+            
+    def classify_html(self, html):
+        """저장된 페이지 HTML로 재고 판단 (네트워크 없이, 캡처 재생용) → CheckResult"""
+        timer = new_timer(self.product_id, [])
+        timer.start_attempt(1)
+        self.last_agreement = None
+        self.last_extras = {}
+        self.last_stock_state = None
+        status, text, source, matched = self._check_html(html, timer)
+        return self._finish(timer, status, text, source, matched, 1)
+        
+    def classify_fragment(self, fragment):
+        """저장된 추출 조각({'stock': [텍스트, 비활성 여부] 또는 None, 'extras': {...}})으로 재고 판단 → CheckResult"""
+        timer = new_timer(self.product_id, [])
+        timer.start_attempt(1)
+        self.last_agreement = None
+        self.last_extras = {name: tuple(state) if state else None for name, state in fragment.get('extras', {}).items()}
+        found = fragment.get('stock')
+        if found is None:
+            status, text, source, matched = UNKNOWN, '', 'page_source', None
+        else:
+            status, text, source, matched = self._check_text(found[0], timer, found[1])
+        return self._finish(timer, status, text, source, matched, 1)
+        
+    def close(self):
+        """WebDriver / HTTP 세션 정리"""
         try:
             if self.driver:
                 self.driver.quit()
+                self.driver = None
         except:
-            pass
\ No newline at end of file
+            pass
+        if self.session:
+            self.session.close()
+            self.session = None
+        if self.profile:
+            self.profile.release()
+            
+    def __del__(self):
+        """소멸자 - WebDriver 정리"""
+        self.close()
\ No newline at end of file
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+구조화 데이터(JSON-LD, schema.org Product / Offer) 재고 추출
+- HTML 전체를 파싱하지 않고 application/ld+json 스크립트 블록만 찾아 JSON 파싱
+- Offer.availability 값을 재고 상태(in_stock / out_of_stock)로 변환
+- 렌더링이나 CSS Selector 없이 원본 HTML만으로 판단 가능
+"""
+
+import re
+import json
+
+from src.stock_classifier import IN_STOCK, OUT_OF_STOCK
+
+_JSON_LD_RE = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(?P<body>.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# schema.org ItemAvailability → 재고 상태 (목록에 없는 값은 판단하지 않음)
+AVAILABILITY_STATUS = {
+    'InStock': IN_STOCK,
+    'LimitedAvailability': IN_STOCK,
+    'OnlineOnly': IN_STOCK,
+    'InStoreOnly': IN_STOCK,
+    'PreOrder': IN_STOCK,
+    'PreSale': IN_STOCK,
+    'MadeToOrder': IN_STOCK,
+    'OutOfStock': OUT_OF_STOCK,
+    'SoldOut': OUT_OF_STOCK,
+    'Discontinued': OUT_OF_STOCK,
+    'BackOrder': OUT_OF_STOCK,
+}
+
+_SCRIPT_END_RE = re.compile(r'</script\s*>', re.IGNORECASE)
+
+# 스트리밍 중 완성되지 않은 스크립트 블록 보관 상한 (넘으면 JSON-LD가 아닌 것으로 보고 버림)
+MAX_PENDING_SCRIPT = 1024 * 1024
+
+def _parse_json_ld_block(body):
+    body = body.strip()
+    if body.startswith('<!--'):
+        body = body[4:].rsplit('-->', 1)[0]
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return []
+    return data if isinstance(data, list) else [data]
+
+def iter_json_ld(html):
+    """HTML의 JSON-LD 블록을 파싱해 최상위 객체를 차례로 생성 (깨진 블록은 건너뜀)"""
+    for match in _JSON_LD_RE.finditer(html):
+        yield from _parse_json_ld_block(match.group('body'))
+
+def _types(node):
+    node_type = node.get('@type', ())
+    return set(node_type if isinstance(node_type, list) else [node_type])
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _normalize_availability(value):
+    """'https://schema.org/InStock', 'schema:InStock', 'InStock' → 'InStock'"""
+    if isinstance(value, dict):
+        value = value.get('@id') or value.get('name') or ''
+    return str(value).rstrip('/').rsplit('/', 1)[-1].rsplit(':', 1)[-1].strip()
+
+def iter_offer_availability(node):
+    """Product / ProductGroup / @graph를 따라가며 Offer의 availability 값 생성"""
+    if isinstance(node, list):
+        for item in node:
+            yield from iter_offer_availability(item)
+        return
+    if not isinstance(node, dict):
+        return
+
+    if '@graph' in node:
+        yield from iter_offer_availability(node['@graph'])
+
+    # @type이 빠진 Offer도 있으므로 availability 필드 존재 여부로 판단
+    if 'availability' in node:
+        yield _normalize_availability(node['availability'])
+    for offer in _as_list(node.get('offers')):
+        yield from iter_offer_availability(offer)
+    if 'ProductGroup' in _types(node):
+        yield from iter_offer_availability(node.get('hasVariant'))
+
+def availability_status(values):
+    """availability 값 목록 → (재고 상태, 값 목록) 또는 None (판단 가능한 값이 없을 때)
+
+    Offer가 여러 개면 하나라도 구매 가능하면 재고 있음
+    """
+    statuses = [AVAILABILITY_STATUS[v] for v in values if v in AVAILABILITY_STATUS]
+    if not statuses:
+        return None
+    status = IN_STOCK if IN_STOCK in statuses else OUT_OF_STOCK
+    return status, values
+
+def extract_availability(html):
+    """HTML → (재고 상태, availability 값 목록) 또는 None (JSON-LD에 availability가 없을 때)"""
+    values = []
+    for node in iter_json_ld(html):
+        values.extend(iter_offer_availability(node))
+    return availability_status(values)
+
+class JsonLdStreamScanner:
+    """HTML 조각을 차례로 받아 완성된 JSON-LD 블록의 availability 수집
+
+    완성되지 않은 마지막 스크립트 블록만 보관하므로 페이지 크기와 무관하게 메모리 사용이 작음
+    """
+
+    def __init__(self):
+        self.pending = ''
+        self.values = []
+
+    @property
+    def result(self):
+        """(재고 상태, 값 목록) 또는 None"""
+        return availability_status(self.values)
+
+    def feed(self, text):
+        buffer = self.pending + text
+        end = 0
+        for match in _JSON_LD_RE.finditer(buffer):
+            for node in _parse_json_ld_block(match.group('body')):
+                self.values.extend(iter_offer_availability(node))
+            end = match.end()
+
+        rest = buffer[end:]
+        lowered = rest.lower()
+        start = lowered.rfind('<script')
+        if start >= 0 and not _SCRIPT_END_RE.search(rest, start):
+            # 아직 닫히지 않은 스크립트 블록
+            self.pending = rest[start:] if len(rest) - start <= MAX_PENDING_SCRIPT else ''
+        else:
+            # 조각 경계에 걸친 '<scr' 같은 태그 일부만 남김
+            self.pending = rest[-len('<script'):]
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+다중 구독자 (제품 → 구독자 색인)
+- 구독자마다 Discord Webhook, 알림 모드, 알림 금지 시간대(quiet hours)와 구독 제품 목록
+- 같은 제품(URL + Selector)을 여러 구독자가 구독해도 확인은 주기당 1회, 결과를 구독자 전체에 전달
+- 구독자가 늘어도 사이트 요청 수와 브라우저 수는 고유 제품 수만큼만 늘어남
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from urllib.parse import urldefrag
+
+from src.stock_monitor import product_id_from_url
+from src.stock_classifier import IN_STOCK, UNKNOWN
+from src.check_schedule import TimeWindows
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_MODES = ('stock_available_only', 'always')
+
+class Subscriber:
+    """구독자 1명 (팀/채널)"""
+
+    def __init__(self, name, webhook, notification_mode='stock_available_only', quiet_hours=''):
+        if notification_mode not in NOTIFICATION_MODES:
+            raise ValueError(f"구독자 '{name}'의 notification_mode가 올바르지 않습니다: {notification_mode} "
+                             f"(가능: {', '.join(NOTIFICATION_MODES)})")
+        self.name = name
+        self.webhook = webhook
+        self.notification_mode = notification_mode
+        self.quiet_hours = TimeWindows(quiet_hours)
+
+    def wants(self, status):
+        """이 확인 결과를 알림으로 받을지 (알림 모드 기준)"""
+        return self.notification_mode == 'always' or status == IN_STOCK
+
+    def snapshot(self):
+        return {'name': self.name, 'notification_mode': self.notification_mode, 'quiet_hours': self.quiet_hours.spec}
+
+def product_key(url, selector):
+    """색인 키 (URL 조각(#...) 제외 + Selector)"""
+    return (urldefrag(url.strip())[0], selector.strip())
+
+class ProductSubscription:
+    """확인 대상 제품 1개와 구독자 목록"""
+
+    def __init__(self, url, selector):
+        self.url = url
+        self.selector = selector
+        self.product_id = product_id_from_url(url)
+        self.subscribers = []
+
+    @property
+    def key(self):
+        return product_key(self.url, self.selector)
+
+class SubscriptionIndex:
+    """제품(URL + Selector) → 구독자 색인"""
+
+    def __init__(self):
+        self.products = {}  # 키 → ProductSubscription (구독 순서 유지)
+        self.subscribers = {}  # 이름 → Subscriber
+
+    @classmethod
+    def from_file(cls, path, default_selector=''):
+        """구독 설정 JSON 파일로 생성 (subscriptions.example.json 참고, 제품 Selector 생략 시 default_selector)"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        index = cls()
+        for i, entry in enumerate(config.get('subscribers', [])):
+            name = entry.get('name') or f"subscriber-{i + 1}"
+            if not entry.get('webhook'):
+                raise ValueError(f"구독자 '{name}'의 webhook이 없습니다")
+            subscriber = Subscriber(name, entry['webhook'],
+                                    notification_mode=entry.get('notification_mode', 'stock_available_only').lower(),
+                                    quiet_hours=entry.get('quiet_hours', ''))
+            products = entry.get('products', [])
+            if not products:
+                raise ValueError(f"구독자 '{name}'의 구독 제품이 없습니다")
+            for product in products:
+                if isinstance(product, str):
+                    product = {'url': product}
+                selector = product.get('selector') or default_selector
+                if not product.get('url') or not selector:
+                    raise ValueError(f"구독자 '{name}'의 제품 설정에 url/selector가 없습니다: {product}")
+                index.subscribe(subscriber, product['url'], selector)
+        return index
+
+    @classmethod
+    def from_env(cls, default_selector=''):
+        """SUBSCRIPTIONS_FILE로 생성 (비어 있으면 None)"""
+        path = os.getenv('SUBSCRIPTIONS_FILE', '')
+        if not path:
+            return None
+        index = cls.from_file(path, default_selector)
+        logger.info(f"구독 설정: 구독자 {len(index.subscribers)}명, 고유 제품 {len(index.products)}개 "
+                    f"(구독 {index.subscription_count()}건)")
+        return index
+
+    def subscribe(self, subscriber, url, selector):
+        """구독 추가 → ProductSubscription (같은 구독자가 같은 제품을 두 번 구독하면 무시)"""
+        if self.subscribers.setdefault(subscriber.name, subscriber) is not subscriber:
+            raise ValueError(f"구독자 이름이 중복됩니다: {subscriber.name}")
+        key = product_key(url, selector)
+        product = self.products.get(key)
+        if product is None:
+            product = self.products[key] = ProductSubscription(*key)
+        if subscriber not in product.subscribers:
+            product.subscribers.append(subscriber)
+        return product
+
+    def get(self, url, selector):
+        return self.products.get(product_key(url, selector))
+
+    def subscription_count(self):
+        return sum(len(product.subscribers) for product in self.products.values())
+
+    def snapshot(self):
+        """관리 명령/상태 조회용 요약"""
+        return {
+            'subscribers': [subscriber.snapshot() for subscriber in self.subscribers.values()],
+            'products': [{'product_id': p.product_id, 'url': p.url, 'subscribers': [s.name for s in p.subscribers]}
+                         for p in self.products.values()],
+            # 구독마다 따로 확인했을 때 대비 줄어든 주기당 요청 수
+            'fetches_saved_per_cycle': self.subscription_count() - len(self.products),
+        }
+
+def result_message(product, status, text, current_time, price=None):
+    """구독자 알림 메시지"""
+    if status == IN_STOCK:
+        message = f"🟢 **재고 있음!** 🟢\n⏰ {current_time}\n🔗 {product.url}"
+        if price is not None:
+            message += f"\n💰 {price:,}원"
+    elif status == UNKNOWN:
+        message = f"❓ **재고 상태 확인 불가** ❓\n⏰ {current_time}\n🔗 {product.url}\n🔎 추출 텍스트: {text or '(요소 없음)'}"
+    else:
+        message = f"🔴 **품절** 🔴\n⏰ {current_time}\n🔗 {product.url}"
+    return message
+
+def fan_out(product, result, notifier_for, subscribers=None, now=None, digest=None):
+    """확인 결과 1개를 구독자(기본값: 제품의 구독자 전체)에 전달 → {'sent', 'skipped', 'quiet', 'failed'} 건수
+
+    notifier_for(subscriber) → DiscordNotifier (같은 Webhook은 같은 객체를 쓰도록 호출 측에서 재사용)
+    digest(AlertDigest)가 있으면 알림 금지 시간대의 알림은 생략하지 않고 보류 (시간대가 끝나면 묶어서 발송)
+    """
+    now = now or datetime.now()
+    counts = {'sent': 0, 'skipped': 0, 'quiet': 0, 'failed': 0}
+    message = None
+    for subscriber in product.subscribers if subscribers is None else subscribers:
+        if not subscriber.wants(result.status):
+            counts['skipped'] += 1
+            continue
+        if message is None:
+            message = result_message(product, result.status, result.text, now.strftime('%Y-%m-%d %H:%M:%S'),
+                                     result.price)
+        if subscriber.quiet_hours.contains(now):
+            counts['quiet'] += 1
+            if digest is not None:
+                digest.hold(('subscriber', subscriber.name), message, now)
+                logger.info(f"알림 금지 시간대 - 구독자 '{subscriber.name}' 알림 보류 ({product.product_id})")
+            else:
+                logger.info(f"알림 금지 시간대 - 구독자 '{subscriber.name}' 알림 생략 ({product.product_id})")
+            continue
+        try:
+            notifier = notifier_for(subscriber)
+        except Exception as e:
+            # 알림 객체를 만들 수 없는 구독자 때문에 다른 구독자 알림/확인이 멈추지 않도록 실패로만 셈
+            counts['failed'] += 1
+            logger.error(f"구독자 '{subscriber.name}' 알림 객체 생성 실패: {str(e)}")
+            continue
+        if notifier.send_message(message):
+            counts['sent'] += 1
+        else:
+            counts['failed'] += 1
+    return counts
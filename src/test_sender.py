@@ -4,6 +4,7 @@
 - 재고 있음/품절 상태 시뮬레이션 메시지 발송
 - 실제 재고 확인 테스트
 - 헬스체크 메시지 발송
+- 실행 중인 서비스 상태 조회 (관리 소켓)
 - 사용자 정의 메시지 발송
 """
 
@@ -18,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.discord_notifier import DiscordNotifier
 from src.stock_monitor import StockMonitor
+from src.admin_server import send_admin_command
 
 # 환경 변수 로드
 load_dotenv()
@@ -125,6 +127,25 @@ class TestSender:
             
         return success
         
+    def _check_via_service(self):
+        """실행 중인 서비스에 즉시 재고 확인 요청 → 재고 상태 (서비스가 없으면 None)"""
+        try:
+            response = send_admin_command('check', timeout=120, wait=True)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+            
+        result = response.get('result') or {}
+        if not response.get('ok'):
+            raise Exception(response.get('error'))
+        if result.get('error'):
+            raise Exception(f"서비스의 재고 확인 실패: {result['error']}")
+        status = result.get('status')
+        if status is None:
+            # standby 노드이거나 다른 노드가 lease를 가진 shard의 제품
+            raise Exception("이 노드에서 확인하지 않았습니다 (standby 노드이거나 다른 노드가 담당하는 제품)")
+        print("📡 실행 중인 서비스의 브라우저로 확인했습니다.")
+        return status
+        
     def send_actual_stock_check(self):
         """실제 재고 확인 후 메시지 발송"""
         if not self.website_url or not self.stock_selector:
@@ -134,14 +155,20 @@ class TestSender:
         print("🕷️ 실제 재고 상태를 확인합니다...")
         
         try:
-            monitor = StockMonitor(self.website_url, self.stock_selector)
-            stock_status = monitor.check_stock()
+            # 서비스가 실행 중이면 관리 소켓으로 확인, 아니면 직접 브라우저 실행
+            status = self._check_via_service()
+            if status is None:
+                monitor = StockMonitor(self.website_url, self.stock_selector)
+                status = monitor.check_stock().status
             
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            if stock_status:
+            if status == 'in_stock':
                 message = f"🟢 **[실제 확인] 재고 있음!** 🟢\n⏰ {current_time}\n🔗 {self.website_url}\n\n✅ 실제 재고 상태를 확인했습니다."
                 print("✅ 실제 재고 확인 결과: 재고 있음")
+            elif status == 'unknown':
+                message = f"❓ **[실제 확인] 재고 상태 확인 불가** ❓\n⏰ {current_time}\n🔗 {self.website_url}\n\n⚠️ 품절/재고 문구를 찾지 못했습니다. Selector나 문구 설정을 확인하세요."
+                print("⚠️ 실제 재고 확인 결과: 판단 불가")
             else:
                 message = f"🔴 **[실제 확인] 품절** 🔴\n⏰ {current_time}\n🔗 {self.website_url}\n\n✅ 실제 재고 상태를 확인했습니다."
                 print("✅ 실제 재고 확인 결과: 품절")
@@ -162,6 +189,35 @@ class TestSender:
             success = self.notifier.send_message(error_message)
             return success
             
+    def send_service_status(self):
+        """관리 소켓으로 서비스 상태를 조회해 메시지 발송"""
+        try:
+            status = send_admin_command('status').get('status', {})
+            stats = send_admin_command('stats').get('stats', {})
+            results = send_admin_command('results').get('results', {})
+        except (FileNotFoundError, ConnectionRefusedError):
+            print("❌ 실행 중인 서비스를 찾을 수 없습니다 (관리 소켓 없음)")
+            return False
+            
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result_lines = "\n".join(f"• {product_id}: {result}" for product_id, result in results.items()) or "• 없음"
+        message = (f"📡 **[서비스 상태]** 📡\n⏰ {current_time}\n"
+                   f"📊 모니터링 URL: {status.get('website_url')}\n"
+                   f"⏸️ 일시정지: {', '.join(status.get('paused', [])) or '없음'}\n"
+                   f"⏭️ 다음 확인: {status.get('next_run')}\n"
+                   f"📈 확인 {stats.get('checks_total', 0)}회 / 실패 {stats.get('checks_failed', 0)}회 / 알림 {stats.get('notifications_sent', 0)}회\n"
+                   f"🧾 마지막 결과:\n{result_lines}\n\n⚠️ 이것은 테스트 메시지입니다.")
+        
+        print("📤 서비스 상태 메시지를 발송합니다...")
+        success = self.notifier.send_message(message)
+        
+        if success:
+            print("✅ 서비스 상태 메시지 발송 성공!")
+        else:
+            print("❌ 서비스 상태 메시지 발송 실패!")
+            
+        return success
+        
     def send_embed_test(self):
         """Embed 형태 테스트 메시지 발송"""
         print("📤 Embed 테스트 메시지를 발송합니다...")
@@ -222,6 +278,7 @@ def main():
     parser.add_argument('--embed', action='store_true', help='Embed 테스트 메시지 발송')
     parser.add_argument('--notification-mode', action='store_true', help='알림 모드 테스트 메시지 발송')
     parser.add_argument('--timezone', action='store_true', help='타임존 테스트 메시지 발송')
+    parser.add_argument('--service-status', action='store_true', help='실행 중인 서비스 상태 메시지 발송')
     parser.add_argument('--custom', type=str, help='사용자 정의 메시지 발송')
     parser.add_argument('--all', action='store_true', help='모든 테스트 메시지 발송')
     
@@ -259,6 +316,9 @@ def main():
         if args.timezone or args.all:
             sender.send_timezone_test()
             
+        if args.service_status:
+            sender.send_service_status()
+            
         if args.custom:
             sender.send_custom_message(args.custom)
             